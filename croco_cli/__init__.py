@@ -7,4 +7,12 @@ The CLI for developing Web3-based projects in Croco Factory
 :license: MIT, see LICENSE for more details.
 """
 
-from .cli import cli
+
+def __getattr__(name: str):
+    # The CLI is imported lazily, so the daemon client in __main__ starts without heavy imports
+    if name == 'cli':
+        global cli
+        from .cli import cli
+        return cli
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
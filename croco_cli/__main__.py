@@ -1,7 +1,22 @@
 """Entry point for cli, enables execution with `python -m croco`"""
+import sys
+from croco_cli._daemon import forward
 
-from croco_cli import cli
+
+def main() -> None:
+    """Forward the command to the croco daemon if it is running, otherwise run the CLI"""
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from croco_cli import cli
+    from croco_cli._completion import refresh_stale_completion_cache
+
+    try:
+        cli()
+    finally:
+        refresh_stale_completion_cache()
 
 
 if __name__ == '__main__':
-    cli()
+    main()
@@ -0,0 +1,210 @@
+"""
+This module provides an asynchronous interface of the database for asyncio projects
+"""
+import queue
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Any
+from croco_cli._database import Database, GLOBAL_SCOPE
+from croco_cli.types import Wallet, CustomAccount, EnvVar, GithubUser
+
+_Write = tuple[asyncio.AbstractEventLoop, asyncio.Future, Callable[[], Any]]
+
+
+class AsyncDatabase:
+    def __init__(self, readers: int = 4, batch_size: int = 64):
+        """
+        Asynchronous interface of the database, which does not block the event loop.
+
+        Reads run in a small pool of threads with read-only connections. Writes are queued to
+        a single writer thread, which executes all queued writes in one transaction.
+
+        :param readers: Number of reader threads
+        :param batch_size: Maximum number of writes executed in one transaction
+        """
+        self.__database = Database()
+        self.__read_only = Database(read_only=True)
+        self.__batch_size = batch_size
+        self.__readers = ThreadPoolExecutor(readers, thread_name_prefix='croco-reader')
+        self.__writes: queue.SimpleQueue[Optional[_Write]] = queue.SimpleQueue()
+        self.__writer = threading.Thread(target=self.__write_loop, name='croco-writer', daemon=True)
+        self.__writer.start()
+
+    async def __aenter__(self) -> 'AsyncDatabase':
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Waits for queued writes and stops the threads"""
+        self.__writes.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self.__writer.join)
+        self.__readers.shutdown()
+
+    def __write_loop(self) -> None:
+        writes = self.__writes
+
+        while (write := writes.get()) is not None:
+            batch = [write]
+            while len(batch) < self.__batch_size:
+                try:
+                    write = writes.get_nowait()
+                except queue.Empty:
+                    break
+
+                if write is None:
+                    writes.put(None)
+                    break
+
+                batch.append(write)
+
+            try:
+                results = self.__database.execute_batch(call for _, _, call in batch)
+            except Exception as err:
+                results = [(None, err)] * len(batch)
+
+            for (loop, future, _), (result, error) in zip(batch, results):
+                try:
+                    loop.call_soon_threadsafe(self.__resolve, future, result, error)
+                except RuntimeError:
+                    # The event loop of the caller is closed, so nobody awaits the future
+                    continue
+
+    @staticmethod
+    def __resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+        if future.cancelled():
+            return
+
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def __read(self, method: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__readers, partial(method, *args, **kwargs))
+
+    async def __write(self, method: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__writes.put((loop, future, partial(method, *args, **kwargs)))
+        return await future
+
+    async def get_wallets(self, current: bool = False) -> list[Wallet] | None:
+        """
+        Returns a list of all ethereum wallets of the user
+        :param current: Whether only the current wallet should be returned
+        :return: a list of all ethereum wallets of the user
+        """
+        return await self.__read(self.__read_only.get_wallets, current)
+
+    async def get_github_user(self) -> GithubUser | None:
+        """
+        Returns the info about the GitHub user
+        :return: The info about the GitHub user represented as GithubUser dictionary
+        """
+        return await self.__read(self.__read_only.get_github_user)
+
+    async def get_custom_accounts(
+            self,
+            account: Optional[str] = None,
+            current: bool = False,
+            where: Optional[dict[str, Optional[str]]] = None
+    ) -> list[CustomAccount] | None:
+        """
+        Returns list of custom accounts of user
+        :param account: A name of accounts
+        :param current: Whether accounts should be current
+        :param where: Values of fields of the data, like {'region': 'eu'}, the accounts should have
+        :return: list of custom accounts of user
+        """
+        return await self.__read(self.__read_only.get_custom_accounts, account, current, where)
+
+    async def get_env_variables(self) -> list[EnvVar] | None:
+        """
+        Returns environment variables of user
+        :return: list of environment variables
+        """
+        return await self.__read(self.__read_only.get_env_variables)
+
+    async def resolve_env_variables(self, scope: Optional[str] = None) -> list[EnvVar]:
+        """
+        Resolves environment variables of the scope, overriding variables inherited from its parents
+        :param scope: Name of the scope, like "sepolia". Only global variables are resolved if not provided
+        :return: list of environment variables
+        """
+        return await self.__read(self.__read_only.resolve_env_variables, scope)
+
+    async def set_wallet(
+            self,
+            private_key: str,
+            label: Optional[str] = None,
+            mnemonic: Optional[str] = None
+    ) -> None:
+        """
+        Sets the wallet using a private key and a label
+        :param private_key: Private key of the wallet
+        :param label: Label for the wallet
+        :param mnemonic: mnemonic of a wallet
+        :return: None
+        """
+        await self.__write(self.__database.set_wallet, private_key, label, mnemonic)
+
+    async def set_github_user(self, token: str) -> None:
+        """
+        Sets the GitHub user using a personal access token. The GitHub API is requested in a reader thread,
+        so the writer is not blocked by the network
+        :param token: A personal access token
+        :return: None
+        """
+        user, email = await self.__read(Database._fetch_github_user, token)
+        await self.__write(self.__database._save_github_user, user, email, token)
+
+    async def set_custom_account(
+            self,
+            account: str,
+            password: str,
+            email: str,
+            email_password: Optional[str] = None,
+            data: Optional[dict[str, str]] = None
+    ) -> None:
+        """
+        Sets a custom user account
+        :param account: A name of account
+        :param password: Password
+        :param email: Email login
+        :param email_password: Email password
+        :param data: Custom user data
+        :return: None
+        """
+        await self.__write(self.__database.set_custom_account, account, password, email, email_password, data)
+
+    async def set_custom_account_field(
+            self,
+            account: str,
+            key: str,
+            value: Optional[str],
+            email: Optional[str] = None
+    ) -> int:
+        """
+        Sets a field of custom accounts data in place, without rewriting other fields
+        :param account: A name of accounts
+        :param key: Key of the field
+        :param value: Value of the field. The field is removed if it is None
+        :param email: Email of the account. The current account of the name is updated if not provided
+        :return: Number of updated accounts
+        """
+        return await self.__write(self.__database.set_custom_account_field, account, key, value, email)
+
+    async def set_envar(self, key: str, value: str, scope: str = GLOBAL_SCOPE) -> None:
+        """
+        Sets an environment variable
+        :param key: Key of the variable
+        :param value: Value of the variable
+        :param scope: Name of the scope, like "sepolia". Variables are global by default
+        :return: None
+        """
+        await self.__write(self.__database.set_envar, key, value, scope)
@@ -0,0 +1,39 @@
+"""
+This module locates the cache folder of croco-cli. It imports only the standard library,
+so it is cheap to import before the rest of the package
+"""
+import os
+import sys
+import getpass
+
+
+def get_cache_folder() -> str:
+    """
+    Get the cache folder path based on the operating system.
+
+    :return: Cache folder path.
+    """
+    username = getpass.getuser()
+    os_name = os.name
+
+    venv_path = sys.prefix
+
+    parent_path = venv_path[:venv_path.rfind('/')]
+    folder = os.path.basename(parent_path)
+
+    if os_name == "posix":
+        cache_folder = f'/Users/{username}/.croco_cli'
+    elif os_name == "nt":
+        cache_folder = f'C:/Users/{username}/AppData/Local/croco_cli'
+    else:
+        raise OSError(f"Unsupported Operating System {os_name}")
+
+    if not os.path.exists(cache_folder):
+        os.mkdir(cache_folder)
+
+    cache_path = os.path.join(cache_folder, folder)
+
+    if not os.path.exists(cache_path):
+        os.mkdir(cache_path)
+
+    return cache_path
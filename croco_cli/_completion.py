@@ -0,0 +1,265 @@
+"""
+This module provides shell completion scripts for bash, zsh and fish.
+
+Commands and options are written into the scripts. Dynamic candidates, like wallet labels, come from
+a flat cache file, which is refreshed after the database is changed, so completion works without
+importing croco-cli.
+"""
+import os
+import re
+import shlex
+import click
+from typing import Iterator
+from croco_cli._cache import get_cache_folder
+from croco_cli._database import Database
+from croco_cli.utils import write_if_changed
+
+CACHE_NAME = 'completion'
+SHELLS = ('bash', 'zsh', 'fish')
+
+_UNSAFE_CANDIDATE = re.compile(r'[\t\r\n]')
+
+# Values of options are completed from the cache, keyed by (command path, option)
+_DYNAMIC_OPTIONS = {
+    ('export', '--label'): 'label',
+    ('export', '--account'): 'account',
+    ('export', '--env-prefix'): 'env',
+    ('user', '--label'): 'label',
+    ('user', '--account'): 'account',
+    ('user', '--scope'): 'scope',
+    ('set', 'envar', '--scope'): 'scope',
+    ('make', 'dotenv', '--scope'): 'scope',
+    ('make', 'env', '--scope'): 'scope',
+    ('run', '--scope'): 'scope'
+}
+
+# The first argument of commands is completed from the cache, keyed by command path
+_DYNAMIC_ARGUMENTS = {
+    ('set', 'envar'): 'env',
+    ('set', 'custom'): 'account',
+    ('set', 'scope'): 'scope'
+}
+
+
+def get_completion_path() -> str:
+    """
+    Get path to the file with cached completion candidates.
+
+    :return: Path to the file
+    """
+    return os.path.join(get_cache_folder(), CACHE_NAME)
+
+
+def _iter_candidates(database: Database) -> Iterator[str]:
+    """
+    Yields lines of the cache file: kind of the candidate and the candidate separated by a tab.
+    Candidates with tabs or line breaks would break lines of the file, so they are skipped
+    """
+    def candidates() -> Iterator[tuple[str, str]]:
+        wallets = database.wallets
+        if database._table_exists(wallets):
+            for label, public_key in wallets.select(wallets.label, wallets.public_key).tuples().iterator():
+                if label:
+                    yield 'label', label
+                yield 'public_key', public_key
+
+        custom_accounts = database.custom_accounts
+        if database._table_exists(custom_accounts):
+            for account, in custom_accounts.select(custom_accounts.account).distinct().tuples().iterator():
+                yield 'account', account
+
+        env_variables = database.env_variables
+        if database._table_exists(env_variables):
+            for key, in env_variables.select(env_variables.key).distinct().tuples().iterator():
+                yield 'env', key
+
+        env_scopes = database.env_scopes
+        if database._table_exists(env_scopes):
+            for name, in env_scopes.select(env_scopes.name).tuples().iterator():
+                yield 'scope', name
+
+    for kind, candidate in candidates():
+        if not _UNSAFE_CANDIDATE.search(candidate):
+            yield f'{kind}\t{candidate}\n'
+
+
+def refresh_completion_cache(database: Database) -> None:
+    """
+    Rewrite the file with cached completion candidates if they are changed.
+
+    :param database: The database to read candidates from
+    :return: None
+    """
+    write_if_changed(get_completion_path(), ''.join(_iter_candidates(database)))
+
+
+def refresh_stale_completion_cache() -> None:
+    """
+    Refresh cached completion candidates if writers of this process changed them.
+    Called by the CLI before exiting, failures must not break the finished command.
+
+    :return: None
+    """
+    if not Database.completion_stale:
+        return
+
+    Database.completion_stale = False
+    try:
+        refresh_completion_cache(Database(read_only=True))
+    except Exception:
+        pass
+
+
+def _iter_commands(command: click.Command, path: tuple[str, ...] = ()) -> Iterator[tuple[tuple[str, ...], click.Command]]:
+    """Yields commands of the group recursively with their paths"""
+    yield path, command
+
+    if isinstance(command, click.Group):
+        for name, subcommand in command.commands.items():
+            if not subcommand.hidden:
+                yield from _iter_commands(subcommand, path + (name,))
+
+
+def _get_words(command: click.Command) -> list[str]:
+    """Returns subcommands and options of the command"""
+    words = list(command.commands) if isinstance(command, click.Group) else []
+    for param in command.params:
+        if isinstance(param, click.Option):
+            words.extend(param.opts + param.secondary_opts)
+
+    return words + ['--help']
+
+
+def _get_choices(command: click.Command) -> dict[str, list[str]]:
+    """Returns choices of options with the click.Choice type"""
+    return {
+        option: list(param.type.choices)
+        for param in command.params
+        if isinstance(param, click.Option) and isinstance(param.type, click.Choice)
+        for option in param.opts
+    }
+
+
+def _get_value_options(cli: click.Group) -> set[str]:
+    """Returns options which take a value"""
+    return {
+        option
+        for _, command in _iter_commands(cli)
+        for param in command.params
+        if isinstance(param, click.Option) and not param.is_flag and not param.count
+        for option in param.opts
+    }
+
+
+def _bash_script(cli: click.Group, shell: str = 'bash') -> str:
+    cache_path = shlex.quote(get_completion_path())
+    value_options = '|'.join(sorted(_get_value_options(cli)))
+    static_cases, value_cases = [], []
+
+    for path, command in _iter_commands(cli):
+        key = ' '.join(path)
+        static_cases.append(f'        {shlex.quote(key)}) words={shlex.quote(" ".join(_get_words(command)))} ;;')
+
+        for option, choices in _get_choices(command).items():
+            value_cases.append(f'        {shlex.quote(f"{key}|{option}")}) words={shlex.quote(" ".join(choices))} ;;')
+
+    for (*path, option), kind in _DYNAMIC_OPTIONS.items():
+        value_cases.append(f'        {shlex.quote(" ".join(path) + "|" + option)}) kind={kind} ;;')
+
+    argument_cases = [f'        {shlex.quote(" ".join(path))}) kind={kind} ;;' for path, kind in _DYNAMIC_ARGUMENTS.items()]
+
+    newline = '\n'
+    return f'''# croco completion for {shell}, generated by "croco completion {shell}"
+{'autoload -U +X bashcompinit && bashcompinit' + newline if shell == 'zsh' else ''}_croco_completion() {{
+    local cur="${{COMP_WORDS[COMP_CWORD]}}" prev="${{COMP_WORDS[COMP_CWORD-1]}}"
+    local path="" words="" kind="" word skip=""
+    for word in "${{COMP_WORDS[@]:1:COMP_CWORD-1}}"; do
+        if [[ -n $skip ]]; then
+            skip=""
+        elif [[ $word == -* ]]; then
+            case "$word" in {value_options or '--'}) skip=1 ;; esac
+        else
+            path="${{path:+$path }}$word"
+        fi
+    done
+
+    case "$path|$prev" in
+{newline.join(value_cases)}
+    esac
+
+    if [[ -z $words && -z $kind && $prev != -* ]]; then
+        case "$path" in
+{newline.join(argument_cases)}
+        esac
+    fi
+
+    if [[ -n $kind ]]; then
+        local IFS=$'\\n'
+        COMPREPLY=($(compgen -W "$(awk -F'\\t' -v kind="$kind" '$1 == kind {{ print $2 }}' {cache_path} 2>/dev/null)" -- "$cur"))
+        return
+    fi
+
+    if [[ -z $words ]]; then
+        case "$path" in
+{newline.join(static_cases)}
+        esac
+    fi
+
+    COMPREPLY=($(compgen -W "$words" -- "$cur"))
+}}
+complete -o default -F _croco_completion croco
+'''
+
+
+def _fish_script(cli: click.Group) -> str:
+    cache_path = get_completion_path().replace('\\', '\\\\').replace("'", "\\'")
+    lines = ['# croco completion for fish, generated by "croco completion fish"', 'complete -c croco -f']
+
+    def candidates(kind: str) -> str:
+        return f"(awk -F'\\\\t' '$1 == \"{kind}\" {{ print $2 }}' '{cache_path}' 2>/dev/null)"
+
+    def condition(path: tuple[str, ...]) -> str:
+        if not path:
+            return '__fish_use_subcommand'
+        return ' && '.join(f'__fish_seen_subcommand_from {word}' for word in path)
+
+    for path, command in _iter_commands(cli):
+        if isinstance(command, click.Group) and command.commands:
+            names = ' '.join(command.commands)
+            lines.append(f"complete -c croco -n '{condition(path)}; and not __fish_seen_subcommand_from {names}' -a '{names}'")
+
+        for param in command.params:
+            if not isinstance(param, click.Option):
+                continue
+
+            flags = ' '.join(
+                f'-l {opt[2:]}' if opt.startswith('--') else f'-o {opt[1:]}' if len(opt) > 2 else f'-s {opt[1:]}'
+                for opt in param.opts
+            )
+            arguments = ''
+            if isinstance(param.type, click.Choice):
+                arguments = f" -x -a '{' '.join(param.type.choices)}'"
+            elif kind := _DYNAMIC_OPTIONS.get(path + (param.opts[-1],)):
+                arguments = f' -x -a "{candidates(kind)}"'
+
+            lines.append(f"complete -c croco -n '{condition(path)}' {flags}{arguments}")
+
+    for path, kind in _DYNAMIC_ARGUMENTS.items():
+        lines.append(f'complete -c croco -n \'{condition(path)}\' -a "{candidates(kind)}"')
+
+    return '\n'.join(lines) + '\n'
+
+
+def get_completion_script(shell: str, cli: click.Group) -> str:
+    """
+    Get the completion script for the shell.
+
+    :param shell: Name of the shell: bash, zsh or fish
+    :param cli: The CLI group
+    :return: The completion script
+    """
+    match shell:
+        case 'bash' | 'zsh':
+            return _bash_script(cli, shell)
+        case 'fish':
+            return _fish_script(cli)
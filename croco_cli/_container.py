@@ -0,0 +1,204 @@
+"""
+This module provides a compressed and encrypted container for exported configurations.
+
+The container starts with a header holding the scrypt salt and parameters. The key is derived
+once per container, after the header follows a sequence of chunks, each compressed with zlib and
+sealed with AES-GCM. The chunk number and the final flag are authenticated, so reordered,
+truncated or tampered containers are rejected.
+"""
+import os
+import zlib
+import struct
+from typing import BinaryIO, Iterator
+from Crypto.Cipher import AES
+from Crypto.Protocol.KDF import scrypt
+from croco_cli.exceptions import InvalidPassword, CorruptedContainer
+
+MAGIC = b'CROCO\x01'
+CHUNK_SIZE = 64 * 1024
+
+_SALT_SIZE = 16
+_TAG_SIZE = 16
+_KEY_SIZE = 32
+_SCRYPT_LOG_N = 16
+_SCRYPT_R = 8
+_SCRYPT_P = 1
+
+_HEADER = struct.Struct('>16sBBB')
+_CHUNK_HEADER = struct.Struct('>IB')
+_NONCE = struct.Struct('>4xQ')
+
+
+def is_container(path: str) -> bool:
+    """
+    Check if a file is an encrypted container
+    :param path: Path to the file
+    :return: True if the file starts with the container signature, false otherwise
+    """
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def _derive_key(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    return scrypt(password.encode(), salt, _KEY_SIZE, N=2 ** log_n, r=r, p=p)
+
+
+def _cipher(key: bytes, counter: int, chunk_header: bytes):
+    cipher = AES.new(key, AES.MODE_GCM, nonce=_NONCE.pack(counter))
+    cipher.update(chunk_header)
+    return cipher
+
+
+class ContainerWriter:
+    def __init__(
+            self,
+            file: BinaryIO,
+            password: str,
+            chunk_size: int = CHUNK_SIZE
+    ):
+        """
+        Writes data into an encrypted container chunk by chunk.
+
+        :param file: Binary file to write the container to
+        :param password: Password to derive the encryption key from
+        :param chunk_size: Size of plaintext chunks
+        """
+        salt = os.urandom(_SALT_SIZE)
+        self.__file = file
+        self.__key = _derive_key(password, salt, _SCRYPT_LOG_N, _SCRYPT_R, _SCRYPT_P)
+        self.__chunk_size = chunk_size
+        self.__buffer = bytearray()
+        self.__counter = 0
+        self.__size = 0
+        self.__closed = False
+
+        file.write(MAGIC)
+        file.write(_HEADER.pack(salt, _SCRYPT_LOG_N, _SCRYPT_R, _SCRYPT_P))
+
+    @property
+    def size(self) -> int:
+        """Number of plaintext bytes written to the container"""
+        return self.__size
+
+    def write(self, data: bytes) -> None:
+        """
+        Write data to the container. Full chunks are flushed to the file immediately
+        :param data: Data to be written
+        :return: None
+        """
+        buffer = self.__buffer
+        buffer += data
+        self.__size += len(data)
+
+        chunk_size = self.__chunk_size
+        while len(buffer) >= chunk_size:
+            self.__write_chunk(bytes(buffer[:chunk_size]), final=False)
+            del buffer[:chunk_size]
+
+    def close(self) -> None:
+        """
+        Write the final chunk. The file itself is not closed
+        :return: None
+        """
+        if self.__closed:
+            return
+
+        self.__write_chunk(bytes(self.__buffer), final=True)
+        self.__buffer.clear()
+        self.__closed = True
+
+    def __write_chunk(self, chunk: bytes, final: bool) -> None:
+        compressed = zlib.compress(chunk)
+        chunk_header = _CHUNK_HEADER.pack(len(compressed) + _TAG_SIZE, final)
+
+        cipher = _cipher(self.__key, self.__counter, chunk_header)
+        ciphertext, tag = cipher.encrypt_and_digest(compressed)
+
+        self.__file.write(chunk_header)
+        self.__file.write(ciphertext)
+        self.__file.write(tag)
+        self.__counter += 1
+
+    def __enter__(self) -> 'ContainerWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+
+
+class ContainerReader:
+    def __init__(
+            self,
+            file: BinaryIO,
+            password: str
+    ):
+        """
+        Reads data from an encrypted container chunk by chunk.
+
+        :param file: Binary file to read the container from
+        :param password: Password to derive the decryption key from
+        """
+        if file.read(len(MAGIC)) != MAGIC:
+            raise CorruptedContainer
+
+        header = file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise CorruptedContainer
+
+        # The parameters come from an untrusted file and bound the memory and time of scrypt,
+        # so only the cost may grow a little beyond the one written by ContainerWriter
+        salt, log_n, r, p = _HEADER.unpack(header)
+        if log_n > _SCRYPT_LOG_N + 4 or r != _SCRYPT_R or p != _SCRYPT_P:
+            raise CorruptedContainer
+
+        self.__file = file
+        self.__key = _derive_key(password, salt, log_n, r, p)
+        self.__size = 0
+
+    @property
+    def size(self) -> int:
+        """Number of plaintext bytes read from the container"""
+        return self.__size
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yields decrypted and decompressed chunks"""
+        file = self.__file
+        counter = 0
+        final = False
+
+        while not final:
+            chunk_header = file.read(_CHUNK_HEADER.size)
+            if len(chunk_header) != _CHUNK_HEADER.size:
+                raise CorruptedContainer
+
+            length, final = _CHUNK_HEADER.unpack(chunk_header)
+            sealed = file.read(length)
+            if len(sealed) != length or length < _TAG_SIZE:
+                raise CorruptedContainer
+
+            cipher = _cipher(self.__key, counter, chunk_header)
+            try:
+                compressed = cipher.decrypt_and_verify(sealed[:-_TAG_SIZE], sealed[-_TAG_SIZE:])
+            except ValueError:
+                raise InvalidPassword if counter == 0 else CorruptedContainer
+
+            chunk = zlib.decompress(compressed)
+            self.__size += len(chunk)
+            counter += 1
+            yield chunk
+
+        if file.read(1):
+            raise CorruptedContainer
+
+    def lines(self) -> Iterator[bytes]:
+        """Yields lines of the decrypted data without line endings"""
+        rest = b''
+
+        for chunk in self:
+            lines = (rest + chunk).split(b'\n')
+            rest = lines.pop()
+            yield from lines
+
+        if rest:
+            yield rest
@@ -0,0 +1,248 @@
+"""
+This module provides the croco daemon, which keeps the CLI imported and serves commands as JSON-RPC
+over a Unix socket, and the thin client forwarding commands to it.
+
+The client part imports only the standard library, so forwarded commands start almost instantly.
+"""
+import io
+import os
+import sys
+import json
+import time
+import socket
+import contextlib
+from typing import Optional, Any, Iterator
+from croco_cli._cache import get_cache_folder
+
+SOCKET_NAME = 'daemon.sock'
+IDLE_TIMEOUT = 600
+
+_FORWARDED_COMMANDS = {
+    'user': (),
+    'make': ('--watch', '-w'),
+    'export': ('--encrypt', '-e')
+}
+
+
+def get_socket_path() -> str:
+    """
+    Get path to the socket of the daemon in the cache folder.
+
+    :return: Path to the socket
+    """
+    return os.path.join(get_cache_folder(), SOCKET_NAME)
+
+
+def _send(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode() + b'\n')
+
+
+def _receive(sock: socket.socket) -> Optional[dict[str, Any]]:
+    data = bytearray()
+    while not data.endswith(b'\n'):
+        chunk = sock.recv(65536)
+        if not chunk:
+            return None
+        data += chunk
+
+    return json.loads(data)
+
+
+def call(method: str, params: Optional[dict[str, Any]] = None, timeout: Optional[float] = None) -> Any:
+    """
+    Call a method of the running daemon.
+
+    :param method: Name of the method
+    :param params: Parameters of the method
+    :param timeout: Timeout of the socket operations in seconds
+    :return: Result of the method
+    :raise OSError: If the daemon is not running
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        raise ConnectionRefusedError('Unix sockets are not supported')
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(get_socket_path())
+        _send(sock, {'jsonrpc': '2.0', 'id': 1, 'method': method, 'params': params or {}})
+        response = _receive(sock)
+
+    if response is None:
+        raise ConnectionResetError('The daemon closed the connection')
+
+    if error := response.get('error'):
+        raise RuntimeError(error['message'])
+
+    return response['result']
+
+
+def _is_forwarded(args: list[str]) -> bool:
+    """Check if the command is non-interactive and can be executed by the daemon"""
+    if not args or args[0] not in _FORWARDED_COMMANDS:
+        return False
+
+    excluded = _FORWARDED_COMMANDS[args[0]]
+    return not any(arg in excluded for arg in args[1:])
+
+
+def forward(args: list[str]) -> Optional[int]:
+    """
+    Forward the command to the daemon if it is running.
+
+    :param args: Command line arguments
+    :return: Exit code of the command or None if the command was not forwarded
+    """
+    if not _is_forwarded(args):
+        return None
+
+    params = {'args': args, 'cwd': os.getcwd(), 'env': dict(os.environ), 'color': sys.stdout.isatty()}
+    try:
+        result = call('run', params)
+    except (OSError, ValueError, RuntimeError):
+        return None
+
+    sys.stdout.write(result['stdout'])
+    sys.stderr.write(result['stderr'])
+    return result['exit_code']
+
+
+@contextlib.contextmanager
+def _client_context(cwd: str, env: Optional[dict[str, str]]) -> Iterator[None]:
+    """Runs the block in the working directory and with environment variables of the client"""
+    daemon_cwd, daemon_env = os.getcwd(), dict(os.environ)
+    os.chdir(cwd)
+    if env is not None:
+        os.environ.clear()
+        os.environ.update(env)
+
+    try:
+        yield
+    finally:
+        os.chdir(daemon_cwd)
+        os.environ.clear()
+        os.environ.update(daemon_env)
+
+
+def _run_command(args: list[str], cwd: str, color: bool, env: Optional[dict[str, str]] = None) -> dict[str, Any]:
+    """Run the command in the daemon process like in the client, capturing its output"""
+    import click
+    from croco_cli import cli
+    from croco_cli._database import Database
+
+    Database(read_only=True).clear_cache()
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+
+    with _client_context(cwd, env), contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            cli.main(args, prog_name='croco', standalone_mode=False, color=color)
+        except click.exceptions.Exit as err:
+            exit_code = err.exit_code
+        except click.ClickException as err:
+            err.show()
+            exit_code = err.exit_code
+        except click.Abort:
+            click.echo('Aborted!', err=True)
+            exit_code = 1
+        except SystemExit as err:
+            if isinstance(err.code, int) or err.code is None:
+                exit_code = err.code or 0
+            else:
+                # Like the interpreter, other exit values are printed and the exit code is 1
+                print(err.code, file=sys.stderr)
+                exit_code = 1
+
+    return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'exit_code': exit_code}
+
+
+def _handle(request: dict[str, Any]) -> dict[str, Any]:
+    """Handle a JSON-RPC request"""
+    response = {'jsonrpc': '2.0', 'id': request.get('id')}
+    method = request.get('method')
+    params = request.get('params') or {}
+
+    try:
+        match method:
+            case 'ping':
+                response['result'] = {'pid': os.getpid()}
+            case 'shutdown':
+                response['result'] = None
+            case 'run':
+                response['result'] = _run_command(
+                    params['args'],
+                    params['cwd'],
+                    params.get('color', False),
+                    params.get('env')
+                )
+            case _:
+                response['error'] = {'code': -32601, 'message': f'Method {method!r} is not found'}
+    except Exception as err:
+        response['error'] = {'code': -32000, 'message': str(err)}
+
+    return response
+
+
+def serve(idle_timeout: float = IDLE_TIMEOUT) -> None:
+    """
+    Serve commands over the Unix socket until the idle timeout expires or the shutdown method is called.
+
+    :param idle_timeout: Seconds without requests before the daemon stops
+    :return: None
+    """
+    from croco_cli import cli  # noqa: F401, imported to be kept warm
+
+    path = get_socket_path()
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # The socket is created private, so other users cannot connect before its mode is set
+        umask = os.umask(0o177)
+        try:
+            server.bind(path)
+        finally:
+            os.umask(umask)
+        os.chmod(path, 0o600)
+        server.listen()
+        server.settimeout(idle_timeout)
+
+        try:
+            while True:
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    break
+
+                with connection:
+                    connection.settimeout(None)
+                    request = _receive(connection)
+                    if request is None:
+                        continue
+
+                    response = _handle(request)
+                    _send(connection, response)
+
+                if request.get('method') == 'shutdown':
+                    break
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+
+
+def wait_until_ready(timeout: float = 10) -> bool:
+    """
+    Wait until the daemon responds.
+
+    :param timeout: Timeout in seconds
+    :return: Whether the daemon is running
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            call('ping', timeout=1)
+            return True
+        except OSError:
+            time.sleep(0.05)
+
+    return False
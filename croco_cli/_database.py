@@ -2,66 +2,180 @@
 This module provides a database interface
 """
 import json
-import sys
 import os
 import pickle
-import getpass
+import pathlib
+import time
+import random
+import re
+from functools import wraps
 from eth_account import Account
 from github import Auth, BadCredentialsException, Github
-from typing import Type, Optional, ClassVar
+from typing import Type, Optional, ClassVar, Iterator, Iterable, Callable, Any
 from eth_utils.exceptions import ValidationError
-from croco_cli.exceptions import InvalidToken, InvalidMnemonic
-from croco_cli.types import GithubUser, Wallet, CustomAccount, EnvVar
-from peewee import Model, CharField, BlobField, SqliteDatabase, BooleanField
+from croco_cli._cache import get_cache_folder
+from croco_cli.exceptions import InvalidToken, InvalidMnemonic, InvalidFieldName, InvalidScope, UnknownScope
+from croco_cli.types import GithubUser, Wallet, CustomAccount, EnvVar, EnvScope
+from github.AuthenticatedUser import AuthenticatedUser
+from peewee import (
+    Model, CharField, BlobField, SqliteDatabase, BooleanField, FloatField, OperationalError, Expression, SQL, Case, fn
+)
 
 
-def _get_cache_folder() -> str:
+def _json_path(key: str) -> str:
     """
-    Get the cache folder path based on the operating system.
+    Returns JSON path of a key of an object, quoted so keys with dots or spaces are not split
 
-    :return: Cache folder path.
+    :param key: The key
+    :return: The path
     """
-    username = getpass.getuser()
-    os_name = os.name
+    return f'$."{key}"'
 
-    venv_path = sys.prefix
 
-    parent_path = venv_path[:venv_path.rfind('/')]
-    folder = os.path.basename(parent_path)
+def _escape_glob(pattern: str) -> str:
+    """
+    Escape special characters of a GLOB pattern
 
-    if os_name == "posix":
-        cache_folder = f'/Users/{username}/.croco_cli'
-    elif os_name == "nt":
-        cache_folder = f'C:/Users/{username}/AppData/Local/croco_cli'
-    else:
-        raise OSError(f"Unsupported Operating System {os_name}")
+    :param pattern: Literal text
+    :return: Pattern matching the literal text
+    """
+    return ''.join(f'[{char}]' if char in '*?[' else char for char in pattern)
+
+
+_WRITE_ATTEMPTS = 5
+_RETRY_DELAY = 0.05
+# Number of keys in one IN clause, staying far below the limit of SQLite variables
+_DELETE_BATCH_SIZE = 500
+# Writers changing candidates of shell completion, like wallet labels or keys of environment variables
+_COMPLETION_WRITERS = {
+    'drop_tables',
+    'drop_database',
+    'delete_wallets',
+    'set_wallet',
+    'set_custom_account',
+    'delete_custom_accounts',
+    'set_envar',
+    'set_env_scope',
+    'delete_env_variables'
+}
+# Declared fields of custom accounts data are extracted to indexed generated columns with the prefix
+_FIELD_COLUMN_PREFIX = 'data_'
+_FIELD_NAME = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
+# Scope of environment variables shared by all other scopes
+GLOBAL_SCOPE = ''
+# Maximum depth of inherited scopes, guarding resolution against cycles
+_MAX_SCOPE_DEPTH = 32
+
+# Full-text search index over accounts. Rows of the index are numbered by ids of the indexed rows and their kind,
+# so triggers update them by rowid. Only names are indexed: secrets, like passwords, wallet keys, values
+# of environment variables and values of custom data, are never copied to the index
+_SEARCH_TABLE = 'search_index'
+# Version of indexed columns. Triggers are named with it, so indexes of earlier versions are rebuilt
+_SEARCH_VERSION = 2
+_SEARCH_KINDS = ('wallet', 'custom', 'env')
+_SEARCH_SOURCES = {
+    'wallet': ('wallets', ('label', 'public_key'), "coalesce({row}.label, '')", '{row}.public_key', "''"),
+    'custom': (
+        'custom_accounts',
+        ('account', 'email', 'data'),
+        '{row}.account',
+        '{row}.email',
+        "coalesce((SELECT group_concat(key, ' ') "
+        "FROM json_each(CASE WHEN json_valid({row}.data) THEN {row}.data END)), '')"
+    ),
+    'env': ('env_variables', ('key',), '{row}.key', "''", "''")
+}
+
+
+def wallet_name_keys(current: Expression, label: Expression) -> tuple[Expression, Expression]:
+    """
+    Returns expressions wallets are sorted by name with: the current wallet goes first, then unlabelled wallets
+    and labelled ones by labels. The empty string is a literal, since expressions of sorting must be written
+    like the ones of the index to be backed by it
 
-    if not os.path.exists(cache_folder):
-        os.mkdir(cache_folder)
+    :param current: The current column of wallets
+    :param label: The label column of wallets
+    :return: The expressions
+    """
+    return ~current, fn.COALESCE(label, SQL("''"))
 
-    cache_path = os.path.join(cache_folder, folder)
 
-    if not os.path.exists(cache_path):
-        os.mkdir(cache_path)
+def _writer(method: Callable) -> Callable:
+    """
+    Decorator running a database method in a BEGIN IMMEDIATE transaction, so concurrent writers are serialized.
+    If the database stays locked after the busy timeout, the method is retried with a jittered exponential backoff.
+    Methods called inside another transaction join it. Methods changing candidates of shell completion
+    mark them as stale, so the CLI refreshes them before exiting.
 
-    return cache_path
+    :param method: The method to be decorated
+    :return: The decorated method
+    """
+    changes_completion = method.__name__ in _COMPLETION_WRITERS
+
+    @wraps(method)
+    def wrapper(self: 'Database', *args, **kwargs):
+        if changes_completion:
+            Database.completion_stale = True
+
+        interface = self.interface
+        if interface.in_transaction():
+            with interface.atomic():
+                return method(self, *args, **kwargs)
+
+        for attempt in range(_WRITE_ATTEMPTS):
+            try:
+                with interface.atomic('IMMEDIATE'):
+                    result = method(self, *args, **kwargs)
+
+                Database.write_count += 1
+                return result
+            except OperationalError as err:
+                if 'locked' not in str(err) or attempt == _WRITE_ATTEMPTS - 1:
+                    raise
+
+            time.sleep(random.uniform(0, _RETRY_DELAY * 2 ** attempt))
+
+    return wrapper
 
 
 class _DatabaseMeta(type):
-    _instance = None
+    _instances: dict[bool, 'Database'] = {}
 
-    def __call__(cls, *args, **kwargs):
-        if not isinstance(cls._instance, cls):
-            cls._instance = super().__call__(*args, **kwargs)
+    def __call__(cls, read_only: bool = False):
+        instance = cls._instances.get(read_only)
+        if not isinstance(instance, cls):
+            instance = cls._instances[read_only] = super().__call__(read_only)
 
-        return cls._instance
+        return instance
 
 
 class Database(metaclass=_DatabaseMeta):
-    _path: ClassVar[str] = os.path.join(_get_cache_folder(), 'user.db')
-    interface: ClassVar[SqliteDatabase] = SqliteDatabase(_path)
+    _path: ClassVar[str] = os.path.join(get_cache_folder(), 'user.db')
+    busy_timeout: ClassVar[float] = float(os.environ.get('CROCO_BUSY_TIMEOUT', 10))
+    # Opt-in to read a database nobody writes, like a shared snapshot, without any file locking
+    immutable: ClassVar[bool] = os.environ.get('CROCO_IMMUTABLE_DATABASE') == '1'
+    write_count: ClassVar[int] = 0
+    completion_stale: ClassVar[bool] = False
+    interface: SqliteDatabase = SqliteDatabase(_path, timeout=busy_timeout, pragmas={'journal_mode': 'wal'})
+
+    def __init__(self, read_only: bool = False):
+        """
+        Database of the user accounts. Instances are shared, one for each mode.
+
+        :param read_only: Whether to use a separate connection opened in read-only mode
+        """
+        self._read_only = read_only
+        self._tables: set[str] | None = None
+        self._custom_fields: set[str] | None = None
+
+        if read_only:
+            if not os.path.exists(self._path):
+                Database.interface.connect(reuse_if_open=True)
+
+            self.interface = SqliteDatabase(self._read_only_uri(), uri=True, timeout=self.busy_timeout)
+
+        interface = self.interface
 
-    def __init__(self):
         class GithubUserModel(Model):
             data = BlobField()
             login = CharField(unique=True)
@@ -70,7 +184,7 @@ class Database(metaclass=_DatabaseMeta):
             access_token = CharField(unique=True)
 
             class Meta:
-                database = Database.interface
+                database = interface
                 table_name = 'github_users'
 
         class WalletModel(Model):
@@ -78,14 +192,14 @@ class Database(metaclass=_DatabaseMeta):
             private_key = CharField(unique=True)
             mnemonic = CharField(unique=True, null=True)
             current = BooleanField()
-            label = CharField(null=True)
+            label = CharField(null=True, index=True)
 
             class Meta:
-                database = Database.interface
+                database = interface
                 table_name = 'wallets'
 
         class CustomAccountModel(Model):
-            account = CharField()
+            account = CharField(index=True)
             password = CharField()
             email = CharField()
             email_password = CharField()
@@ -93,21 +207,93 @@ class Database(metaclass=_DatabaseMeta):
             data = CharField(null=True)
 
             class Meta:
-                database = Database.interface
+                database = interface
                 table_name = 'custom_accounts'
 
         class EnvVariableModel(Model):
-            key = CharField(unique=True)
+            key = CharField()
             value = CharField()
+            scope = CharField(default=GLOBAL_SCOPE)
 
             class Meta:
-                database = Database.interface
+                database = interface
                 table_name = 'env_variables'
+                indexes = ((('scope', 'key'), True),)
+
+        class EnvScopeModel(Model):
+            name = CharField(unique=True)
+            parent = CharField(null=True)
+
+            class Meta:
+                database = interface
+                table_name = 'env_scopes'
+
+        class WalletLeaseModel(Model):
+            private_key = CharField(unique=True)
+            holder = CharField(index=True)
+            expires_at = FloatField(index=True)
+
+            class Meta:
+                database = interface
+                table_name = 'wallet_leases'
 
         self._github_users = GithubUserModel
+        WalletModel.add_index(
+            WalletModel.index(*wallet_name_keys(WalletModel.current, WalletModel.label), name='wallets_name')
+        )
+
         self._wallets = WalletModel
         self._custom_accounts = CustomAccountModel
         self._env_variables = EnvVariableModel
+        self._env_scopes = EnvScopeModel
+        self._wallet_leases = WalletLeaseModel
+
+    @classmethod
+    def _read_only_uri(cls) -> str:
+        """
+        Returns URI of the database opened in read-only mode. Other processes may still write the database,
+        so it is opened as immutable, without any file locking and change detection, only if this is enabled
+        by the CROCO_IMMUTABLE_DATABASE variable and the database has no pending WAL
+        """
+        path = cls._path
+        wal_path = f'{path}-wal'
+        uri = pathlib.Path(path).absolute().as_uri()
+
+        if cls.immutable and (not os.path.exists(wal_path) or not os.path.getsize(wal_path)):
+            return f'{uri}?immutable=1'
+
+        return f'{uri}?mode=ro'
+
+    def _table_exists(self, model: Type[Model] | str) -> bool:
+        """
+        Checks if the table of the model exists. In read-only mode, the list of tables is read once
+        and is refreshed only if the table is not found
+        :param model: The database model or name of the table
+        :return: Whether the table exists
+        """
+        table_name = model if isinstance(model, str) else model._meta.table_name
+        if not self._read_only:
+            return self.interface.table_exists(table_name)
+
+        if self._tables is None or table_name not in self._tables:
+            self._tables = set(self.interface.get_tables())
+
+        return table_name in self._tables
+
+    def clear_cache(self) -> None:
+        """
+        Forgets the list of tables and declared fields cached in read-only mode, so changes made since are noticed
+        :return: None
+        """
+        self._tables = None
+        self._custom_fields = None
+
+    @property
+    def read_only(self) -> bool:
+        """
+        :return: whether the database is opened in read-only mode
+        """
+        return self._read_only
 
     @property
     def github_users(self) -> Type[Model]:
@@ -123,6 +309,20 @@ class Database(metaclass=_DatabaseMeta):
         """
         return self._wallets
 
+    @property
+    def env_scopes(self) -> Type[Model]:
+        """
+        :return: the database model for the environment scope table
+        """
+        return self._env_scopes
+
+    @property
+    def wallet_leases(self) -> Type[Model]:
+        """
+        :return: the database model for the wallet lease table
+        """
+        return self._wallet_leases
+
     @property
     def custom_accounts(self) -> Type[Model]:
         """
@@ -137,37 +337,275 @@ class Database(metaclass=_DatabaseMeta):
         """
         return self._env_variables
 
+    @staticmethod
+    def _search_row(kind: str, row: str) -> str:
+        """Returns columns of the search index for a row of the indexed table, referenced by the name"""
+        _, _, name, detail, data = _SEARCH_SOURCES[kind]
+        rowid = f'{row}.id * {len(_SEARCH_KINDS)} + {_SEARCH_KINDS.index(kind)}'
+        return f"{rowid}, '{kind}', {name.format(row=row)}, {detail.format(row=row)}, {data.format(row=row)}"
+
+    def _search_triggers(self) -> dict[str, str]:
+        """Returns statements creating triggers keeping the search index in sync, mapped to names of the triggers"""
+        triggers = {}
+        for kind, (table, columns, *_) in _SEARCH_SOURCES.items():
+            insert = f'INSERT INTO {_SEARCH_TABLE} (rowid, kind, name, detail, data) VALUES ({self._search_row(kind, "new")});'
+            delete = f'DELETE FROM {_SEARCH_TABLE} WHERE rowid = old.id * {len(_SEARCH_KINDS)} + {_SEARCH_KINDS.index(kind)};'
+
+            events = {
+                'insert': ('AFTER INSERT', insert),
+                'update': (f'AFTER UPDATE OF {", ".join(columns)}', f'{delete} {insert}'),
+                'delete': ('AFTER DELETE', delete)
+            }
+            for event, (when, body) in events.items():
+                name = f'{_SEARCH_TABLE}_v{_SEARCH_VERSION}_{table}_{event}'
+                triggers[name] = f'CREATE TRIGGER IF NOT EXISTS {name} {when} ON {table} BEGIN {body} END'
+
+        return triggers
+
+    def ensure_search_index(self) -> None:
+        """
+        Creates the full-text search index of accounts, unless it and all of its triggers exist.
+        Dropped tables lose their triggers, so the index is rebuilt after them
+        :return: None
+        """
+        triggers = self._search_triggers()
+        existing = {
+            name for name, in self.interface.execute_sql(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE ?",
+                (f'{_SEARCH_TABLE}%',)
+            )
+        }
+
+        if not {_SEARCH_TABLE, *triggers} <= existing:
+            self._create_search_index(triggers)
+
+    @_writer
+    def _create_search_index(self, triggers: dict[str, str]) -> None:
+        """
+        Creates the search index with triggers, and fills it with existing accounts
+        :param triggers: Statements creating the triggers
+        :return: None
+        """
+        interface = self.interface
+        interface.create_tables([self.wallets, self.custom_accounts, self.env_variables])
+
+        # The index is made anew with triggers of the current version, so no text indexed by earlier ones is left
+        existing = interface.execute_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE ?", (f'{_SEARCH_TABLE}%',)
+        ).fetchall()
+        for name, in existing:
+            interface.execute_sql(f'DROP TRIGGER IF EXISTS {name}')
+
+        interface.execute_sql(f'DROP TABLE IF EXISTS {_SEARCH_TABLE}')
+        interface.execute_sql(
+            f'CREATE VIRTUAL TABLE {_SEARCH_TABLE} '
+            f'USING fts5(kind UNINDEXED, name, detail, data, tokenize="unicode61 remove_diacritics 2")'
+        )
+
+        for statement in triggers.values():
+            interface.execute_sql(statement)
+
+        for kind, (table, *_) in _SEARCH_SOURCES.items():
+            interface.execute_sql(
+                f'INSERT INTO {_SEARCH_TABLE} (rowid, kind, name, detail, data) '
+                f'SELECT {self._search_row(kind, table)} FROM {table}'
+            )
+
+    def search_accounts(self, query: str, limit: int = 20) -> list[tuple[str, Wallet | CustomAccount | EnvVar]]:
+        """
+        Searches wallets, custom accounts and environment variables by words of the query, best matches first.
+        Words are matched by prefixes in wallet labels and public keys, names, emails and keys of custom data of accounts
+        and keys of environment variables
+        :param query: The search query
+        :param limit: Maximum number of results
+        :return: Kinds of found accounts, like "wallet", "custom" or "env", paired with the accounts
+        """
+        words = [f'"{word.replace(chr(34), chr(34) * 2)}"*' for word in query.split()]
+        if not words or not self._table_exists(_SEARCH_TABLE):
+            return []
+
+        cursor = self.interface.execute_sql(
+            f'SELECT kind, rowid / {len(_SEARCH_KINDS)} FROM {_SEARCH_TABLE} '
+            f'WHERE {_SEARCH_TABLE} MATCH ? ORDER BY rank LIMIT ?',
+            (' '.join(words), limit)
+        )
+        found = list(cursor)
+
+        models = {'wallet': self.wallets, 'custom': self.custom_accounts, 'env': self.env_variables}
+        rows = {}
+        for kind, model in models.items():
+            ids = [row_id for row_kind, row_id in found if row_kind == kind]
+            if ids and self._table_exists(model):
+                rows.update({(kind, row.id): row for row in model.select().where(model.id.in_(ids))})
+
+        converters = {
+            'wallet': self.to_wallet,
+            'custom': self.to_custom_account,
+            'env': lambda row: EnvVar(key=row.key, value=row.value, scope=getattr(row, 'scope', GLOBAL_SCOPE))
+        }
+        return [(kind, converters[kind](rows[kind, row_id])) for kind, row_id in found if (kind, row_id) in rows]
+
+    def data_version(self) -> int:
+        """
+        Returns the data version of the database. It changes whenever another connection commits changes,
+        so it is a cheap way to detect modifications
+        :return: The data version
+        """
+        return self.interface.execute_sql('PRAGMA data_version').fetchone()[0]
+
+    @_writer
+    def execute_batch(self, calls: Iterable[Callable[[], Any]]) -> list[tuple[Any, Optional[BaseException]]]:
+        """
+        Executes calls in a single write transaction. Every call runs in its own savepoint,
+        so a failed call is rolled back without affecting the others
+        :param calls: Calls to be executed, like database methods bound with functools.partial
+        :return: Pairs of the result and the raised exception of each call
+        """
+        results = []
+        for call in calls:
+            try:
+                with self.interface.atomic():
+                    results.append((call(), None))
+            except Exception as err:
+                results.append((None, err))
+
+        return results
+
+    @_writer
+    def drop_tables(self, *models: Type[Model]) -> None:
+        """
+        Drops tables of the models
+        :param models: Models to drop tables of
+        :return: None
+        """
+        self.interface.drop_tables(models)
+
+        tables = {model._meta.table_name for model in models}
+        kinds = [kind for kind, (table, *_) in _SEARCH_SOURCES.items() if table in tables]
+        if kinds and self._table_exists(_SEARCH_TABLE):
+            placeholders = ', '.join('?' * len(kinds))
+            self.interface.execute_sql(f'DELETE FROM {_SEARCH_TABLE} WHERE kind IN ({placeholders})', kinds)
+
+    @_writer
     def drop_database(self) -> None:
         """
         Drops the database
         :return: None
         """
-        self.interface.drop_tables([self.github_users, self.wallets, self.custom_accounts, self.env_variables])
+        self.interface.drop_tables([
+            self.github_users,
+            self.wallets,
+            self.custom_accounts,
+            self.env_variables,
+            self.env_scopes,
+            self.wallet_leases
+        ])
+        self.interface.execute_sql(f'DROP TABLE IF EXISTS {_SEARCH_TABLE}')
+
+    @staticmethod
+    def to_wallet(wallet: Model) -> Wallet:
+        """
+        Converts a row of the wallets table to a wallet
+        :param wallet: The row
+        :return: The wallet
+        """
+        return Wallet(
+            public_key=wallet.public_key,
+            private_key=wallet.private_key,
+            mnemonic=wallet.mnemonic,
+            current=bool(wallet.current),
+            label=wallet.label
+        )
+
+    def iter_wallets(self, current: bool = False, label: Optional[str] = None) -> Iterator[Wallet]:
+        """
+        Iterates over ethereum wallets of the user without loading the whole table into memory
+        :param current: Whether only the current wallet should be returned
+        :param label: GLOB pattern, like "deployer*", the wallet label should match
+        :return: an iterator over ethereum wallets of the user
+        """
+        wallets = self._wallets
+        if not self._table_exists(wallets):
+            return
+
+        query = wallets.select()
+        if current:
+            query = query.where(wallets.current)
+
+        if label:
+            # The % operator is compiled to GLOB by SQLite databases
+            query = query.where(wallets.label % label)
+
+        # Rows are read as named tuples, which is much cheaper than building model instances
+        for wallet in query.namedtuples().iterator():
+            yield self.to_wallet(wallet)
 
     def get_wallets(self, current: bool = False) -> list[Wallet] | None:
         """
         Returns a list of all ethereum wallets of the user
         :return: a list of all ethereum wallets of the user
         """
-        if not self.wallets.table_exists():
-            return None
+        wallets = list(self.iter_wallets(current))
+        return wallets if wallets else None
 
-        if not current:
-            query = self.wallets.select()
-        else:
-            query = self.wallets.select().where(self._wallets.current)
-
-        wallets = [
-            Wallet(
-                public_key=wallet.public_key,
-                private_key=wallet.private_key,
-                mnemonic=wallet.mnemonic,
-                current=wallet.current,
-                label=wallet.label
+    @_writer
+    def lease_wallets(self, holder: str, count: int = 1, ttl: float = 3600) -> list[Wallet]:
+        """
+        Leases wallets to the holder, so parallel workers get disjoint wallets.
+        Wallets already leased to the holder are reused and their leases are renewed, expired leases are dropped.
+        If the holder has more wallets than requested, the leases of the surplus ones are released
+        :param holder: Unique name of the lease holder, like a pytest-xdist worker
+        :param count: Number of wallets to lease
+        :param ttl: Lease duration in seconds
+        :return: Leased wallets. There may be less of them than requested if other holders took the rest
+        """
+        wallets = self._wallets
+        leases = self._wallet_leases
+        self.interface.create_tables([wallets, leases])
+
+        now = time.time()
+        leases.delete().where(leases.expires_at < now).execute()
+
+        held = list(
+            wallets.select()
+            .join(leases, on=(wallets.private_key == leases.private_key))
+            .where(leases.holder == holder)
+            .order_by(wallets.id)
+        )
+        held, surplus = held[:count], held[count:]
+        if surplus:
+            leases.delete().where(
+                (leases.holder == holder) & leases.private_key.in_([wallet.private_key for wallet in surplus])
+            ).execute()
+        leases.update(expires_at=now + ttl).where(leases.holder == holder).execute()
+
+        free = []
+        if len(held) < count:
+            free = list(
+                wallets.select()
+                .where(wallets.private_key.not_in(leases.select(leases.private_key)))
+                .order_by(wallets.id)
+                .limit(count - len(held))
             )
-            for wallet in query
-        ]
-        return wallets if wallets else None
+
+        if free:
+            leases.insert_many([
+                {'private_key': wallet.private_key, 'holder': holder, 'expires_at': now + ttl}
+                for wallet in free
+            ]).execute()
+
+        return [self.to_wallet(wallet) for wallet in held + free]
+
+    @_writer
+    def release_wallets(self, holder: str) -> None:
+        """
+        Releases wallets leased to the holder
+        :param holder: Unique name of the lease holder
+        :return: None
+        """
+        leases = self._wallet_leases
+        if leases.table_exists():
+            leases.delete().where(leases.holder == holder).execute()
 
     def get_github_user(self) -> GithubUser | None:
         """
@@ -175,7 +613,7 @@ class Database(metaclass=_DatabaseMeta):
         :return: The info about the GitHub user represented as GithubUser dictionary
         """
         query = self.github_users.select()
-        if not self.github_users.table_exists():
+        if not self._table_exists(self.github_users):
             return None
 
         for user in query:
@@ -193,12 +631,11 @@ class Database(metaclass=_DatabaseMeta):
         :param token: A personal access token
         :return: None
         """
-        github_users = self._github_users
-        self.interface.create_tables([github_users])
-
-        if github_users.table_exists():
-            github_users.delete().execute()
+        user, email = self._fetch_github_user(token)
+        self._save_github_user(user, email, token)
 
+    @staticmethod
+    def _fetch_github_user(token: str) -> tuple[AuthenticatedUser, str]:
         _auth = Auth.Token(token)
 
         with Github(auth=_auth) as github_api:
@@ -213,21 +650,51 @@ class Database(metaclass=_DatabaseMeta):
             except BadCredentialsException:
                 raise InvalidToken
 
+        return user, user_email
+
+    @_writer
+    def _save_github_user(self, user: AuthenticatedUser, email: str, token: str) -> None:
+        github_users = self._github_users
+        self.interface.create_tables([github_users])
+
+        github_users.delete().execute()
         github_users.create(
             data=pickle.dumps(user),
             login=user.login,
             name=user.name,
-            email=user_email,
+            email=email,
             access_token=token
         )
 
+    @_writer
     def delete_github_user(self, token: str) -> None:
         github_user = self._github_users
         github_user.delete().where(github_user.access_token == token).execute()
 
     def delete_wallet(self, private_key: str) -> None:
-        wallets_table = self._wallets
-        wallets_table.delete().where(wallets_table.private_key == private_key).execute()
+        """
+        Deletes the wallet. If it was the current one, the last wallet becomes current
+        :param private_key: Private key of the wallet
+        :return: None
+        """
+        self.delete_wallets([private_key])
+
+    @_writer
+    def delete_wallets(self, private_keys: Iterable[str]) -> None:
+        """
+        Deletes wallets in one transaction. If the current wallet was deleted, the last wallet becomes current
+        :param private_keys: Private keys of the wallets
+        :return: None
+        """
+        wallets = self._wallets
+        private_keys = list(private_keys)
+
+        for i in range(0, len(private_keys), _DELETE_BATCH_SIZE):
+            wallets.delete().where(wallets.private_key.in_(private_keys[i:i + _DELETE_BATCH_SIZE])).execute()
+
+        if not wallets.select().where(wallets.current).exists():
+            last_wallet = wallets.select(fn.max(wallets.id))
+            wallets.update(current=True).where(wallets.id == last_wallet).execute()
 
     @staticmethod
     def get_public_key(private_key: str) -> str:
@@ -250,6 +717,7 @@ class Database(metaclass=_DatabaseMeta):
         except ValidationError:
             raise InvalidMnemonic
 
+    @_writer
     def set_wallet(
             self,
             private_key: str,
@@ -274,21 +742,10 @@ class Database(metaclass=_DatabaseMeta):
         if mnemonic and private_key != self._get_private_key(mnemonic):
             raise InvalidMnemonic
 
-        existing_wallets = wallets.select().where(wallets.private_key == private_key)
+        wallets.update(current=False).where(wallets.current).execute()
+        updated = wallets.update(current=True).where(wallets.private_key == private_key).execute()
 
-        current_wallets = wallets.select().where(wallets.current)
-        if len(current_wallets) == 1:
-            for current_wallet in current_wallets:
-                current_wallet.current = False
-                current_wallet.save()
-                break
-
-        if len(existing_wallets) == 1:
-            for wallet in existing_wallets:
-                wallet.current = True
-                wallet.save()
-                break
-        else:
+        if not updated:
             public_key = self.get_public_key(private_key)
             wallets.create(
                 public_key=public_key,
@@ -298,44 +755,168 @@ class Database(metaclass=_DatabaseMeta):
                 label=label
             )
 
-    def get_custom_accounts(
+    def custom_fields(self) -> set[str]:
+        """
+        Returns fields of custom accounts data, which are declared and extracted to indexed columns
+        :return: Names of the fields
+        """
+        if self._custom_fields is None:
+            fields = set()
+            if self._table_exists(self._custom_accounts):
+                # Generated columns are hidden columns of the table, marked by 2 (virtual) or 3 (stored)
+                for _, name, _, _, _, _, hidden in self.interface.execute_sql('PRAGMA table_xinfo(custom_accounts)'):
+                    if hidden in (2, 3) and name.startswith(_FIELD_COLUMN_PREFIX):
+                        fields.add(name[len(_FIELD_COLUMN_PREFIX):])
+
+            self._custom_fields = fields
+
+        return self._custom_fields
+
+    @_writer
+    def declare_custom_field(self, key: str) -> None:
+        """
+        Declares a field of custom accounts data. The field is extracted from JSON of the data to a generated column
+        with an index, so filtering accounts by the field does not parse the data of every account
+        :param key: Key of the field
+        :return: None
+        """
+        if not _FIELD_NAME.match(key):
+            raise InvalidFieldName
+
+        custom_accounts = self._custom_accounts
+        self.interface.create_tables([custom_accounts])
+        self._custom_fields = None
+
+        if key in self.custom_fields():
+            return
+
+        column = f'{_FIELD_COLUMN_PREFIX}{key}'
+        self.interface.execute_sql(
+            f'ALTER TABLE custom_accounts ADD COLUMN "{column}" '
+            f'GENERATED ALWAYS AS (json_extract(data, \'$.{key}\')) VIRTUAL'
+        )
+        self.interface.execute_sql(f'CREATE INDEX IF NOT EXISTS "custom_accounts_{column}" ON custom_accounts ("{column}")')
+        self._custom_fields.add(key)
+
+    def data_condition(self, where: dict[str, Optional[str]]) -> Optional[Expression]:
+        """
+        Builds a condition matching custom accounts by fields of their data. Declared fields are compared
+        using their indexed columns, others are extracted from JSON of the data
+        :param where: Values of the fields. None matches accounts without the field
+        :return: The condition, or None if there are no fields
+        """
+        declared = self.custom_fields()
+        condition = None
+
+        for key, value in where.items():
+            if key in declared:
+                field = SQL(f'"{_FIELD_COLUMN_PREFIX}{key}"')
+            else:
+                field = fn.json_extract(self._custom_accounts.data, _json_path(key))
+
+            field_condition = field.is_null() if value is None else field == value
+            condition = field_condition if condition is None else condition & field_condition
+
+        return condition
+
+    @_writer
+    def set_custom_account_field(
             self,
-            account: Optional[str] = None,
-            current: bool = False
-    ) -> list[CustomAccount] | None:
+            account: str,
+            key: str,
+            value: Optional[str],
+            email: Optional[str] = None
+    ) -> int:
         """
-        Returns list of custom accounts of user
+        Sets a field of custom accounts data in place, without rewriting other fields
         :param account: A name of accounts
+        :param key: Key of the field
+        :param value: Value of the field. The field is removed if it is None
+        :param email: Email of the account. The current account of the name is updated if not provided
+        :return: Number of updated accounts
+        """
+        custom_accounts = self._custom_accounts
+        if not custom_accounts.table_exists():
+            return 0
+
+        data = custom_accounts.data
+        path = _json_path(key)
+        # Accounts set without data store JSON null, which is replaced with an object
+        data = Case(None, [(fn.json_type(data) == 'object', data)], '{}')
+        data = fn.json_remove(data, path) if value is None else fn.json_set(data, path, value)
+
+        condition = custom_accounts.account == account
+        condition &= custom_accounts.current if email is None else custom_accounts.email == email
+
+        return custom_accounts.update(data=data).where(condition).execute()
+
+    def iter_custom_accounts(
+            self,
+            account: Optional[str | Iterable[str]] = None,
+            current: bool = False,
+            where: Optional[dict[str, Optional[str]]] = None
+    ) -> Iterator[CustomAccount]:
+        """
+        Iterates over custom accounts of user without loading the whole table into memory
+        :param account: A name of accounts or several names
         :param current: Whether accounts should be current
-        :return:
+        :param where: Values of fields of the data, like {'region': 'eu'}, the accounts should have
+        :return: an iterator over custom accounts of user
         """
         custom_accounts = self._custom_accounts
 
-        if not custom_accounts.table_exists():
+        if not self._table_exists(custom_accounts):
             return
 
-        if account:
+        if isinstance(account, str):
             query = custom_accounts.select().where(custom_accounts.account == account)
+        elif account:
+            query = custom_accounts.select().where(custom_accounts.account.in_(list(account)))
         else:
             query = self.custom_accounts.select()
 
         if current:
-            query = filter(lambda current_account: current_account.current, query)
-
-        accounts = [
-            CustomAccount(
-                account=account.account,
-                password=account.password,
-                current=account.current,
-                email=account.email,
-                email_password=account.email_password,
-                data=json.loads(account.data)
-            )
-            for account in query
-        ]
+            query = query.where(custom_accounts.current)
+
+        if where:
+            query = query.where(self.data_condition(where))
+
+        for account in query.iterator():
+            yield self.to_custom_account(account)
 
+    @staticmethod
+    def to_custom_account(account: Model) -> CustomAccount:
+        """
+        Converts a row of the custom accounts table to a custom account
+        :param account: The row
+        :return: The custom account
+        """
+        return CustomAccount(
+            account=account.account,
+            password=account.password,
+            current=account.current,
+            email=account.email,
+            email_password=account.email_password,
+            data=json.loads(account.data)
+        )
+
+    def get_custom_accounts(
+            self,
+            account: Optional[str] = None,
+            current: bool = False,
+            where: Optional[dict[str, Optional[str]]] = None
+    ) -> list[CustomAccount] | None:
+        """
+        Returns list of custom accounts of user
+        :param account: A name of accounts
+        :param current: Whether accounts should be current
+        :param where: Values of fields of the data, like {'region': 'eu'}, the accounts should have
+        :return:
+        """
+        accounts = list(self.iter_custom_accounts(account, current, where))
         return accounts if accounts else None
 
+    @_writer
     def set_custom_account(
             self,
             account: str,
@@ -358,22 +939,11 @@ class Database(metaclass=_DatabaseMeta):
 
         database.create_tables([custom_accounts])
 
-        existing_accounts = custom_accounts.select().where(custom_accounts.account == account)
-
-        skip_creating = False
-        if len(existing_accounts) > 0:
-            for existing_account in existing_accounts:
-                if existing_account.email == email:
-                    existing_account.current = True
-                    existing_account.save()
-                    skip_creating = True
-                    continue
+        same_account = custom_accounts.account == account
+        custom_accounts.update(current=False).where(same_account & (custom_accounts.email != email)).execute()
+        updated = custom_accounts.update(current=True).where(same_account & (custom_accounts.email == email)).execute()
 
-                if existing_account.current:
-                    existing_account.current = False
-                    existing_account.save()
-
-        if not skip_creating:
+        if not updated:
             custom_accounts.create(
                 account=account,
                 password=password,
@@ -383,58 +953,247 @@ class Database(metaclass=_DatabaseMeta):
                 data=json.dumps(data)
             )
 
-    def delete_custom_accounts(self, account: str, email: Optional[str] = None) -> None:
+    @_writer
+    def delete_custom_accounts(self, account: str, email: Optional[str | Iterable[str]] = None) -> None:
         """
-        Delete custom user accounts
+        Delete custom user accounts. If the current account was deleted, the last account of the name becomes current
         :param account: A name of accounts
-        :param email: Email of accounts
+        :param email: Email of accounts or several emails
         :return: None
         """
         custom_accounts = self._custom_accounts
+        same_account = custom_accounts.account == account
 
-        if email:
-            custom_accounts.delete().where(
-                custom_accounts.account == account and custom_accounts.email == email
-            ).execute()
-        else:
+        if email is None:
+            custom_accounts.delete().where(same_account).execute()
+            return
+
+        emails = [email] if isinstance(email, str) else list(email)
+        for i in range(0, len(emails), _DELETE_BATCH_SIZE):
             custom_accounts.delete().where(
-                custom_accounts.account == account
+                same_account & custom_accounts.email.in_(emails[i:i + _DELETE_BATCH_SIZE])
             ).execute()
 
+        if not custom_accounts.select().where(same_account & custom_accounts.current).exists():
+            last_account = custom_accounts.select(fn.max(custom_accounts.id)).where(same_account)
+            custom_accounts.update(current=True).where(custom_accounts.id == last_account).execute()
+
+    def _is_env_scoped(self) -> bool:
+        """
+        Checks if the environment variable table has scopes. Tables made by earlier versions have only global
+        variables, until they are upgraded by the next write. The table can be upgraded by another process
+        at any time, so the result is not cached
+        :return: Whether the table has the scope column
+        """
+        env_variables = self._env_variables
+        return not self._table_exists(env_variables) or any(
+            column.name == 'scope' for column in self.interface.get_columns(env_variables._meta.table_name)
+        )
+
+    def _create_env_tables(self) -> None:
+        """
+        Creates tables of environment variables and scopes, upgrading the variable table without scopes
+        :return: None
+        """
+        interface = self.interface
+        if not self._is_env_scoped():
+            interface.execute_sql("ALTER TABLE env_variables ADD COLUMN scope VARCHAR(255) NOT NULL DEFAULT ''")
+            interface.execute_sql('DROP INDEX IF EXISTS envvariablemodel_key')
+
+        interface.create_tables([self._env_variables, self._env_scopes])
+
+    @_writer
     def set_envar(
             self,
             key: str,
-            value: str
+            value: str,
+            scope: str = GLOBAL_SCOPE
     ) -> None:
+        """
+        Sets an environment variable. Scopes are created on first use, inheriting only global variables
+        :param key: Key of the variable
+        :param value: Value of the variable
+        :param scope: Name of the scope, like "sepolia". Variables are global by default
+        :return: None
+        """
         env_variables = self._env_variables
-        self.interface.create_tables([env_variables])
+        env_scopes = self._env_scopes
+        self._create_env_tables()
+
+        if scope != GLOBAL_SCOPE:
+            env_scopes.insert(name=scope).on_conflict_ignore().execute()
+
+        env_variables.insert(key=key, value=value, scope=scope).on_conflict(
+            conflict_target=[env_variables.scope, env_variables.key],
+            preserve=[env_variables.value]
+        ).execute()
+
+    @_writer
+    def set_env_scope(self, name: str, parent: Optional[str] = None) -> None:
+        """
+        Creates a scope of environment variables or changes its parent. Variables of the parent scope
+        and its ancestors are inherited unless they are overridden
+        :param name: Name of the scope, like "my-project"
+        :param parent: Name of the parent scope, like "sepolia". If not provided, an existing scope keeps its parent,
+            and a new one inherits only global variables. GLOBAL_SCOPE detaches the scope from its parent
+        :return: None
+        """
+        env_scopes = self._env_scopes
+        self._create_env_tables()
+
+        if name == GLOBAL_SCOPE or (parent and name in self.get_env_scope_chain(parent)):
+            raise InvalidScope
+
+        if parent is None:
+            env_scopes.insert(name=name).on_conflict_ignore().execute()
+            return
+
+        if parent:
+            env_scopes.insert(name=parent).on_conflict_ignore().execute()
+
+        env_scopes.insert(name=name, parent=parent or None).on_conflict(
+            conflict_target=[env_scopes.name],
+            preserve=[env_scopes.parent]
+        ).execute()
+
+    def iter_env_scopes(self) -> Iterator[EnvScope]:
+        """
+        Iterates over scopes of environment variables
+        :return: an iterator over the scopes
+        """
+        env_scopes = self._env_scopes
+        if not self._table_exists(env_scopes):
+            return
+
+        for name, parent in env_scopes.select(env_scopes.name, env_scopes.parent).tuples().iterator():
+            yield EnvScope(name=name, parent=parent)
+
+    def _scope_chain_sql(self) -> str:
+        """Returns a common table expression of the scope and its ancestors, ordered by depth"""
+        if not self._table_exists(self._env_scopes):
+            return 'chain(name, depth) AS (SELECT ?, 1)'
 
-        existing_variables = env_variables.select().where(env_variables.key == key)
-        if len(existing_variables):
-            for existing_variable in existing_variables:
-                existing_variable.value = value
+        return (
+            'chain(name, depth) AS ('
+            'SELECT ?, 1 '
+            'UNION ALL '
+            'SELECT env_scopes.parent, chain.depth + 1 FROM env_scopes JOIN chain ON env_scopes.name = chain.name '
+            f'WHERE env_scopes.parent IS NOT NULL AND chain.depth < {_MAX_SCOPE_DEPTH})'
+        )
+
+    def env_scope_exists(self, scope: str) -> bool:
+        """
+        Checks if the scope of environment variables exists. The global scope always exists
+        :param scope: Name of the scope
+        :return: Whether the scope exists
+        """
+        env_scopes = self._env_scopes
+        if scope == GLOBAL_SCOPE:
+            return True
+
+        return self._table_exists(env_scopes) and env_scopes.select().where(env_scopes.name == scope).exists()
+
+    def get_env_scope_chain(self, scope: str) -> list[str]:
+        """
+        Returns the scope followed by its ancestors, ending with the global scope
+        :param scope: Name of the scope
+        :return: Names of the scopes, from the most specific one
+        """
+        if scope == GLOBAL_SCOPE:
+            return [GLOBAL_SCOPE]
+
+        cursor = self.interface.execute_sql(
+            f'WITH RECURSIVE {self._scope_chain_sql()} SELECT name FROM chain ORDER BY depth',
+            (scope,)
+        )
+        chain = []
+        for name, in cursor:
+            if name in chain:
                 break
-        else:
-            env_variables.create(
-                key=key,
-                value=value
-            )
+            chain.append(name)
+
+        return chain + [GLOBAL_SCOPE]
+
+    def resolve_env_variables(self, scope: Optional[str] = None) -> list[EnvVar]:
+        """
+        Resolves environment variables of the scope in one query. Variables of the scope override
+        the ones of its ancestors, which override global variables
+        :param scope: Name of the scope, like "sepolia". Only global variables are resolved if not provided
+        :return: Environment variables, in order they were set
+        """
+        scope = scope or GLOBAL_SCOPE
+        if not self.env_scope_exists(scope):
+            raise UnknownScope(scope)
 
-    def get_env_variables(self) -> list[EnvVar] | None:
         env_variables = self._env_variables
-        if not env_variables.table_exists():
+        if not self._table_exists(env_variables):
+            return []
+
+        if not self._is_env_scoped():
+            return list(self.iter_env_variables(scope=GLOBAL_SCOPE))
+
+        # The value and the scope of the bare columns are taken from the row with the minimal depth.
+        # Variables keep the position of their first layer, so overriding a global variable does not move it
+        cursor = self.interface.execute_sql(
+            f'WITH RECURSIVE {self._scope_chain_sql()}, '
+            f'layers(name, depth) AS (SELECT name, depth FROM chain UNION ALL SELECT ?, {_MAX_SCOPE_DEPTH + 1}), '
+            'resolved AS ('
+            'SELECT env_variables.key, env_variables.value, env_variables.scope, min(layers.depth) '
+            'FROM layers JOIN env_variables ON env_variables.scope = layers.name '
+            'GROUP BY env_variables.key) '
+            'SELECT resolved.key, resolved.value, resolved.scope FROM resolved ORDER BY ('
+            'SELECT min(env_variables.id) FROM layers JOIN env_variables '
+            'ON env_variables.scope = layers.name AND env_variables.key = resolved.key)',
+            (scope, GLOBAL_SCOPE)
+        )
+
+        return [EnvVar(key=key, value=value, scope=scope) for key, value, scope in cursor]
+
+    def iter_env_variables(self, prefix: Optional[str] = None, scope: Optional[str] = None) -> Iterator[EnvVar]:
+        """
+        Iterates over environment variables without loading the whole table into memory
+        :param prefix: Prefix of the variable keys, like "RPC_"
+        :param scope: Name of the scope the variables are set in. Variables of all scopes are returned if not provided
+        :return: an iterator over environment variables
+        """
+        env_variables = self._env_variables
+        if not self._table_exists(env_variables):
             return
 
-        query = env_variables.select()
+        scoped = self._is_env_scoped()
+        if scoped:
+            query = env_variables.select()
+        else:
+            query = env_variables.select(env_variables.id, env_variables.key, env_variables.value)
+
+        if prefix:
+            query = query.where(env_variables.key % f'{_escape_glob(prefix)}*')
 
-        return [
-            EnvVar(
+        if scope is not None:
+            if scoped:
+                query = query.where(env_variables.scope == scope)
+            elif scope != GLOBAL_SCOPE:
+                return
+
+        for env_variable in query.order_by(env_variables.id).namedtuples().iterator():
+            yield EnvVar(
                 key=env_variable.key,
-                value=env_variable.value
+                value=env_variable.value,
+                scope=env_variable.scope if scoped else GLOBAL_SCOPE
             )
-            for env_variable in query
-        ]
 
+    def get_env_variables(self) -> list[EnvVar] | None:
+        """
+        Returns global environment variables. Variables of scopes are resolved by resolve_env_variables
+        :return: Global environment variables or None if the table does not exist
+        """
+        env_variables = self._env_variables
+        if not self._table_exists(env_variables):
+            return
+
+        return list(self.iter_env_variables(scope=GLOBAL_SCOPE))
+
+    @_writer
     def delete_env_variables(self) -> None:
         env_variables = self._env_variables
         env_variables.delete().execute()
@@ -0,0 +1,116 @@
+"""
+This module provides emitters rendering environment variables in different formats.
+An emitter yields pieces of the output, which are joined and written at once
+"""
+import json
+import re
+import shlex
+import uuid
+from typing import Callable, Iterator
+from croco_cli.types import Emitter, EnvSections
+from croco_cli._environment import flatten_environment
+from croco_cli.exceptions import MultilineValue
+
+EMITTERS: dict[str, Emitter] = {}
+
+_TOML_BARE_KEY = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def register_emitter(name: str) -> Callable[[Emitter], Emitter]:
+    """
+    Decorator to register an emitter of the format.
+
+    :param name: Name of the format
+    :return: The decorator
+    """
+    def decorator(func: Emitter) -> Emitter:
+        EMITTERS[name] = func
+        return func
+
+    return decorator
+
+
+def render_environment(format_: str, sections: EnvSections) -> str:
+    """
+    Render environment variables in the format.
+
+    :param format_: Name of the format
+    :param sections: Groups of variables mapped to the comment of their section
+    :return: The rendered content
+    """
+    return ''.join(EMITTERS[format_](sections))
+
+
+def _iter_commented(sections: EnvSections, line: Callable[[str, str], str]) -> Iterator[str]:
+    """Yields lines of sections separated by comments, as in dotenv files"""
+    for comment, groups in sections.items():
+        yield f'# {comment}\n'
+        for group in groups:
+            for key, value in group.items():
+                yield line(key, value)
+            yield '\n'
+
+
+def _without_overridden(sections: EnvSections) -> EnvSections:
+    """Returns sections in which every key is kept only in its last group, as it is resolved by flattening"""
+    last = {
+        key: (comment, i)
+        for comment, groups in sections.items()
+        for i, group in enumerate(groups)
+        for key in group
+    }
+    return {
+        comment: [
+            {key: value for key, value in group.items() if last[key] == (comment, i)}
+            for i, group in enumerate(groups)
+        ]
+        for comment, groups in sections.items()
+    }
+
+
+@register_emitter('dotenv')
+def _dotenv(sections: EnvSections) -> Iterator[str]:
+    return _iter_commented(sections, lambda key, value: f"{key}='{value}'\n")
+
+
+@register_emitter('json')
+def _json(sections: EnvSections) -> Iterator[str]:
+    yield json.dumps(flatten_environment(sections), indent=2)
+    yield '\n'
+
+
+@register_emitter('toml')
+def _toml(sections: EnvSections) -> Iterator[str]:
+    """Keys of one TOML table must be unique, so overridden variables are left out"""
+    def line(key: str, value: str) -> str:
+        key = key if _TOML_BARE_KEY.match(key) else json.dumps(key)
+        return f'{key} = {json.dumps(value)}\n'
+
+    return _iter_commented(_without_overridden(sections), line)
+
+
+@register_emitter('shell')
+def _shell(sections: EnvSections) -> Iterator[str]:
+    return _iter_commented(sections, lambda key, value: f'export {key}={shlex.quote(value)}\n')
+
+
+@register_emitter('github')
+def _github(sections: EnvSections) -> Iterator[str]:
+    """Format of the file in $GITHUB_ENV. Multiline values use a random delimiter"""
+    for key, value in flatten_environment(sections).items():
+        if '\n' in value:
+            delimiter = f'ghadelimiter_{uuid.uuid4()}'
+            yield f'{key}<<{delimiter}\n{value}\n{delimiter}\n'
+        else:
+            yield f'{key}={value}\n'
+
+
+@register_emitter('docker')
+def _docker(sections: EnvSections) -> Iterator[str]:
+    """Format of the file for "docker run --env-file". Values are taken literally, without quotes"""
+    def line(key: str, value: str) -> str:
+        if '\n' in value or '\r' in value:
+            raise MultilineValue(key, 'docker')
+        return f'{key}={value}\n'
+
+    return _iter_commented(sections, line)
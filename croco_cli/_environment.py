@@ -0,0 +1,55 @@
+"""
+This module resolves environment variables of the user for projects
+"""
+from typing import Optional
+from croco_cli._database import Database
+from croco_cli.types import EnvSections
+from croco_cli.utils import constant_case
+
+
+def resolve_environment(database: Database, scope: Optional[str] = None) -> EnvSections:
+    """
+    Resolve environment variables from the current wallet, environment variables and current custom accounts.
+
+    :param database: The database to read accounts from
+    :param scope: Scope of environment variables, like "sepolia". Only global variables are used if not provided
+    :return: Groups of variables mapped to the comment of their section
+    """
+    sections: EnvSections = {}
+
+    if current_wallets := database.get_wallets(current=True):
+        current_wallet = current_wallets[0]
+        sections['Wallet credential'] = [{
+            'TEST_PRIVATE_KEY': current_wallet['private_key'],
+            'TEST_MNEMONIC': str(current_wallet['mnemonic'])
+        }]
+
+    if env_variables := database.resolve_env_variables(scope):
+        sections['Environment variables'] = [{env_var['key']: env_var['value'] for env_var in env_variables}]
+
+    if custom_accounts := database.get_custom_accounts(current=True):
+        groups = []
+        for custom_account in custom_accounts:
+            account = custom_account.pop('account')
+            custom_account.pop('current')
+            custom_data = custom_account.pop('data') or {}
+
+            group = {}
+            for key, value in (custom_account | custom_data).items():
+                group[constant_case(f'{account}_{key}')] = str(value)
+
+            groups.append(group)
+
+        sections['Custom account credentials'] = groups
+
+    return sections
+
+
+def flatten_environment(sections: EnvSections) -> dict[str, str]:
+    """
+    Merge sections of environment variables into a single mapping.
+
+    :param sections: Groups of variables mapped to the comment of their section
+    :return: Environment variables mapped to their values
+    """
+    return {key: value for groups in sections.values() for group in groups for key, value in group.items()}
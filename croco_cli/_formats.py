@@ -0,0 +1,114 @@
+"""
+This module provides formatters rendering records of user accounts in machine-readable formats.
+A formatter consumes records one by one and yields pieces of the output, so large listings are streamed
+"""
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+from croco_cli.types import Formatter
+
+FORMATTERS: dict[str, Formatter] = {}
+
+# Number of rows the column widths of a table are computed from
+_TABLE_CHUNK_SIZE = 1000
+
+
+def register_formatter(name: str) -> Callable[[Formatter], Formatter]:
+    """
+    Decorator to register a formatter of the format.
+
+    :param name: Name of the format
+    :return: The decorator
+    """
+    def decorator(func: Formatter) -> Formatter:
+        FORMATTERS[name] = func
+        return func
+
+    return decorator
+
+
+def render_records(format_: str, records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """
+    Render records in the format, piece by piece.
+
+    :param format_: Name of the format
+    :param records: The records
+    :return: Iterator over pieces of the output
+    """
+    return FORMATTERS[format_](iter(records))
+
+
+def _cell(value: Any) -> str:
+    """Returns a value as a cell of CSV and table formats. Nested values are dumped to JSON"""
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+
+    return str(value)
+
+
+@register_formatter('json')
+def _json(records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    separator = '[\n  '
+    for record in records:
+        yield separator
+        yield json.dumps(record)
+        separator = ',\n  '
+
+    yield '[]\n' if separator.startswith('[') else '\n]\n'
+
+
+@register_formatter('ndjson')
+def _ndjson(records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    for record in records:
+        yield json.dumps(record)
+        yield '\n'
+
+
+@register_formatter('csv')
+def _csv(records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    header = None
+
+    for record in records:
+        if header is None:
+            header = list(record)
+            writer.writerow(header)
+
+        writer.writerow([_cell(record.get(key)) for key in header])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@register_formatter('table')
+def _table(records: Iterable[dict[str, Any]]) -> Iterator[str]:
+    """Aligned columns for humans. Widths are computed from the first rows, longer values widen their row only"""
+    records = iter(records)
+    chunk = list(islice(records, _TABLE_CHUNK_SIZE))
+    if not chunk:
+        return
+
+    header = list(chunk[0])
+    widths = [len(key) for key in header]
+    rows = []
+    for record in chunk:
+        row = [_cell(record.get(key)) for key in header]
+        widths = [max(width, len(cell)) for width, cell in zip(widths, row)]
+        rows.append(row)
+
+    def line(cells: list[str]) -> str:
+        return '  '.join(cell.ljust(width) for cell, width in zip(cells, widths)).rstrip() + '\n'
+
+    yield line([key.upper() for key in header])
+    yield line(['-' * width for width in widths])
+
+    for row in rows:
+        yield line(row)
+
+    for record in records:
+        yield line([_cell(record.get(key)) for key in header])
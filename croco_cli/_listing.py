@@ -0,0 +1,311 @@
+"""
+This module provides listings of user accounts queried page by page. Filtering, sorting and default labels
+of wallets are computed by SQLite, so only rows of the requested page are read
+"""
+import json
+import base64
+import binascii
+from typing import Any, Iterator, Optional, Sequence
+from peewee import Expression, Field, Select, Tuple, Value, Window, fn
+from croco_cli._database import Database, wallet_name_keys
+from croco_cli._providers import search_condition
+from croco_cli.exceptions import InvalidCursor
+
+SORTS = ('name', 'created')
+
+
+def encode_cursor(scope: str, keys: Sequence[Any]) -> str:
+    """
+    Encode sorting keys of the last row of a page to an opaque cursor
+
+    :param scope: Name of the listing and its sorting, the cursor can be used with
+    :param keys: Sorting keys of the row
+    :return: The cursor
+    """
+    data = json.dumps([scope, *keys], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(scope: str, cursor: str, keys_count: int) -> list[Any]:
+    """
+    Decode sorting keys of a row from a cursor
+
+    :param scope: Name of the listing and its sorting, the cursor is expected to be made for
+    :param cursor: The cursor
+    :param keys_count: Number of the sorting keys
+    :return: The sorting keys
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        raise InvalidCursor
+
+    if not isinstance(data, list) or len(data) != keys_count + 1 or data[0] != scope:
+        raise InvalidCursor
+
+    return data[1:]
+
+
+class Page:
+    def __init__(
+            self,
+            query: Optional[Select],
+            order_by: Sequence[Expression | Field],
+            scope: str,
+            limit: Optional[int] = None,
+            offset: int = 0,
+            cursor: Optional[str] = None,
+            filtered: bool = False
+    ):
+        """
+        Rows of a listing page, read lazily using keyset pagination. The cursor of the next page
+        is known after the rows are iterated.
+
+        :param query: The query of rows. None stands for a missing table
+        :param order_by: Expressions the rows are sorted by. Together they must be unique
+        :param scope: Name of the listing and its sorting, cursors are bound to
+        :param limit: Maximum number of rows. All rows are read if not provided
+        :param offset: Number of rows to skip
+        :param cursor: Cursor of the previous page, rows after it are read
+        :param filtered: Whether the rows are filtered
+        """
+        self.__query = query
+        self.__order_by = list(order_by)
+        self.__scope = scope
+        self.__limit = limit
+        self.__offset = offset
+        self.__keys = decode_cursor(scope, cursor, len(self.__order_by)) if cursor else None
+        self.partial = bool(filtered or offset or cursor)
+        self.next_cursor: Optional[str] = None
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.__query is None:
+            return
+
+        order_by = self.__order_by
+        keys_count = len(order_by)
+        query = self.__query.select_extend(*[key.alias(f'key{i}_') for i, key in enumerate(order_by)])
+
+        if self.__keys is not None:
+            query = query.where(Tuple(*order_by) > Tuple(*self.__keys))
+
+        query = query.order_by(*order_by)
+        if self.__offset:
+            query = query.offset(self.__offset)
+
+        limit = self.__limit
+        if limit is not None:
+            # One more row is read to know whether there is the next page
+            query = query.limit(limit + 1)
+
+        last_row = None
+        for position, row in enumerate(query.namedtuples().iterator()):
+            if position == limit:
+                keys = [getattr(last_row, f'key{i}_') for i in range(keys_count)]
+                self.next_cursor = encode_cursor(self.__scope, keys)
+                break
+
+            last_row = row
+            yield row
+
+
+def select_wallets(database: Database, label: Optional[str] = None, numbered: str = 'count') -> tuple[Select, Any]:
+    """
+    Query wallets with the display_label column: wallets without labels are numbered "Wallet N" in order
+    of their creation. Wallets are shown by this label everywhere
+
+    :param database: The database
+    :param label: GLOB pattern, like "deployer*", the wallet label should match. Unlabelled wallets never match it
+    :param numbered: "count" to count previous unlabelled wallets of each read one using the label index,
+                     so only wallets of the read page are numbered, "window" to number all wallets at once,
+                     which is faster if all of them are read or searched
+    :return: The query and its columns
+    """
+    wallets = database.wallets
+
+    if label:
+        # Unlabelled wallets never match the pattern, so the numbering is not needed and the label index is used
+        display_label = wallets.label
+        query = wallets.select().where(wallets.label % label)
+    else:
+        if numbered == 'count':
+            previous = wallets.alias('previous')
+            number = (
+                previous
+                .select(fn.COUNT(previous.id))
+                .where(previous.label.is_null() & (previous.id <= wallets.id))
+            )
+        else:
+            number = fn.SUM(wallets.label.is_null()).over(order_by=[wallets.id], frame_type=Window.ROWS)
+
+        display_label = fn.COALESCE(wallets.label, Value('Wallet ').concat(number))
+        query = wallets.select()
+
+    subquery = query.select_extend(display_label.alias('display_label')).alias('w')
+    columns = subquery.c
+    query = Select((subquery,), (
+        columns.id,
+        columns.public_key,
+        columns.private_key,
+        columns.mnemonic,
+        columns.current,
+        columns.label,
+        columns.display_label
+    )).bind(database.interface)
+
+    return query, columns
+
+
+def order_wallets(columns: Any, sort: str = 'name') -> tuple[Expression | Field, ...]:
+    """
+    Get expressions wallets are sorted by. Both sorts are backed by indexes, so pages are read without sorting
+
+    :param columns: Columns of the query of the select_wallets function
+    :param sort: "name" to sort by labels, with the current wallet and unlabelled wallets in order of creation
+                 first, "created" to sort by creation
+    :return: The expressions
+    """
+    if sort == 'name':
+        return *wallet_name_keys(columns.current, columns.label), columns.id
+
+    return (columns.id,)
+
+
+def list_wallets(
+        database: Database,
+        label: Optional[str] = None,
+        search: Optional[str] = None,
+        sort: str = 'name',
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None
+) -> Page:
+    """
+    Query a page of wallets. Rows have the display_label column of the select_wallets function
+
+    :param database: The database
+    :param label: GLOB pattern, like "deployer*", the wallet label should match
+    :param search: Words to be found in display labels or public keys
+    :param sort: "name" or "created", like in the order_wallets function
+    :param limit: Maximum number of wallets
+    :param offset: Number of wallets to skip
+    :param cursor: Cursor of the previous page
+    :return: The page
+    """
+    # Only wallets of a page are numbered, unless all of them are read or searched
+    numbered = 'count' if limit is not None and not search else 'window'
+    query, columns = select_wallets(database, label, numbered)
+
+    if search and (condition := search_condition(search, (columns.display_label, columns.public_key))):
+        query = query.where(condition)
+
+    return Page(
+        query if database._table_exists(database.wallets) else None,
+        order_wallets(columns, sort),
+        f'wallets:{sort}',
+        limit,
+        offset,
+        cursor,
+        filtered=bool(label or search)
+    )
+
+
+def list_custom_accounts(
+        database: Database,
+        account: Optional[str] = None,
+        where: Optional[dict[str, Optional[str]]] = None,
+        search: Optional[str] = None,
+        sort: str = 'created',
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None
+) -> Page:
+    """
+    Query a page of custom accounts
+
+    :param database: The database
+    :param account: A name of accounts
+    :param where: Values of fields of the data, like {'region': 'eu'}, the accounts should have
+    :param search: Words to be found in names or emails of the accounts
+    :param sort: "name" to sort by names and emails, "created" to sort by creation
+    :param limit: Maximum number of accounts
+    :param offset: Number of accounts to skip
+    :param cursor: Cursor of the previous page
+    :return: The page
+    """
+    custom_accounts = database.custom_accounts
+    query = custom_accounts.select()
+
+    if account:
+        query = query.where(custom_accounts.account == account)
+
+    if where:
+        query = query.where(database.data_condition(where))
+
+    if search and (condition := search_condition(search, (custom_accounts.account, custom_accounts.email))):
+        query = query.where(condition)
+
+    if sort == 'name':
+        order_by = (custom_accounts.account, custom_accounts.email, custom_accounts.id)
+    else:
+        order_by = (custom_accounts.id,)
+
+    return Page(
+        query if database._table_exists(custom_accounts) else None,
+        order_by,
+        f'custom:{sort}',
+        limit,
+        offset,
+        cursor,
+        filtered=bool(account or where or search)
+    )
+
+
+def list_env_variables(
+        database: Database,
+        scope: Optional[str] = None,
+        search: Optional[str] = None,
+        sort: str = 'created',
+        limit: Optional[int] = None,
+        offset: int = 0,
+        cursor: Optional[str] = None
+) -> Page:
+    """
+    Query a page of environment variables
+
+    :param database: The database
+    :param scope: Name of the scope the variables are set in. Variables of all scopes are listed if not provided
+    :param search: Words to be found in keys of the variables
+    :param sort: "name" to sort by keys, "created" to sort by creation
+    :param limit: Maximum number of variables
+    :param offset: Number of variables to skip
+    :param cursor: Cursor of the previous page
+    :return: The page
+    """
+    env_variables = database.env_variables
+    table_exists = database._table_exists(env_variables)
+
+    if not table_exists or database._is_env_scoped():
+        query = env_variables.select()
+        if scope is not None:
+            query = query.where(env_variables.scope == scope)
+    else:
+        # Variables of tables made by earlier versions are global
+        query = env_variables.select(env_variables.id, env_variables.key, env_variables.value)
+        if scope:
+            table_exists = False
+
+    if search and (condition := search_condition(search, (env_variables.key,))):
+        query = query.where(condition)
+
+    order_by = (env_variables.key, env_variables.id) if sort == 'name' else (env_variables.id,)
+
+    return Page(
+        query if table_exists else None,
+        order_by,
+        f'env:{sort}',
+        limit,
+        offset,
+        cursor,
+        filtered=bool(scope is not None or search)
+    )
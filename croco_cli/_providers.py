@@ -0,0 +1,182 @@
+"""
+This module provides options of keyboard-interactive mode loaded from database queries page by page
+"""
+import operator
+from functools import reduce
+from typing import Any, Callable, Iterable, Optional
+from peewee import Select, Expression, Field, NodeList, Tuple, fn
+from croco_cli.tools.option import Option
+from croco_cli.tools.provider import OptionProvider, SearchIndex
+
+# Positions of every CHUNK_SIZE-th row are bookmarked, so far rows are read after the nearest bookmark
+CHUNK_SIZE = 128
+# Maximum number of loaded options kept in memory
+_CACHE_SIZE = 512
+# Maximum number of matching rows read by their keys in one query, keeping the condition shallow
+_KEYS_PER_QUERY = 64
+
+
+def search_condition(query: str, fields: Iterable[Field | Expression]) -> Optional[Expression]:
+    """
+    Build a condition matching rows where each word of the query is found in one of the fields, ignoring case
+
+    :param query: The search query
+    :param fields: Fields the words are looked for in
+    :return: The condition, or None if the query is empty
+    """
+    fields = list(fields)
+    condition = None
+    for word in query.lower().split():
+        word_condition = None
+        for field in fields:
+            field_condition = fn.instr(fn.lower(field), word) > 0
+            word_condition = field_condition if word_condition is None else word_condition | field_condition
+
+        condition = word_condition if condition is None else condition & word_condition
+
+    return condition
+
+
+class QueryProvider(OptionProvider):
+    def __init__(
+            self,
+            query: Callable[[], Select],
+            order_by: Iterable[Expression | Field],
+            search_fields: Iterable[Field | Expression],
+            make_option: Callable[[Any], Option],
+            search_query: Optional[Callable[[], Select]] = None
+    ):
+        """
+        Provides options from rows of a database query using keyset pagination. Only rows of requested pages
+        are read, after the last read row or the nearest bookmarked one, instead of skipping rows with OFFSET.
+        The first search reads sorting keys and search fields of all rows once into a search index,
+        so typed characters narrow matches in memory and only matching rows of requested pages are read.
+
+        :param query: Function returning the query to be paginated
+        :param order_by: Expressions the rows are sorted by. Together they must be unique and not NULL
+        :param search_fields: Fields the search query is looked for in
+        :param make_option: Function making an option from a row, read as a named tuple
+        :param search_query: Function returning the query the search index is read from. It must have the columns
+                             of the query, computed cheaply for all rows. The query is used if not provided
+        """
+        self.__query = query
+        self.__search_query = search_query or query
+        self.__order_by = list(order_by)
+        self.__search_fields = list(search_fields)
+        self.__make_option = make_option
+        self.__search_text = ''
+        self.__index: Optional[SearchIndex] = None
+        self.__index_keys: list[tuple] = []
+        self.__count = None
+        self.__reset()
+
+    def __reset(self) -> None:
+        self.__rows: dict[int, tuple[tuple, Option]] = {}
+        self.__bookmarks: dict[int, tuple] = {}
+
+    def __searching(self) -> bool:
+        """Returns whether the search query has words, so only matching rows are provided"""
+        return bool(self.__search_text.split())
+
+    def __matches(self) -> list[int]:
+        """Returns indexes of rows matching the search query in the search index, reading the index at first"""
+        if self.__index is None:
+            order_by = self.__order_by
+            # Texts are joined and lowercased by SQLite, like in the search_condition function
+            texts = NodeList([fn.COALESCE(field, '') for field in self.__search_fields], " || char(10) || ")
+            haystack = fn.lower(texts)
+            query = self.__search_query().select(*order_by, haystack).order_by(*order_by)
+
+            # Rows are fetched by the cursor at once, skipping conversion of values by peewee
+            rows = query.tuples().execute().cursor.fetchall()
+            self.__index_keys = [row[:-1] for row in rows]
+            self.__index = SearchIndex([row[-1] for row in rows])
+
+        self.__index.set(self.__search_text)
+        return self.__index.matches
+
+    def count(self) -> int:
+        if self.__searching():
+            return len(self.__matches())
+
+        if self.__count is None:
+            self.__count = self.__query().count()
+
+        return self.__count
+
+    def __load(self, start: int, end: int) -> None:
+        """Loads rows at positions from the start to the end, read after the nearest known row"""
+        order_by = self.__order_by
+        rows = self.__rows
+
+        if start - 1 in rows:
+            position, keys = start, rows[start - 1][0]
+        else:
+            position = max((position for position in self.__bookmarks if position <= start), default=0)
+            keys = self.__bookmarks.get(position)
+
+        query = self.__query().select_extend(*[key.alias(f'key{i}_') for i, key in enumerate(order_by)])
+        if keys is not None:
+            query = query.where(Tuple(*order_by) > Tuple(*keys))
+
+        query = query.order_by(*order_by).limit(end - start)
+        if start > position:
+            query = query.offset(start - position)
+
+        for position, row in enumerate(query.namedtuples().iterator(), start):
+            keys = tuple(getattr(row, f'key{i}_') for i in range(len(order_by)))
+            rows[position] = (keys, self.__make_option(row))
+
+            if (position + 1) % CHUNK_SIZE == 0:
+                self.__bookmarks[position + 1] = keys
+
+    def __load_matches(self, start: int, end: int) -> None:
+        """Loads rows matching the search query at positions from the start to the end, read by their keys"""
+        order_by = self.__order_by
+        matches = self.__matches()
+
+        for batch_start in range(start, end, _KEYS_PER_QUERY):
+            positions = {
+                self.__index_keys[matches[position]]: position
+                for position in range(batch_start, min(batch_start + _KEYS_PER_QUERY, end))
+            }
+            condition = reduce(operator.or_, [Tuple(*order_by) == Tuple(*keys) for keys in positions])
+            query = self.__query().select_extend(*[key.alias(f'key{i}_') for i, key in enumerate(order_by)])
+
+            for row in query.where(condition).namedtuples().iterator():
+                keys = tuple(getattr(row, f'key{i}_') for i in range(len(order_by)))
+                if (position := positions.get(keys)) is not None:
+                    self.__rows[position] = (keys, self.__make_option(row))
+
+    def page(self, offset: int, limit: int) -> list[Option]:
+        rows = self.__rows
+        end = min(offset + limit, self.count())
+        missing = [position for position in range(offset, end) if position not in rows]
+
+        if missing:
+            if len(rows) + len(missing) > _CACHE_SIZE:
+                self.__rows = rows = {position: row for position, row in rows.items() if offset <= position < end}
+
+            load = self.__load_matches if self.__searching() else self.__load
+            load(missing[0], missing[-1] + 1)
+
+        return [rows[position][1] for position in range(offset, end) if position in rows]
+
+    def search(self, query: str) -> None:
+        self.__search_text = query
+        self.__rows = {}
+
+    def remove(self, offset: int) -> None:
+        # Options after the removed one may change, like numbers of unlabelled wallets, so the index is read again
+        bookmarks = {} if self.__searching() else {
+            position: key for position, key in self.__bookmarks.items() if position <= offset
+        }
+        self.__index = None
+        self.__count = None
+        self.__reset()
+        self.__bookmarks = bookmarks
+
+    def discard(self, keys: set) -> None:
+        self.__index = None
+        self.__count = None
+        self.__reset()
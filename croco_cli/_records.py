@@ -0,0 +1,163 @@
+"""
+This module provides user accounts as flat records for machine-readable output.
+Secret values are masked with the same rules as in the text output, unless they should be revealed
+"""
+from typing import Any, Iterator, Optional
+from croco_cli._database import Database
+from croco_cli._listing import Page, list_wallets, list_custom_accounts, list_env_variables
+from croco_cli.types import Wallet, CustomAccount, GithubUser, EnvVar
+from croco_cli.utils import hide_value
+
+SECTIONS = ('git', 'wallets', 'custom', 'env')
+
+
+def mask_wallet(wallet: Wallet) -> Wallet:
+    """
+    Mask the private key and the mnemonic of a wallet.
+
+    :param wallet: The wallet
+    :return: A copy of the wallet with masked secrets
+    """
+    wallet = wallet.copy()
+    wallet['private_key'] = hide_value(wallet['private_key'], 5, 5)
+
+    if mnemonic := wallet.get('mnemonic'):
+        words = mnemonic.split()
+        wallet['mnemonic'] = hide_value(mnemonic, len(words[0]), len(words[-1]))
+
+    return wallet
+
+
+def mask_fields(fields: dict[str, Any]) -> dict[str, Any]:
+    """
+    Mask fields of an account. Passwords and cookies are dropped, tokens, secrets and private values are hidden.
+
+    :param fields: Fields of the account
+    :return: The masked fields
+    """
+    masked = {}
+    for key, value in fields.items():
+        if 'password' in key or 'cookie' in key:
+            continue
+
+        lower_key = key.lower()
+        if isinstance(value, str) and ('token' in lower_key or 'secret' in lower_key or 'private' in lower_key):
+            value = hide_value(value, len(value) // 5, len(value) // 5)
+
+        masked[key] = value
+
+    return masked
+
+
+def mask_github_user(github_user: GithubUser) -> GithubUser:
+    """
+    Mask the access token of a GitHub user.
+
+    :param github_user: The GitHub user
+    :return: A copy of the GitHub user with the masked token
+    """
+    github_user = github_user.copy()
+    github_user['access_token'] = hide_value(github_user['access_token'], 10)
+    return github_user
+
+
+def wallet_record(wallet: Wallet, reveal: bool = False, display_label: Optional[str] = None) -> dict[str, Any]:
+    """
+    Get a record of a wallet.
+
+    :param wallet: The wallet
+    :param reveal: Whether secrets should not be masked
+    :param display_label: Label shown in the text output. The label of the wallet is used if not provided
+    :return: The record
+    """
+    wallet = wallet if reveal else mask_wallet(wallet)
+    return {
+        'label': wallet['label'],
+        'display_label': display_label or wallet['label'],
+        'public_key': wallet['public_key'],
+        'private_key': wallet['private_key'],
+        'mnemonic': wallet['mnemonic'],
+        'current': wallet['current']
+    }
+
+
+def custom_account_record(custom_account: CustomAccount, reveal: bool = False) -> dict[str, Any]:
+    """
+    Get a record of a custom account. Custom data is kept as a nested dictionary.
+
+    :param custom_account: The custom account
+    :param reveal: Whether secrets should not be masked
+    :return: The record
+    """
+    record = {
+        'account': custom_account['account'],
+        'email': custom_account['email'],
+        'password': custom_account['password'],
+        'email_password': custom_account['email_password'],
+        'current': custom_account['current']
+    }
+    data = custom_account['data'] or {}
+
+    if not reveal:
+        record = mask_fields(record)
+        data = mask_fields(data)
+
+    record['data'] = data
+    return record
+
+
+def github_record(github_user: GithubUser, reveal: bool = False) -> dict[str, Any]:
+    """
+    Get a record of a GitHub user.
+
+    :param github_user: The GitHub user
+    :param reveal: Whether the access token should not be masked
+    :return: The record
+    """
+    github_user = github_user if reveal else mask_github_user(github_user)
+    return {
+        'login': github_user['login'],
+        'name': github_user['name'],
+        'email': github_user['email'],
+        'access_token': github_user['access_token']
+    }
+
+
+def env_record(env_variable: EnvVar) -> dict[str, Any]:
+    """
+    Get a record of an environment variable.
+
+    :param env_variable: The environment variable
+    :return: The record
+    """
+    return {'key': env_variable['key'], 'value': env_variable['value'], 'scope': env_variable.get('scope', '')}
+
+
+def iter_records(
+        database: Database,
+        section: str,
+        reveal: bool = False,
+        page: Optional[Page] = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Iterate over records of a section, streaming them from the database.
+
+    :param database: The database
+    :param section: Name of the section: git, wallets, custom or env
+    :param reveal: Whether secrets should not be masked
+    :param page: Page of the listing of the section. All rows are listed if not provided
+    :return: Iterator over records
+    """
+    match section:
+        case 'git':
+            if github_user := database.get_github_user():
+                yield github_record(github_user, reveal)
+        case 'wallets':
+            for row in page or list_wallets(database):
+                yield wallet_record(database.to_wallet(row), reveal, row.display_label)
+        case 'custom':
+            for row in page or list_custom_accounts(database):
+                yield custom_account_record(database.to_custom_account(row), reveal)
+        case 'env':
+            for row in page or list_env_variables(database):
+                yield env_record(EnvVar(key=row.key, value=row.value, scope=getattr(row, 'scope', '')))
@@ -0,0 +1,158 @@
+"""
+Public interface to accounts of croco-cli for other packages.
+
+Results are cached in the process. The cache is dropped when this process writes to the database
+or when PRAGMA data_version shows a change made by another process. The data version is checked at
+most once per refresh interval, so repeated lookups are plain dictionary hits. Connections are
+thread-local and the data version is only comparable within one connection, so each thread tracks
+its own. Returned values are shared between calls and threads and must not be modified.
+"""
+import time
+import threading
+from typing import Optional, Callable, Any
+from croco_cli._async_database import AsyncDatabase
+from croco_cli._database import Database
+from croco_cli._environment import resolve_environment, flatten_environment
+from croco_cli.types import Wallet, CustomAccount
+
+__all__ = [
+    'AsyncDatabase',
+    'Wallet',
+    'CustomAccount',
+    'set_refresh_interval',
+    'get_wallets',
+    'get_current_wallet',
+    'get_custom_accounts',
+    'get_current_account',
+    'get_env_variables',
+    'get_environment'
+]
+
+_values: dict[Any, Any] = {}
+_lock = threading.RLock()
+_state = {
+    'refresh_interval': 0.1,
+    'write_count': None
+}
+# Data version seen by the connection of the thread, and when it was checked
+_local = threading.local()
+
+
+def set_refresh_interval(seconds: float) -> None:
+    """
+    Set how often changes made by other processes are checked.
+
+    :param seconds: Interval in seconds. Use 0 to check on every call
+    :return: None
+    """
+    _state['refresh_interval'] = seconds
+
+
+def _cached(key: Any, loader: Callable[[Database], Any]) -> Any:
+    """
+    Return the cached value, loading it if the cache is empty or outdated.
+
+    :param key: Key of the value
+    :param loader: Function loading the value from the read-only database
+    :return: The value
+    """
+    database = Database(read_only=True)
+    now = time.monotonic()
+
+    with _lock:
+        # Values cached before the first check of the thread cannot be compared with its connection
+        version = getattr(_local, 'data_version', None)
+        stale = version is None or _state['write_count'] != Database.write_count
+
+        if not stale and now - _local.checked_at >= _state['refresh_interval']:
+            _local.checked_at = now
+            stale = version != database.data_version()
+
+        if stale:
+            _values.clear()
+            # Tables and declared fields could be changed too
+            database.clear_cache()
+            _state['write_count'] = Database.write_count
+            _local.data_version = database.data_version()
+            _local.checked_at = now
+
+        try:
+            return _values[key]
+        except KeyError:
+            value = _values[key] = loader(database)
+            return value
+
+
+def get_wallets() -> tuple[Wallet, ...]:
+    """
+    Get all wallets of the user.
+
+    :return: Wallets of the user
+    """
+    return _cached('wallets', lambda database: tuple(database.iter_wallets()))
+
+
+def get_current_wallet() -> Optional[Wallet]:
+    """
+    Get the current wallet of the user.
+
+    :return: The current wallet or None if it is not set
+    """
+    return _cached('current_wallet', lambda database: next(database.iter_wallets(current=True), None))
+
+
+def get_custom_accounts(
+        account: Optional[str] = None,
+        where: Optional[dict[str, Optional[str]]] = None
+) -> tuple[CustomAccount, ...]:
+    """
+    Get custom accounts of the user.
+
+    :param account: Name of accounts, like "binance". All accounts are returned if not provided
+    :param where: Values of fields of the data, like {'region': 'eu'}, the accounts should have
+    :return: Custom accounts of the user
+    """
+    return _cached(
+        ('custom_accounts', account, tuple(sorted((where or {}).items()))),
+        lambda database: tuple(database.iter_custom_accounts(account, where=where))
+    )
+
+
+def get_current_account(account: str) -> Optional[CustomAccount]:
+    """
+    Get the current custom account with the name.
+
+    :param account: Name of the account, like "binance"
+    :return: The current account or None if it is not set
+    """
+    return _cached(
+        ('current_account', account),
+        lambda database: next(database.iter_custom_accounts(account, current=True), None)
+    )
+
+
+def get_env_variables(scope: Optional[str] = None) -> dict[str, str]:
+    """
+    Get environment variables set using "croco set envar".
+
+    :param scope: Scope of the variables, like "sepolia", inheriting variables of its parents.
+                  Only global variables are returned if not provided
+    :return: Environment variables mapped to their values
+    """
+    return _cached(
+        ('env_variables', scope),
+        lambda database: {env_var['key']: env_var['value'] for env_var in database.resolve_env_variables(scope)}
+    )
+
+
+def get_environment(scope: Optional[str] = None) -> dict[str, str]:
+    """
+    Get all environment variables, the same as "croco make dotenv" writes.
+
+    :param scope: Scope of environment variables, like "sepolia". Only global variables are used if not provided
+    :return: Environment variables mapped to their values
+    """
+    return _cached(
+        ('environment', scope),
+        lambda database: flatten_environment(resolve_environment(database, scope))
+    )
@@ -1,10 +1,13 @@
 import click
+from functools import partial
+from peewee import fn
 from croco_cli._database import Database
+from croco_cli._listing import select_wallets, order_wallets
+from croco_cli._providers import QueryProvider
 from croco_cli.tools.keymode import KeyMode
 from croco_cli.tools.option import Option
 from croco_cli.types import CustomAccount
 from croco_cli.utils import Wallet
-from croco_cli.utils import sort_wallets
 from croco_cli.croco_echo import CrocoEcho
 
 
@@ -23,26 +26,6 @@ def _make_wallet_option(wallet: Wallet) -> Option:
 
     def _deleting_handler():
         database.delete_wallet(wallet['private_key'])
-        wallets = database.get_wallets()
-
-        if wallets:
-            try:
-                last_wallet = database.get_wallets()[-1]
-                current_wallet = filter(lambda x: x['current'], wallets)
-
-                try:
-                    current_wallet = next(current_wallet)
-                except StopIteration:
-                    current_wallet = None
-
-                if not current_wallet:
-                    database.set_wallet(
-                        last_wallet['private_key'],
-                        last_wallet['label'],
-                        last_wallet['mnemonic']
-                    )
-            except IndexError:
-                pass
 
     if wallet["current"]:
         label = f'{label} (Current)'
@@ -51,7 +34,8 @@ def _make_wallet_option(wallet: Wallet) -> Option:
         name=label,
         description=wallet['public_key'],
         handler=_handler,
-        deleting_handler=_deleting_handler
+        deleting_handler=_deleting_handler,
+        key=wallet['private_key']
     )
 
     return option
@@ -69,91 +53,88 @@ def _make_custom_option(account: CustomAccount) -> Option:
     def _deleting_handler():
         database.delete_custom_accounts(account['account'], account['email'])
 
-        custom_accounts = database.get_custom_accounts(account['account'])
-
-        if custom_accounts:
-            try:
-                last_custom_account = custom_accounts[-1]
-                current_account = filter(lambda x: x['current'], custom_accounts)
-
-                try:
-                    current_account = next(current_account)
-                except StopIteration:
-                    current_account = None
-
-                if not current_account:
-                    last_custom_account.pop('current')
-                    database.set_custom_account(**last_custom_account)
-            except IndexError:
-                pass
-
     if account["current"]:
         label = f'{label} (Current)'
 
     option = Option(
         name=label,
         handler=_handler,
-        deleting_handler=_deleting_handler
+        deleting_handler=_deleting_handler,
+        key=account['email']
     )
 
     return option
 
 
+def _wallet_provider(database: Database) -> QueryProvider:
+    """Create a provider of wallet options, named and sorted like in listings of wallets"""
+    def _make_option(row) -> Option:
+        wallet = database.to_wallet(row)
+        wallet['label'] = row.display_label
+        return _make_wallet_option(wallet)
+
+    _, columns = select_wallets(database)
+    return QueryProvider(
+        query=lambda: select_wallets(database)[0],
+        order_by=order_wallets(columns),
+        search_fields=(columns.display_label, columns.public_key),
+        make_option=_make_option,
+        search_query=lambda: select_wallets(database, numbered='window')[0]
+    )
+
+
 @change.command(name='wallet')
 def _wallet():
     """Change the current wallet for unit tests"""
-    wallets = []
     database = Database()
+    wallets = database.wallets
 
-    if database.wallets.table_exists():
-        wallets = database.get_wallets()
-
-    if len(wallets) < 2:
+    if not wallets.table_exists() or wallets.select().limit(2).count() < 2:
         CrocoEcho.error('There are no wallets in the database to change.')
         return
 
-    wallets = sort_wallets(wallets)
-
-    options = [_make_wallet_option(wallet) for wallet in wallets]
-    keymode = KeyMode(options, 'Change wallet for unit tests')
+    keymode = KeyMode(
+        _wallet_provider(database),
+        'Change wallet for unit tests',
+        batch_deleting_handler=database.delete_wallets
+    )
     keymode()
 
 
 @change.command()
 def custom():
     """Change the custom user account"""
-    accounts_map = dict()
     database = Database()
+    custom_accounts = database.custom_accounts
 
-    custom_accounts = database.get_custom_accounts()
-    if not custom_accounts or not len(custom_accounts):
+    if not custom_accounts.table_exists():
         CrocoEcho.error('There are no custom accounts in the database to change.')
         return
 
-    for account in custom_accounts:
-        accounts = accounts_map.get(account['account'])
-        if isinstance(accounts, list):
-            accounts_map[account['account']].append(account)
-        else:
-            accounts_map[account['account']] = [account]
+    names = (
+        custom_accounts
+        .select(custom_accounts.account)
+        .group_by(custom_accounts.account)
+        .having(fn.count(custom_accounts.id) > 1)
+        .tuples()
+    )
 
     screen_options = []
-    for key, value in accounts_map.items():
-        if len(value) < 2:
-            continue
-
-        account_options = [_make_custom_option(account) for account in value]
-        description = f'Change {key.capitalize()} account'
-
-        def deleting_handler():
-            database.delete_custom_accounts(key)
+    for name, in names:
+        provider = QueryProvider(
+            query=lambda name=name: custom_accounts.select().where(custom_accounts.account == name),
+            order_by=(custom_accounts.id,),
+            search_fields=(custom_accounts.email,),
+            make_option=lambda row: _make_custom_option(database.to_custom_account(row))
+        )
 
         screen_options.append(
             KeyMode.screen_option(
-                key.capitalize(),
-                description,
-                account_options,
-                deleting_handler
+                name.capitalize(),
+                f'Change {name.capitalize()} account',
+                provider,
+                partial(database.delete_custom_accounts, name),
+                partial(database.delete_custom_accounts, name)
             )
         )
 
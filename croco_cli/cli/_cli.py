@@ -5,6 +5,8 @@ Binding functions to CLI commands
 import click
 from typing import cast
 from ._change import change
+from ._completion import completion
+from ._daemon import daemon
 from ._init import init
 from ._install import install
 from ._user import user
@@ -13,6 +15,8 @@ from ._make import make
 from ._reset import reset
 from ._export import export
 from ._import import _import
+from ._run import run
+from ._search import search
 from croco_cli.types import ClickGroup
 
 
@@ -33,9 +37,13 @@ def cli():
 cli.add_command(cast(ClickGroup, _import))
 cli.add_command(cast(ClickGroup, export))
 cli.add_command(cast(ClickGroup, change))
+cli.add_command(cast(ClickGroup, completion))
+cli.add_command(cast(ClickGroup, daemon))
 cli.add_command(cast(ClickGroup, init))
 cli.add_command(cast(ClickGroup, install))
 cli.add_command(cast(ClickGroup, user))
 cli.add_command(cast(ClickGroup, _set))
 cli.add_command(cast(ClickGroup, make))
 cli.add_command(cast(ClickGroup, reset))
+cli.add_command(cast(ClickGroup, run))
+cli.add_command(cast(ClickGroup, search))
@@ -0,0 +1,17 @@
+"""
+This module contains functions to generate shell completion scripts
+"""
+import click
+from croco_cli._completion import SHELLS, get_completion_script, refresh_completion_cache
+from croco_cli._database import Database
+
+
+@click.command()
+@click.argument('shell', type=click.Choice(SHELLS))
+def completion(shell: str) -> None:
+    """
+    Print the completion script for the shell. For example, add `eval "$(croco completion bash)"` to ~/.bashrc
+    """
+    refresh_completion_cache(Database(read_only=True))
+    root = click.get_current_context().find_root().command
+    click.echo(get_completion_script(shell, root), nl=False)
@@ -0,0 +1,82 @@
+"""
+This module contains functions to manage the croco daemon
+"""
+import sys
+import subprocess
+import click
+from croco_cli._daemon import call, serve, wait_until_ready, IDLE_TIMEOUT
+from croco_cli.croco_echo import CrocoEcho
+
+
+@click.group()
+def daemon():
+    """Manage the daemon, which keeps croco warm to run commands instantly"""
+
+
+@daemon.command()
+@click.option(
+    '--idle-timeout',
+    'idle_timeout',
+    default=IDLE_TIMEOUT,
+    show_default=True,
+    help='Seconds without commands before the daemon stops'
+)
+def start(idle_timeout: float) -> None:
+    """Start the daemon in background"""
+    try:
+        pid = call('ping', timeout=1)['pid']
+        CrocoEcho.text(f'The daemon is already running (PID {pid})')
+        return
+    except OSError:
+        pass
+
+    subprocess.Popen(
+        [sys.executable, '-m', 'croco_cli', 'daemon', 'serve', '--idle-timeout', str(idle_timeout)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+    if not wait_until_ready():
+        CrocoEcho.error('Unable to start the daemon')
+        sys.exit(1)
+
+    CrocoEcho.text('The daemon is started')
+
+
+@daemon.command(name='serve')
+@click.option(
+    '--idle-timeout',
+    'idle_timeout',
+    default=IDLE_TIMEOUT,
+    show_default=True,
+    help='Seconds without commands before the daemon stops'
+)
+def _serve(idle_timeout: float) -> None:
+    """Run the daemon in foreground"""
+    serve(idle_timeout)
+
+
+@daemon.command()
+def stop() -> None:
+    """Stop the daemon"""
+    try:
+        call('shutdown', timeout=5)
+    except OSError:
+        CrocoEcho.error('The daemon is not running')
+        return
+
+    CrocoEcho.text('The daemon is stopped')
+
+
+@daemon.command()
+def status() -> None:
+    """Show whether the daemon is running"""
+    try:
+        pid = call('ping', timeout=1)['pid']
+    except OSError:
+        CrocoEcho.text('The daemon is not running')
+        return
+
+    CrocoEcho.text(f'The daemon is running (PID {pid})')
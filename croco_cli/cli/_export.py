@@ -3,39 +3,169 @@ This module contains functions to export cli settings and accounts
 """
 import click
 import json
+import time
+from croco_cli._container import ContainerWriter
 from croco_cli._database import Database
-from typing import Optional
+from typing import Optional, Iterator, Any
 from croco_cli.croco_echo import CrocoEcho
+from croco_cli.utils import get_export_password, format_throughput
+
+_SECTIONS = ('wallets', 'custom', 'github', 'env')
+
+
+def _parse_sections(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> tuple[str, ...]:
+    """Parse comma-separated sections of the --only option"""
+    if not value:
+        return _SECTIONS
+
+    sections = tuple(section.strip() for section in value.split(',') if section.strip())
+    for section in sections:
+        if section not in _SECTIONS:
+            raise click.BadParameter(f'{section!r} is not one of {", ".join(_SECTIONS)}', ctx, param)
+
+    return sections
+
+
+def _iter_records(
+        database: Database,
+        sections: tuple[str, ...] = _SECTIONS,
+        label: Optional[str] = None,
+        accounts: tuple[str, ...] = (),
+        env_prefix: Optional[str] = None
+) -> Iterator[dict[str, Any]]:
+    """
+    Yields user accounts one by one as export records. Filters are applied by the database queries
+    :param database: The database to read accounts from
+    :param sections: Sections of the configuration to be exported
+    :param label: GLOB pattern the wallet labels should match
+    :param accounts: Names of custom accounts to be exported
+    :param env_prefix: Prefix of environment variables to be exported
+    :return: An iterator over export records
+    """
+    if 'github' in sections and (github_user := database.get_github_user()):
+        yield {'type': 'github', 'access_token': github_user['access_token']}
+
+    if 'wallets' in sections:
+        for wallet in database.iter_wallets(label=label):
+            wallet.pop('public_key')
+            yield {'type': 'wallet', **wallet}
+
+    if 'custom' in sections:
+        for custom_account in database.iter_custom_accounts(accounts):
+            yield {'type': 'custom', **custom_account}
+
+    if 'env' in sections:
+        scopes = None
+        if env_prefix:
+            # Only scopes of the exported variables are exported, with their ancestors to keep the inheritance
+            scopes = set()
+            for scope in {env_var['scope'] for env_var in database.iter_env_variables(env_prefix)}:
+                scopes.update(database.get_env_scope_chain(scope))
+
+        for env_scope in database.iter_env_scopes():
+            if scopes is None or env_scope['name'] in scopes:
+                yield {'type': 'scope', **env_scope}
+
+        for env_var in database.iter_env_variables(env_prefix):
+            yield {'type': 'env', **env_var}
+
+
+def _export_encrypted(path: str, records: Iterator[dict[str, Any]]) -> None:
+    """
+    Export cli configuration into a compressed and encrypted container
+    :param path: Path to the container
+    :param records: Export records
+    :return: None
+    """
+    password = get_export_password(confirm=True)
+
+    with open(path, 'wb') as file:
+        with ContainerWriter(file, password) as writer:
+            start = time.perf_counter()
+            for record in records:
+                writer.write(json.dumps(record).encode() + b'\n')
+
+    elapsed = time.perf_counter() - start
+    CrocoEcho.text(f'Exported {format_throughput(writer.size, elapsed)}')
+
+
+def _export_json(path: str, records: Iterator[dict[str, Any]], indent: bool) -> None:
+    """
+    Export cli configuration into a JSON file
+    :param path: Path to the file
+    :param records: Export records
+    :param indent: Whether to use indentations
+    :return: None
+    """
+    github, wallets, custom, env, scopes = None, [], [], {}, {}
+
+    for record in records:
+        match record.pop('type'):
+            case 'github':
+                github = record['access_token']
+            case 'wallet':
+                wallets.append(record)
+            case 'custom':
+                custom.append(record)
+            case 'scope':
+                scopes.setdefault(record['name'], {'parent': None, 'env': {}})['parent'] = record['parent']
+            case 'env':
+                if scope := record.get('scope'):
+                    scopes.setdefault(scope, {'parent': None, 'env': {}})['env'][record['key']] = record['value']
+                else:
+                    env[record['key']] = record['value']
+
+    user = {
+        'wallets': wallets if wallets else None,
+        'custom': custom if custom else None,
+        'github': github,
+        'env': env if env else None,
+        'scopes': scopes if scopes else None
+    }
+
+    with open(path, 'w') as file:
+        indent = 2 if indent else None
+        json.dump({'user': user}, file, indent=indent)
 
 
 @click.command()
 @click.option('-i', '--indent', 'indent', is_flag=True, default=False, show_default=True, help='Export using indentations')
+@click.option(
+    '-e',
+    '--encrypt',
+    'encrypt',
+    is_flag=True,
+    default=False,
+    show_default=True,
+    help='Export into a compressed container encrypted with a password'
+)
+@click.option(
+    '--only',
+    'sections',
+    callback=_parse_sections,
+    help=f'Comma-separated sections to export: {", ".join(_SECTIONS)}'
+)
+@click.option('--label', 'label', help='Export wallets whose label matches the pattern, like "deployer*"')
+@click.option('--account', 'accounts', multiple=True, help='Export custom accounts with the name')
+@click.option('--env-prefix', 'env_prefix', help='Export environment variables with the prefix')
 @click.argument('path', default=None, type=click.Path(file_okay=True), required=False)
-def export(path: Optional[str] = None, indent: bool = True) -> None:
+def export(
+        sections: tuple[str, ...],
+        label: Optional[str],
+        accounts: tuple[str, ...],
+        env_prefix: Optional[str],
+        path: Optional[str] = None,
+        indent: bool = True,
+        encrypt: bool = False
+) -> None:
     """Export cli configuration"""
-    path = 'croco_config.json' if not path else path
-    database = Database()
-
-    env_vars = database.get_env_variables()
-    wallets = database.get_wallets()
-    github_user = database.get_github_user()
-    custom_accounts = database.get_custom_accounts()
-
-    if env_vars:
-        env_vars = {var['key']: var['value'] for var in env_vars}
-
-    config = {
-        'user': {
-            'wallets': [wallet.pop('public_key') and wallet for wallet in wallets] if wallets else None,
-            'custom': custom_accounts if custom_accounts else None,
-            'github': github_user['access_token'] if github_user else None,
-            'env': env_vars if env_vars else None
-        }
-    }
+    database = Database(read_only=True)
+    records = _iter_records(database, sections, label, accounts, env_prefix)
 
     try:
-        with open(path, 'w') as file:
-            indent = 2 if indent else None
-            json.dump(config, file, indent=indent)
+        if encrypt:
+            _export_encrypted(path or 'croco_config.enc', records)
+        else:
+            _export_json(path or 'croco_config.json', records, indent)
     except (FileNotFoundError, NotADirectoryError):
         CrocoEcho.error('All folders in path must exist')
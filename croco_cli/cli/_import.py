@@ -4,47 +4,117 @@ This module contains functions to import cli settings and accounts
 
 import click
 import json
-from croco_cli._database import Database
-from croco_cli.utils import catch_github_errors, catch_wallet_errors
+import time
+from typing import Iterator, Iterable, Any
+from croco_cli._container import ContainerReader, is_container
+from croco_cli._database import Database, GLOBAL_SCOPE
+from croco_cli.croco_echo import CrocoEcho
+from croco_cli.utils import (
+    catch_github_errors,
+    catch_wallet_errors,
+    catch_container_errors,
+    catch_scope_errors,
+    get_export_password,
+    format_throughput
+)
+
+
+def _iter_config_records(config: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """
+    Yields user accounts of a JSON configuration as import records
+    :param config: The loaded JSON configuration
+    :return: An iterator over import records
+    """
+    user = config['user']
+
+    if token := user['github']:
+        yield {'type': 'github', 'access_token': token}
+
+    for wallet in user['wallets'] or ():
+        yield {'type': 'wallet', **wallet}
+
+    for account in user['custom'] or ():
+        yield {'type': 'custom', **account}
+
+    for key, value in (user['env'] or {}).items():
+        yield {'type': 'env', 'key': key, 'value': value}
+
+    for name, scope in (user.get('scopes') or {}).items():
+        yield {'type': 'scope', 'name': name, 'parent': scope['parent']}
+
+        for key, value in scope['env'].items():
+            yield {'type': 'env', 'key': key, 'value': value, 'scope': name}
+
+
+def _import_records(database: Database, records: Iterable[dict[str, Any]]) -> None:
+    """
+    Import records into the database. Current accounts are set last to remain current
+    :param database: The database to import accounts to
+    :param records: Import records
+    :return: None
+    """
+    current_wallet = None
+    current_accounts = []
+
+    for record in records:
+        match record.pop('type'):
+            case 'github':
+                database.set_github_user(record['access_token'])
+            case 'wallet':
+                if not record.pop('current'):
+                    database.set_wallet(**record)
+                else:
+                    current_wallet = record
+            case 'custom':
+                if not record.pop('current'):
+                    database.set_custom_account(**record)
+                else:
+                    current_accounts.append(record)
+            case 'scope':
+                database.set_env_scope(record['name'], record['parent'] or GLOBAL_SCOPE)
+            case 'env':
+                database.set_envar(record['key'], record['value'], record.get('scope', GLOBAL_SCOPE))
+
+    if current_wallet:
+        database.set_wallet(**current_wallet)
+
+    for account in current_accounts:
+        database.set_custom_account(**account)
+
+
+def _import_encrypted(database: Database, path: str) -> None:
+    """
+    Import cli configuration from a compressed and encrypted container
+    :param database: The database to import accounts to
+    :param path: Path to the container
+    :return: None
+    """
+    password = get_export_password()
+
+    with open(path, 'rb') as file:
+        reader = ContainerReader(file, password)
+        start = time.perf_counter()
+        _import_records(database, (json.loads(line) for line in reader.lines() if line))
+
+    elapsed = time.perf_counter() - start
+    CrocoEcho.text(f'Imported {format_throughput(reader.size, elapsed)}')
 
 
 @click.command(name='import')
 @click.argument('path', type=click.Path(exists=True))
 @catch_wallet_errors
 @catch_github_errors
+@catch_container_errors
+@catch_scope_errors
 def _import(path: str) -> None:
     """Import cli configuration"""
     database = Database()
 
+    if is_container(path):
+        _import_encrypted(database, path)
+        return
+
     with open(path, 'r') as file:
         config = json.load(file)
 
-    user = config['user']
-
-    if token := user['github']:
-        database.set_github_user(token)
-
-    if wallets := user['wallets']:
-        current_wallet = None
-        for wallet in wallets:
-            if not wallet.pop('current'):
-                database.set_wallet(**wallet)
-            else:
-                current_wallet = wallet
-
-        database.set_wallet(**current_wallet)
-
-    if custom_accounts := user['custom']:
-        current_accounts = []
-        for account in custom_accounts:
-            if not account.pop('current'):
-                database.set_custom_account(**account)
-            else:
-                current_accounts.append(account)
-
-        for account in current_accounts:
-            database.set_custom_account(**account)
-
-    if env := user['env']:
-        for key, value in env.items():
-            database.set_envar(key, value)
+    _import_records(database, _iter_config_records(config))
@@ -4,11 +4,12 @@ This module contains functions to install Croco Factory packages
 
 import click
 from functools import partial
+from typing import Iterator, Optional
 from croco_cli._database import Database
 from croco_cli.tools.keymode import KeyMode
 from croco_cli.tools.option import Option
 from croco_cli.types import Package, GithubPackage, PackageSet
-from croco_cli.utils import require_github, is_github_package, run_poetry_command, check_poetry
+from croco_cli.utils import require_github, is_github_package, stream_command, check_poetry
 from croco_cli.globals import PYPI_PACKAGES, GITHUB_PACKAGES, PACKAGE_SETS
 
 _DESCRIPTION = "Install Croco Factory packages"
@@ -16,11 +17,11 @@ _DESCRIPTION = "Install Croco Factory packages"
 
 def _install_package(
         package: Package | GithubPackage
-) -> None:
+) -> Iterator[Optional[str]]:
     """
     Install Croco Factory package
     :param package: Croco Factory package
-    :return: None
+    :return: Iterator over output lines of poetry
     """
     package_name = package['name']
     github_package = is_github_package(package)
@@ -37,7 +38,7 @@ def _install_package(
         if branch:
             command += f"@{branch}"
 
-    run_poetry_command(command)
+    yield from stream_command(command)
 
 
 def _make_install_option(
@@ -67,7 +68,8 @@ def _make_install_option(
     return Option(
         name=package_name,
         description=description,
-        handler=handler
+        handler=handler,
+        background=True
     )
 
 
@@ -84,12 +86,13 @@ def _make_set_install_option(
 
     def set_handler():
         for handler in handlers:
-            handler()
+            yield from handler()
 
     return Option(
         name=package_set,
         description=set_map['description'],
-        handler=set_handler
+        handler=set_handler,
+        background=True
     )
 
 
@@ -1,7 +1,13 @@
+import sys
+import time
 import click
+from typing import Optional
 from croco_cli._database import Database
+from croco_cli._emitters import EMITTERS, render_environment
+from croco_cli._environment import resolve_environment
 from croco_cli.croco_echo import CrocoEcho
-from croco_cli.utils import constant_case
+from croco_cli.exceptions import UnknownScope, MultilineValue
+from croco_cli.utils import write_if_changed, is_file_stale, validate_scope
 
 
 @click.group()
@@ -9,44 +15,162 @@ def make():
     """Make some files for project"""
 
 
+def _write_dotenv(database: Database, paths: tuple[str, ...], scope: Optional[str] = None) -> None:
+    """
+    Write dotenv files whose content is out of date
+    :param database: The database to read accounts from
+    :param paths: Paths to dotenv files
+    :param scope: Scope of environment variables
+    :return: None
+    """
+    try:
+        content = render_environment('dotenv', resolve_environment(database, scope))
+    except UnknownScope as err:
+        # The scope can be removed by another process while the files are watched
+        CrocoEcho.error(str(err))
+        return
+
+    for path in paths:
+        try:
+            write_if_changed(path, content)
+        except (FileNotFoundError, NotADirectoryError):
+            CrocoEcho.error(f'All folders in path must exist: {path}')
+
+
+def _wait_for_changes(database: Database, version: int, interval: float, debounce: float) -> int:
+    """
+    Wait until the database is changed and no further changes follow during the debounce period.
+    Cached tables and declared fields of the database are forgotten, since the changes can add them
+    :param database: The database to watch
+    :param version: The last seen data version
+    :param interval: Polling interval in seconds
+    :param debounce: Period in seconds without changes before returning
+    :return: The new data version
+    """
+    while database.data_version() == version:
+        time.sleep(interval)
+
+    version = database.data_version()
+    while True:
+        time.sleep(debounce)
+        new_version = database.data_version()
+        if new_version == version:
+            database.clear_cache()
+            return version
+        version = new_version
+
+
+@make.command()
+@click.option(
+    '--check',
+    'check',
+    is_flag=True,
+    default=False,
+    help='Do not write files, exit with code 1 if some of them are out of date'
+)
+@click.option(
+    '--watch',
+    '-w',
+    'watch',
+    is_flag=True,
+    default=False,
+    help='Keep files up to date, rewriting them after changes of user accounts'
+)
+@click.option('--interval', 'interval', default=0.5, show_default=True, help='Polling interval of --watch in seconds')
+@click.option(
+    '--debounce',
+    'debounce',
+    default=0.3,
+    show_default=True,
+    help='Seconds without changes to wait before rewriting files in --watch mode'
+)
+@click.option(
+    '--scope',
+    'scope',
+    callback=validate_scope,
+    default=None,
+    help='Scope of environment variables, like "sepolia". Variables of the scope and its ancestors override global ones'
+)
+@click.argument('paths', nargs=-1, type=click.Path(dir_okay=True))
+def dotenv(
+        paths: tuple[str, ...],
+        check: bool = False,
+        watch: bool = False,
+        interval: float = 0.5,
+        debounce: float = 0.3,
+        scope: Optional[str] = None
+):
+    """Make files with environment variables. Use with python-dotenv"""
+    database = Database(read_only=True)
+    paths = paths or ('.env',)
+
+    if check:
+        content = render_environment('dotenv', resolve_environment(database, scope))
+        stale_paths = [path for path in paths if is_file_stale(path, content)]
+        command = f'croco make dotenv --scope {scope}' if scope else 'croco make dotenv'
+        for path in stale_paths:
+            CrocoEcho.error(f'{path} is out of date. Run "{command}" to update it')
+
+        if stale_paths:
+            sys.exit(1)
+        return
+
+    version = database.data_version()
+    _write_dotenv(database, paths, scope)
+
+    if not watch:
+        return
+
+    CrocoEcho.text(f'Watching changes of user accounts for {", ".join(paths)}. Press Ctrl+C to stop')
+    try:
+        while True:
+            version = _wait_for_changes(database, version, interval, debounce)
+            _write_dotenv(database, paths, scope)
+    except KeyboardInterrupt:
+        pass
+
+
 @make.command()
-@click.argument('path', default='.env', required=False, type=click.Path(dir_okay=True))
-def dotenv(path: str = '.env'):
-    """Make file with environment variables. Use with python-dotenv"""
-    database = Database()
+@click.option(
+    '--format',
+    '-f',
+    'format_',
+    type=click.Choice(list(EMITTERS)),
+    default='dotenv',
+    show_default=True,
+    help='Format of the file'
+)
+@click.option(
+    '--out',
+    '-o',
+    'out',
+    default='-',
+    show_default=True,
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help='Path to the file. Use "-" to print it'
+)
+@click.option(
+    '--scope',
+    'scope',
+    callback=validate_scope,
+    default=None,
+    help='Scope of environment variables, like "sepolia". Variables of the scope and its ancestors override global ones'
+)
+def env(format_: str, out: str, scope: Optional[str] = None):
+    """Make file with environment variables in the format"""
+    database = Database(read_only=True)
+
+    try:
+        content = render_environment(format_, resolve_environment(database, scope))
+    except MultilineValue as err:
+        CrocoEcho.error(str(err))
+        sys.exit(1)
 
-    current_wallet = database.get_wallets(current=True)[0]
-    custom_accounts = database.get_custom_accounts(current=True)
-    env_variables = database.get_env_variables()
+    if out == '-':
+        CrocoEcho.text(content, nl=False)
+        return
 
     try:
-        with open(path, 'w') as file:
-            if current_wallet:
-                file.write('# Wallet credential\n')
-                file.write(f"TEST_PRIVATE_KEY='{current_wallet['private_key']}'\n")
-                file.write(f"TEST_MNEMONIC='{current_wallet['mnemonic']}'\n")
-                file.write("\n")
-
-            if env_variables:
-                file.write('# Environment variables\n')
-                for env_var in env_variables:
-                    file.write(f"{env_var['key']}='{env_var['value']}'\n")
-                file.write("\n")
-
-            if custom_accounts:
-                file.write('# Custom account credentials\n')
-                for custom_account in custom_accounts:
-                    account = custom_account.pop('account')
-                    custom_account.pop('current')
-                    custom_data = custom_account.pop('data')
-                    for key, value in custom_account.items():
-                        key = constant_case(f'{account}_{key}')
-                        file.write(f"{key}='{value}'\n")
-
-                    for key, value in custom_data.items():
-                        key = constant_case(f'{account}_{key}')
-                        file.write(f"{key}='{value}'\n")
-
-                    file.write('\n')
+        write_if_changed(out, content)
     except (FileNotFoundError, NotADirectoryError):
         CrocoEcho.error('All folders in path must exist')
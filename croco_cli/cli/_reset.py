@@ -50,12 +50,12 @@ def reset(info: str):
 
     match info:
         case 'git':
-            database.github_users.drop_table()
+            database.drop_tables(database.github_users)
         case 'wallets':
-            database.wallets.drop_table()
+            database.drop_tables(database.wallets)
         case 'custom':
-            database.custom_accounts.drop_table()
-        case 'envar':
-            database.env_variables.drop_table()
+            database.drop_tables(database.custom_accounts)
+        case 'env':
+            database.drop_tables(database.env_variables, database.env_scopes)
         case 'user':
             database.drop_database()
@@ -0,0 +1,92 @@
+"""
+This module contains functions to run commands with environment variables of the user
+"""
+import os
+import sys
+import subprocess
+import click
+from croco_cli._database import Database
+from croco_cli._environment import resolve_environment, flatten_environment
+from croco_cli.croco_echo import CrocoEcho
+from croco_cli.utils import validate_scope
+
+
+def _run_leased(command: tuple[str, ...], environment: dict[str, str], count: int, ttl: float) -> int:
+    """
+    Run a command with wallets leased to it, releasing them after the command is finished
+    :param command: The command to run
+    :param environment: Environment variables of the command
+    :param count: Number of wallets to lease
+    :param ttl: Lease duration in seconds
+    :return: Exit code of the command
+    """
+    holder = f'run:{os.getpid()}'
+    database = Database()
+    wallets = database.lease_wallets(holder, count, ttl)
+
+    try:
+        if len(wallets) < count:
+            CrocoEcho.error(f'There are not enough free wallets to lease {count} of them')
+            return 1
+
+        # Leased wallets override variables of the shell, so the command never uses a wallet of another run
+        environment = {**environment, **os.environ}
+        environment['TEST_PRIVATE_KEY'] = wallets[0]['private_key']
+        environment['TEST_MNEMONIC'] = str(wallets[0]['mnemonic'])
+        environment['TEST_PRIVATE_KEYS'] = ','.join(wallet['private_key'] for wallet in wallets)
+
+        process = subprocess.Popen(command, env=environment)
+        while True:
+            try:
+                return process.wait()
+            except KeyboardInterrupt:
+                continue
+    finally:
+        database.release_wallets(holder)
+
+
+@click.command(context_settings={'ignore_unknown_options': True, 'allow_interspersed_args': False})
+@click.option(
+    '--lease',
+    'lease',
+    type=click.IntRange(min=1),
+    default=None,
+    help='Lease the number of wallets not used by other runs, exposing them as TEST_PRIVATE_KEY and TEST_PRIVATE_KEYS'
+)
+@click.option('--lease-ttl', 'lease_ttl', default=3600.0, show_default=True, help='Duration of wallet leases in seconds')
+@click.option(
+    '--scope',
+    'scope',
+    callback=validate_scope,
+    default=None,
+    help='Scope of environment variables, like "sepolia". Variables of the scope and its ancestors override global ones'
+)
+@click.argument('command', nargs=-1, required=True, type=click.UNPROCESSED)
+def run(
+        command: tuple[str, ...],
+        lease: int | None = None,
+        lease_ttl: float = 3600,
+        scope: str | None = None
+) -> None:
+    """Run a command with environment variables of the user, like "croco run -- pytest"
+
+    Variables are the same as in the file made by "croco make dotenv". As with
+    python-dotenv, variables already set in the shell are not overridden, except
+    variables of wallets leased by --lease.
+    """
+    database = Database(read_only=True)
+
+    environment = flatten_environment(resolve_environment(database, scope))
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    try:
+        if lease:
+            sys.exit(_run_leased(command, environment, lease, lease_ttl))
+
+        environment.update(os.environ)
+        os.execvpe(command[0], command, environment)
+    except FileNotFoundError:
+        CrocoEcho.error(f'Command {command[0]!r} is not found')
+        sys.exit(127)
@@ -0,0 +1,32 @@
+"""
+This module contains functions to search stored accounts
+"""
+import click
+from croco_cli._database import Database
+from croco_cli.croco_echo import CrocoEcho
+
+
+@click.command()
+@click.argument('query', nargs=-1, required=True)
+@click.option(
+    '--limit',
+    '-n',
+    help='Maximum number of accounts to show',
+    type=click.IntRange(min=1),
+    default=20,
+    show_default=True
+)
+def search(query: tuple[str, ...], limit: int) -> None:
+    """
+    Search wallets, custom accounts and environment variables. Words of the query are matched by prefixes
+    in labels, public keys, account names, emails, keys of custom data and keys of environment variables
+    """
+    database = Database()
+    database.ensure_search_index()
+
+    results = database.search_accounts(' '.join(query), limit)
+    if not results:
+        CrocoEcho.error('There are no accounts matching the query')
+        return
+
+    CrocoEcho.search_results(results)
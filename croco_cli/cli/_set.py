@@ -1,8 +1,15 @@
 import click
 from typing import Optional
-from croco_cli.types import CustomAccount, Wallet
-from croco_cli.utils import constant_case, catch_github_errors, catch_wallet_errors
-from croco_cli._database import Database
+from croco_cli.types import CustomAccount, Wallet, EnvVar
+from croco_cli.utils import (
+    constant_case,
+    catch_github_errors,
+    catch_wallet_errors,
+    catch_field_errors,
+    catch_scope_errors,
+    validate_scope
+)
+from croco_cli._database import Database, GLOBAL_SCOPE
 from croco_cli.croco_echo import CrocoEcho
 
 
@@ -91,11 +98,57 @@ def custom(
 
 @_set.command()
 @click.argument('key', type=click.STRING)
+@catch_field_errors
+def field(key: str) -> None:
+    """
+    Declare a field of custom accounts data, like "region". The field is indexed,
+    so accounts are filtered by it quickly, like "croco user -c --field region eu"
+    """
+    database = Database()
+    database.declare_custom_field(key)
+    CrocoEcho.detail('Declared field', key, 0)
+
+
+@_set.command()
+@click.option(
+    '--scope',
+    'scope',
+    help='Set the variable in the scope, like "sepolia", instead of globally. Create the scope using "croco set scope"',
+    callback=validate_scope,
+    default=GLOBAL_SCOPE
+)
+@click.argument('key', type=click.STRING)
 @click.argument('value', type=click.STRING)
-def envar(key: str, value: str) -> None:
+def envar(key: str, value: str, scope: str = GLOBAL_SCOPE) -> None:
     """Set an environment variable"""
     database = Database()
 
     key = constant_case(key)
-    database.set_envar(key, value)
-    CrocoEcho.detail(key, value, 0)
+    database.set_envar(key, value, scope)
+    CrocoEcho.envar(EnvVar(key=key, value=value, scope=scope))
+
+
+@_set.command()
+@click.option(
+    '--no-parent',
+    'no_parent',
+    is_flag=True,
+    default=False,
+    help='Detach the scope from its parent, so it inherits only global variables'
+)
+@click.argument('name', type=click.STRING)
+@click.argument('parent', required=False, type=click.STRING)
+@catch_scope_errors
+def scope(name: str, parent: Optional[str] = None, no_parent: bool = False) -> None:
+    """
+    Set a scope of environment variables, like "my-project", inheriting variables of the parent scope, like "sepolia".
+    Scopes without parents inherit only global variables. The parent of an existing scope is kept if not given
+    """
+    if parent and no_parent:
+        raise click.UsageError('The parent cannot be given together with --no-parent')
+
+    database = Database()
+    database.set_env_scope(name, GLOBAL_SCOPE if no_parent else parent)
+
+    chain = database.get_env_scope_chain(name)[:-1]
+    CrocoEcho.detail('Scope', ' -> '.join([*chain, 'global']), 0)
@@ -1,5 +1,14 @@
 import click
+from typing import Optional
 from croco_cli.croco_echo import CrocoEcho
+from croco_cli._database import Database
+from croco_cli._formats import FORMATTERS, render_records
+from croco_cli._listing import SORTS, Page, list_wallets, list_custom_accounts, list_env_variables
+from croco_cli._records import iter_records
+from croco_cli.utils import catch_cursor_errors, validate_scope
+
+# Size of output written to stdout at once in machine-readable formats
+_WRITE_SIZE = 64 * 1024
 
 
 @click.command()
@@ -35,14 +44,132 @@ from croco_cli.croco_echo import CrocoEcho
     flag_value='env',
     default=False
 )
-def user(info: str) -> None:
+@click.option(
+    '--format',
+    '-f',
+    'format_',
+    help='Format of the output',
+    type=click.Choice(['text', *FORMATTERS]),
+    default='text',
+    show_default=True
+)
+@click.option(
+    '--reveal',
+    help='Show secrets unmasked in machine-readable formats',
+    is_flag=True,
+    default=False
+)
+@click.option(
+    '--limit',
+    '-n',
+    help='Maximum number of accounts to show',
+    type=click.IntRange(min=1),
+    default=None
+)
+@click.option(
+    '--offset',
+    help='Number of accounts to skip',
+    type=click.IntRange(min=0),
+    default=0
+)
+@click.option(
+    '--cursor',
+    help='Show accounts after the previous page, using the cursor printed after it',
+    default=None
+)
+@click.option(
+    '--label',
+    help='Show wallets with labels matching the pattern, like "deployer*"',
+    default=None
+)
+@click.option(
+    '--account',
+    help='Show custom accounts with the name',
+    default=None
+)
+@click.option(
+    '--field',
+    'fields',
+    help='Show custom accounts with the field of data, like "--field region eu". Can be used several times',
+    nargs=2,
+    multiple=True,
+    type=(click.STRING, click.STRING)
+)
+@click.option(
+    '--scope',
+    callback=validate_scope,
+    help='Show environment variables set in the scope, like "sepolia". Use "" for global variables',
+    default=None
+)
+@click.option(
+    '--search',
+    '-s',
+    help='Show accounts containing all words of the query in their names, emails, labels or public keys',
+    default=None
+)
+@click.option(
+    '--sort',
+    help='Sort accounts by names or in order of creation. '
+         'By default, wallets are sorted by names and other accounts in order of creation',
+    type=click.Choice(SORTS),
+    default=None
+)
+@catch_cursor_errors
+def user(
+        info: str,
+        format_: str,
+        reveal: bool,
+        limit: Optional[int],
+        offset: int,
+        cursor: Optional[str],
+        label: Optional[str],
+        account: Optional[str],
+        fields: list[tuple[str, str]],
+        scope: Optional[str],
+        search: Optional[str],
+        sort: Optional[str]
+) -> None:
     """Show user accounts"""
+    database = Database(read_only=True)
+    page_options = dict(search=search, limit=limit, offset=offset, cursor=cursor)
+
     match info:
         case 'wallets':
-            CrocoEcho.wallets()
+            page = list_wallets(database, label, sort=sort or 'name', **page_options)
         case 'custom':
-            CrocoEcho.custom_accounts()
-        case 'git':
-            CrocoEcho.github()
+            page = list_custom_accounts(database, account, dict(fields), sort=sort or 'created', **page_options)
         case 'env':
-            CrocoEcho.envars()
+            page = list_env_variables(database, scope, sort=sort or 'created', **page_options)
+        case _:
+            page = None
+
+    if format_ != 'text':
+        _echo_records(info, format_, reveal, page)
+    else:
+        match info:
+            case 'wallets':
+                CrocoEcho.wallets(page)
+            case 'custom':
+                CrocoEcho.custom_accounts(page)
+            case 'git':
+                CrocoEcho.github()
+            case 'env':
+                CrocoEcho.envars(page)
+
+    if page is not None and page.next_cursor:
+        CrocoEcho.text(f'Next page: --cursor {page.next_cursor}', err=True)
+
+
+def _echo_records(section: str, format_: str, reveal: bool, page: Optional[Page]) -> None:
+    """Stream records of the section to stdout in the format, in large blocks"""
+    records = iter_records(Database(read_only=True), section, reveal, page)
+    chunk, size = [], 0
+
+    for piece in render_records(format_, records):
+        chunk.append(piece)
+        size += len(piece)
+        if size >= _WRITE_SIZE:
+            click.echo(''.join(chunk), nl=False)
+            chunk, size = [], 0
+
+    chunk and click.echo(''.join(chunk), nl=False)
@@ -2,7 +2,8 @@ from typing import Optional
 from ._database import Database
 from .tools.echo import Echo
 from .types import Wallet, CustomAccount, EnvVar
-from croco_cli.utils import hide_value, require_wallet, sort_wallets, require_github
+from croco_cli._listing import Page, list_wallets, list_custom_accounts, list_env_variables
+from croco_cli._records import mask_wallet, mask_fields, mask_github_user
 
 
 class CrocoEcho(Echo):
@@ -17,30 +18,40 @@ class CrocoEcho(Echo):
         label = wallet['label'] if wallet['label'] else 'Wallet'
         label = f'{label} (Current)' if wallet["current"] else label
 
-        private_key = hide_value(wallet["private_key"], 5, 5)
+        wallet = mask_wallet(wallet)
         Echo.label(f'{label}')
         cls.detail('Public Key', wallet['public_key'])
-        cls.detail('Private Key', private_key)
+        cls.detail('Private Key', wallet['private_key'])
         if mnemonic := wallet.get('mnemonic'):
-            first_word_len = len(mnemonic.split()[0])
-            last_word_len = len(mnemonic.split()[-1])
-            cls.detail('Mnemonic', hide_value(mnemonic, first_word_len, last_word_len))
+            cls.detail('Mnemonic', mnemonic)
 
     @classmethod
-    @require_wallet
-    def wallets(cls) -> None:
+    def wallets(cls, page: Optional[Page] = None) -> None:
         """
         Echo wallets of the user.
-        Retrieves the wallets from the database, sorts them, and displays details for each wallet on the screen.
+        Wallets are read from the database sorted, with default labels of unlabelled ones, and displayed on the screen.
 
+        :param page: Page of wallets to display. All wallets are displayed if not provided
         :return: None
         """
-        database = Database()
+        database = Database(read_only=True)
+        page = page or list_wallets(database)
+
+        count = 0
+        with cls.buffered():
+            for row in page:
+                wallet = database.to_wallet(row)
+                wallet['label'] = row.display_label
+                cls.wallet(wallet)
+                count += 1
+
+        if count:
+            return
 
-        wallets = database.get_wallets()
-        wallets = sort_wallets(wallets)
-        for wallet in wallets:
-            cls.wallet(wallet)
+        if page.partial:
+            cls.error('There are no wallets to show')
+        else:
+            cls.warning('Wallet private key is missing. Set it to continue (croco set wallet).')
 
     @classmethod
     def account_dict(cls, __dict: dict[str, str], label: Optional[str] = None) -> None:
@@ -52,33 +63,27 @@ class CrocoEcho(Echo):
         :return: None
         """
         label and cls.label(f'{label}')
-        for key, value in __dict.items():
-            if 'password' in key or 'cookie' in key:
-                continue
-
-            if 'token'.lower() in key.lower() or 'secret' in key.lower() or 'private' in key.lower():
-                value = hide_value(value, len(value) // 5, len(value) // 5)
-
+        for key, value in mask_fields(__dict).items():
             key = ' '.join([word.capitalize() for word in key.replace("_", " ").split()])
             cls.detail(f'{key}', value)
 
     @classmethod
-    @require_github
     def github(cls) -> None:
         """Echo GitHub user account"""
-        database = Database()
+        database = Database(read_only=True)
 
         github_user = database.get_github_user()
 
         if not github_user:
-            cls.error('There is no GitHub to show')
+            cls.error('There is no GitHub to show. Set it using "croco set git"')
             return
 
-        access_token = hide_value(github_user['access_token'], 10)
-        CrocoEcho.label('GitHub')
-        CrocoEcho.detail('Login', github_user["login"])
-        CrocoEcho.detail('Email', github_user["email"])
-        CrocoEcho.detail('Access token', access_token)
+        github_user = mask_github_user(github_user)
+        with cls.buffered():
+            CrocoEcho.label('GitHub')
+            CrocoEcho.detail('Login', github_user["login"])
+            CrocoEcho.detail('Email', github_user["email"])
+            CrocoEcho.detail('Access token', github_user['access_token'])
 
     @classmethod
     def custom_account(cls, custom_account: CustomAccount) -> None:
@@ -93,31 +98,63 @@ class CrocoEcho(Echo):
         custom_data and cls.account_dict(custom_data)
 
     @classmethod
-    def custom_accounts(cls) -> None:
-        """Echo custom accounts of user. Retrieves the accounts from the database"""
-        database = Database()
+    def custom_accounts(cls, page: Optional[Page] = None) -> None:
+        """
+        Echo custom accounts of user. Retrieves the accounts from the database
 
-        custom_accounts = database.get_custom_accounts()
-        if not custom_accounts:
-            cls.error('There are no custom accounts to show')
-            return
+        :param page: Page of accounts to display. All accounts are displayed if not provided
+        :return: None
+        """
+        database = Database(read_only=True)
 
-        for custom_account in custom_accounts:
-            cls.custom_account(custom_account)
+        count = 0
+        with cls.buffered():
+            for row in page or list_custom_accounts(database):
+                cls.custom_account(database.to_custom_account(row))
+                count += 1
+
+        if not count:
+            cls.error('There are no custom accounts to show')
 
     @classmethod
     def envar(cls, envar: EnvVar) -> None:
-        """Echo an environment variable."""
-        CrocoEcho.detail(envar['key'], envar['value'], 0)
+        """Echo an environment variable. Variables of scopes are marked with names of the scopes"""
+        key = f'{envar["key"]} ({scope})' if (scope := envar.get('scope')) else envar['key']
+        CrocoEcho.detail(key, envar['value'], 0)
 
     @classmethod
-    def envars(cls) -> None:
-        database = Database()
+    def envars(cls, page: Optional[Page] = None) -> None:
+        """
+        Echo environment variables of user
 
-        envars = database.get_env_variables()
-        if not envars:
+        :param page: Page of variables to display. All variables are displayed if not provided
+        :return: None
+        """
+        database = Database(read_only=True)
+
+        count = 0
+        with cls.buffered():
+            for row in page or list_env_variables(database):
+                cls.envar(EnvVar(key=row.key, value=row.value, scope=getattr(row, 'scope', '')))
+                count += 1
+
+        if not count:
             cls.error('There are no environment variables to show')
-            return
 
-        for envar in envars:
-            cls.envar(envar)
+    @classmethod
+    def search_results(cls, results: list[tuple[str, Wallet | CustomAccount | EnvVar]]) -> None:
+        """
+        Echo accounts found by the search, in order of relevance.
+
+        :param results: Kinds of found accounts paired with the accounts
+        :return: None
+        """
+        with cls.buffered():
+            for kind, account in results:
+                match kind:
+                    case 'wallet':
+                        cls.wallet(account)
+                    case 'custom':
+                        cls.custom_account(account)
+                    case 'env':
+                        cls.envar(account)
@@ -26,4 +26,56 @@ class InvalidMnemonic(ValueError):
     """Raised when mnemonic of a wallet is invalid"""
 
     def __init__(self) -> None:
-        super().__init__('Invalid mnemonic. Mnemonic must be related to the private key')
\ No newline at end of file
+        super().__init__('Invalid mnemonic. Mnemonic must be related to the private key')
+
+
+class InvalidPassword(ValueError):
+    """Raised when password of an encrypted export is invalid"""
+
+    def __init__(self) -> None:
+        super().__init__('Invalid password. Unable to decrypt the export file')
+
+
+class CorruptedContainer(ValueError):
+    """Raised when an encrypted export is truncated or damaged"""
+
+    def __init__(self) -> None:
+        super().__init__('The export file is corrupted or is not an encrypted croco-cli export')
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor of a listing page is malformed or belongs to another listing"""
+
+    def __init__(self) -> None:
+        super().__init__('Invalid cursor. Use the cursor printed after the previous page of the same listing')
+
+
+class InvalidFieldName(ValueError):
+    """Raised when a field of custom accounts data cannot be declared"""
+
+    def __init__(self) -> None:
+        super().__init__('Invalid field name. It must start with a letter and contain only letters, digits and "_"')
+
+
+class InvalidScope(ValueError):
+    """Raised when a scope of environment variables would inherit from itself"""
+
+    def __init__(self) -> None:
+        super().__init__('Invalid scope. A scope cannot inherit from itself or from its descendants')
+
+
+class UnknownScope(ValueError):
+    """Raised when variables of a scope, which does not exist, are resolved"""
+
+    def __init__(self, scope: str) -> None:
+        super().__init__(f'Unknown scope "{scope}". Create it using "croco set scope"')
+
+
+class MultilineValue(ValueError):
+    """Raised when a value with line breaks is rendered in a format of single-line values"""
+
+    def __init__(self, key: str, format_: str) -> None:
+        super().__init__(
+            f'Value of "{key}" contains a line break, which the {format_} format cannot hold. '
+            f'Use another format, like json or github'
+        )
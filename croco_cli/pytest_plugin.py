@@ -0,0 +1,125 @@
+"""
+Pytest plugin providing accounts of croco-cli as session-scoped fixtures.
+
+The database is opened in read-only mode and every fixture reads it once per session,
+so test suites need neither "croco make dotenv" nor repeated SQLite queries.
+"""
+from functools import cache
+from typing import Callable, Optional, TYPE_CHECKING
+import os
+import pytest
+
+if TYPE_CHECKING:
+    from croco_cli._database import Database
+    from croco_cli.types import Wallet, CustomAccount
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('croco', 'croco-cli')
+    group.addoption(
+        '--croco-wallets',
+        dest='croco_wallets',
+        type=int,
+        default=1,
+        help='Number of wallets leased to each pytest-xdist worker by the croco_worker_wallets fixture'
+    )
+    group.addoption(
+        '--croco-lease-ttl',
+        dest='croco_lease_ttl',
+        type=float,
+        default=3600,
+        help='Duration of wallet leases in seconds, after which wallets of crashed workers are freed'
+    )
+    group.addoption(
+        '--croco-scope',
+        dest='croco_scope',
+        default=None,
+        help='Scope of environment variables used by the croco_env fixture, like "sepolia"'
+    )
+
+
+@pytest.fixture(scope='session')
+def croco_database() -> 'Database':
+    """The database of croco-cli opened in read-only mode"""
+    # Imported lazily to not slow down the start of pytest sessions that do not use croco-cli
+    from croco_cli._database import Database
+
+    return Database(read_only=True)
+
+
+@pytest.fixture(scope='session')
+def croco_wallets(croco_database: 'Database') -> list['Wallet']:
+    """All wallets of the user"""
+    return croco_database.get_wallets() or []
+
+
+@pytest.fixture(scope='session')
+def croco_wallet(croco_wallets: list['Wallet']) -> 'Wallet':
+    """The current wallet of the user. Tests are skipped if it is not set"""
+    for wallet in croco_wallets:
+        if wallet['current']:
+            return wallet
+
+    pytest.skip('There is no current wallet. Set it using "croco set wallet"')
+
+
+@pytest.fixture(scope='session')
+def croco_env(croco_database: 'Database', pytestconfig: pytest.Config) -> dict[str, str]:
+    """Environment variables of the user, the same as "croco make dotenv" writes"""
+    from croco_cli._environment import resolve_environment, flatten_environment
+    from croco_cli.exceptions import UnknownScope
+
+    try:
+        return flatten_environment(resolve_environment(croco_database, pytestconfig.getoption('croco_scope')))
+    except UnknownScope as err:
+        raise pytest.UsageError(str(err))
+
+
+@pytest.fixture(scope='session')
+def croco_account(croco_database: 'Database') -> Callable[[str], 'CustomAccount']:
+    """
+    Factory returning the current custom account with the name, like croco_account('binance').
+    Tests are skipped if the account is not set
+    """
+    @cache
+    def _get_account(account: str) -> Optional['CustomAccount']:
+        accounts = croco_database.get_custom_accounts(account, current=True)
+        return accounts[0] if accounts else None
+
+    def get_account(account: str) -> 'CustomAccount':
+        if not (custom_account := _get_account(account)):
+            pytest.skip(f'There is no {account} account. Set it using "croco set custom"')
+
+        return custom_account
+
+    return get_account
+
+
+@pytest.fixture(scope='session')
+def croco_worker_wallets(request: pytest.FixtureRequest) -> list['Wallet']:
+    """
+    Wallets leased to the current pytest-xdist worker. Workers get disjoint wallets, so on-chain
+    tests do not collide on nonces. Wallets are released at the end of the session
+    """
+    from croco_cli._database import Database
+
+    config = request.config
+    count = config.getoption('croco_wallets')
+    worker_input = getattr(config, 'workerinput', {})
+    run_id = worker_input.get('testrunuid', os.getpid())
+    holder = f'pytest:{run_id}:{worker_input.get("workerid", "master")}'
+
+    database = Database()
+    wallets = database.lease_wallets(holder, count, config.getoption('croco_lease_ttl'))
+    request.addfinalizer(lambda: database.release_wallets(holder))
+
+    if len(wallets) < count:
+        pytest.skip(f'There are not enough free wallets to lease {count} of them to each worker')
+
+    return wallets
+
+
+@pytest.fixture(scope='session')
+def croco_worker_wallet(croco_worker_wallets: list['Wallet']) -> 'Wallet':
+    """The first wallet leased to the current pytest-xdist worker"""
+    return croco_worker_wallets[0]
@@ -4,4 +4,5 @@ Standalone tools to develop CLI
 
 from .echo import Echo
 from .option import Option
+from .provider import OptionProvider, ListProvider
 from .keymode import KeyMode
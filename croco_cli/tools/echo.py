@@ -1,11 +1,86 @@
 """
 Class for echoing messages
 """
+import sys
 import click
-from typing import Optional, Any, IO
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import Optional, Any, IO, Iterator
+
+_RESET = click.style('', reset=True)
+# Size of buffered text written to the stream at once
+_FLUSH_SIZE = 64 * 1024
+
+
+@lru_cache
+def _style_prefix(**styles: Any) -> str:
+    """Returns ANSI codes starting the style, computed once for each style"""
+    return click.style('', reset=False, **styles)
+
+
+def _use_color(err: bool = False) -> bool:
+    """Whether the output should be colored, like click.echo decides it"""
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and ctx.color is not None:
+        return ctx.color
+
+    stream = sys.stderr if err else sys.stdout
+    return stream is not None and stream.isatty()
 
 
 class Echo:
+    _buffer: Optional[list[str]] = None
+    _buffer_size: int = 0
+    _color: Optional[bool] = None
+
+    @classmethod
+    @contextmanager
+    def buffered(cls) -> Iterator[None]:
+        """
+        Collects text echoed to stdout and writes it in large blocks, instead of a write for each message.
+        Colors are decided once for the block, and no ANSI codes are built if stdout is not a terminal.
+
+        :return: None
+        """
+        if cls._buffer is not None:
+            yield
+            return
+
+        Echo._buffer, Echo._buffer_size, Echo._color = [], 0, _use_color()
+        try:
+            yield
+        finally:
+            Echo._flush()
+            Echo._buffer, Echo._buffer_size, Echo._color = None, 0, None
+
+    @staticmethod
+    def _flush() -> None:
+        if Echo._buffer:
+            click.echo(''.join(Echo._buffer), nl=False, color=Echo._color)
+            Echo._buffer.clear()
+            Echo._buffer_size = 0
+
+    @staticmethod
+    def _style(text: str, err: bool = False, **styles: Any) -> str:
+        """Returns the styled text, or the plain text if the output is not colored"""
+        color = Echo._color if Echo._buffer is not None and not err else _use_color(err)
+        if not color:
+            return text
+
+        return f'{_style_prefix(**styles)}{text}{_RESET}'
+
+    @staticmethod
+    def _write(text: str, err: bool = False) -> None:
+        """Writes the text to stdout or stderr. Text for stdout is buffered inside of the buffered block"""
+        if Echo._buffer is None or err:
+            click.echo(text, nl=False, err=err)
+            return
+
+        Echo._buffer.append(text)
+        Echo._buffer_size += len(text)
+        if Echo._buffer_size >= _FLUSH_SIZE:
+            Echo._flush()
+
     @staticmethod
     def warning(text: str) -> None:
         """
@@ -14,9 +89,8 @@ class Echo:
         :param text: The warning message to display.
         :return: None
         """
-        click.echo(click.style(' ! ', bg='yellow'), nl=False)
-        click.echo(' ', nl=False)
-        click.echo(click.style(text, fg='yellow'))
+        style = Echo._style
+        Echo._write(f"{style(' ! ', bg='yellow')} {style(text, fg='yellow')}\n")
 
     @staticmethod
     def error(text: str) -> None:
@@ -26,9 +100,8 @@ class Echo:
         :param text: The error message to display.
         :return: None
         """
-        click.echo(click.style(' x ', bg='red'), nl=False, err=True)
-        click.echo(' ', nl=False, err=True)
-        click.echo(click.style(text, fg='red'), err=True)
+        style = Echo._style
+        Echo._write(f"{style(' x ', err=True, bg='red')} {style(text, err=True, fg='red')}\n", err=True)
 
     @staticmethod
     def label(label: str, padding: Optional[int] = 0) -> None:
@@ -40,7 +113,7 @@ class Echo:
         :return: None
         """
         padding = '     ' * padding
-        click.echo(click.style(f'{padding}[{label}]', fg='blue', bold=True))
+        Echo._write(Echo._style(f'{padding}[{label}]', fg='blue', bold=True) + '\n')
 
     @staticmethod
     def detail(key: str, value: str, padding: Optional[int] = 1) -> None:
@@ -53,8 +126,8 @@ class Echo:
         :return: None
         """
         padding = '     ' * padding
-        click.echo(click.style(f'{padding}{key}: ', fg='magenta'), nl=False)
-        click.echo(click.style(f'{value}', fg='green'))
+        style = Echo._style
+        Echo._write(f"{style(f'{padding}{key}: ', fg='magenta')}{style(f'{value}', fg='green')}\n")
 
     @staticmethod
     def text(
@@ -64,6 +137,8 @@ class Echo:
             err: bool = False,
             color: Optional[bool] = None
     ) -> None:
+        if file is None and not err and Echo._buffer is not None:
+            Echo._flush()
         click.echo(message, file=file, err=err, color=color, nl=nl)
         
     @staticmethod
@@ -75,4 +150,6 @@ class Echo:
         color: Optional[bool] = None,
         **styles: Any,
     ) -> None:
+        if file is None and not err and Echo._buffer is not None:
+            Echo._flush()
         click.secho(message, file=file, err=err, color=color, nl=nl, **styles)
@@ -1,119 +1,351 @@
 """
 Class to showing keyboard-interactive mode.
 """
-from typing import Optional
+import signal
+from contextlib import contextmanager
+from typing import Optional, Callable, Any, Iterator
 import blessed
 from .option import Option
+from .provider import OptionProvider, ListProvider
+from .worker import TaskWorker
 from .types import AnyCallable
 
+# Limit of pending keypresses handled before the screen is redrawn
+_MAX_COALESCED_KEYS = 64
+# Seconds between redraws while background tasks are running
+_TASK_REFRESH_INTERVAL = 0.1
+_TASK_PANE_ROWS = 12
+_TASK_SUMMARY_ROWS = 3
+# Seconds to wait for a task, which cannot be cancelled, when the screen is closed
+_SHUTDOWN_TIMEOUT = 5
+# Shown while options can be marked for deleting. Space types into the search once it is started
+_MARKING_HELP = 'Space or Tab: mark, Shift-Tab: mark range from the last mark, Delete: delete marked, Esc: unmark'
+
+
+@contextmanager
+def _cancel_on_interrupt(worker: TaskWorker) -> Iterator[None]:
+    """Makes Ctrl-C cancel the running task of the worker. Without running tasks, Ctrl-C interrupts as usual"""
+
+    def _handler(signum, frame):
+        if not worker.cancel():
+            raise KeyboardInterrupt
+
+    try:
+        previous_handler = signal.signal(signal.SIGINT, _handler)
+    except ValueError:
+        # Signal handlers can be set in the main thread only
+        previous_handler = None
+
+    try:
+        yield
+    finally:
+        worker.shutdown(_SHUTDOWN_TIMEOUT)
+        if previous_handler is not None:
+            signal.signal(signal.SIGINT, previous_handler)
+
 
 class KeyMode:
     def __init__(
             self,
-            options: list[Option],
+            options: list[Option] | OptionProvider,
             description: str,
-            term: blessed.Terminal = blessed.Terminal()
+            term: blessed.Terminal = blessed.Terminal(),
+            batch_deleting_handler: Optional[Callable[[list[Any]], Any]] = None
     ):
         """
         Class to showing keyboard-interactive mode.
 
-        :param options: Options to be shown on screen
+        :param options: Options to be shown on screen, or a provider loading them page by page
         :param description: Description of the screen to be shown on screen
         :param term: Terminal to be interacted with
+        :param batch_deleting_handler: Action deleting several selected options at once, called with their keys.
+            Options can be marked for it with Space or Tab, and Shift-Tab marks a range
         """
-        self.__options = options
+        if not isinstance(options, OptionProvider):
+            options = ListProvider(options)
+
+        self.__provider = options
         self.__description = description
         self.__term = term
-        
+        self.__batch_deleting_handler = batch_deleting_handler
+
     @property
-    def options(self) -> list[Option]:
-        """Options to be shown on screen"""
-        return self.__options.copy()
+    def options(self) -> OptionProvider:
+        """Provider of options to be shown on screen"""
+        return self.__provider
     
     @property
     def description(self) -> str:
         """Description of the screen to be shown on screen"""
         return self.__description
     
+    @staticmethod
+    def __update_layout(layout: tuple[int, int], options: list[Option]) -> tuple[int, int]:
+        """Returns padded lengths of option names and descriptions, widened to fit the given options"""
+        padded_name_len, padded_description_len = layout
+
+        for option in options:
+            padded_name_len = max(padded_name_len, len(option.name) + 2)
+            if option.description:
+                padded_description_len = max(padded_description_len, len(option.description) + 2)
+
+        return padded_name_len, padded_description_len
+
+    def __render_option(
+            self,
+            option: Option,
+            selected: bool,
+            layout: tuple[int, int],
+            marked: bool = False
+    ) -> str:
+        """Returns the line of the option, truncated to the width of the terminal. Marked options are starred"""
+        term = self.__term
+        padded_name_len, padded_description_len = layout
+        option_text = option.name.ljust(padded_name_len)
+
+        if padded_description_len and option.description:
+            option_text = f'{option_text} | {option.description.ljust(padded_description_len)}'
+
+        option_text = option_text[:max(term.width - 2, 0)]
+        mark = '*' if marked else ' '
+        if selected:
+            return term.green_reverse(f">{mark}{option_text}")
+
+        return f" {mark}{option_text}"
+
+    def __redraw(self, frame: list[str], lines: list[str]) -> list[str]:
+        """
+        Draws only lines which differ from the previous frame.
+
+        :param frame: Lines of the previous frame
+        :param lines: Lines of the new frame
+        :return: The new frame
+        """
+        term = self.__term
+        output = [
+            term.move_yx(y, 0) + line + term.clear_eol
+            for y, line in enumerate(lines)
+            if y >= len(frame) or frame[y] != line
+        ]
+
+        if len(lines) < len(frame):
+            output.append(term.move_yx(len(lines), 0) + term.clear_eos)
+
+        print(''.join(output), end='', flush=True)
+        return lines
+
+    def __render_tasks(self, worker: TaskWorker, rows: int) -> list[str]:
+        """Returns lines of the pane with statuses of background tasks and output of the last started one"""
+        term = self.__term
+        tasks = worker.tasks
+        if not tasks:
+            return []
+
+        width = term.width
+        started = [task for task in tasks if task.started is not None]
+        queued = len(tasks) - len(started)
+        finished = sum(task.finished is not None for task in started)
+        title = f'Tasks: {finished}/{len(tasks)} finished' + (f', {queued} queued' if queued else '')
+        lines = [term.bold(f'-- {title} '.ljust(width, '-')[:width])]
+
+        styles = {'done': term.green, 'failed': term.red, 'cancelled': term.red}
+        for task in started[-_TASK_SUMMARY_ROWS:]:
+            style = styles.get(task.status, term.yellow)
+            summary = f'{task.status:>10} {task.elapsed:7.1f} s  {task.name}'
+            if task.error:
+                summary += f': {task.error}'
+            lines.append(style(summary[:width]))
+
+        if started and rows > len(lines):
+            output = worker.lines(started[-1])[-(rows - len(lines)):]
+            lines.extend(f'  {line}'[:width] for line in output)
+
+        return lines[:rows]
+
+    def __read_keys(self, timeout: Optional[float] = None) -> list:
+        """
+        Waits for a keypress and returns it together with already pending ones, so held keys cause one redraw.
+        Returns no keys if the timeout is over
+        """
+        term = self.__term
+        key = term.inkey(timeout=timeout)
+        if not key:
+            return []
+
+        keys = [key]
+
+        while len(keys) < _MAX_COALESCED_KEYS and (key := term.inkey(timeout=0)):
+            keys.append(key)
+
+        return keys
+
     def __call__(self):
         """Shows keyboard interaction mode for the given options"""
-        
+
         term = self.__term
-        options = self.options
-        
+        provider = self.__provider
+        provider.search('')
+
         exit_option = Option(
             name='Exit',
             description='Return to the term',
             handler=term.clear()
         )
 
-        options.append(exit_option)
-
         current_option = 0
-        padded_name_len = max([len(option.name) for option in options]) + 2
-
-        use_description = True
-        padded_description_lengths = []
-        for option in options:
-            description = option.get('description', [])
-            padded_description_lengths.append(len(option.get('description', [])))
-            if not description:
-                use_description = False
-                break
+        offset = 0
+        layout = (0, 0)
+        query = ''
+        marked = set()
+        anchor = 0
+        # Deleting of marked options waits for confirmation, since it cannot be undone
+        confirming = False
 
-        padded_description_len = None
-        if use_description:
-            padded_description_len = max(padded_description_lengths) + 2
+        frame = []
+        size = None
+        selected_option = None
+        worker = TaskWorker()
 
-        with term.fullscreen(), term.cbreak(), term.hidden_cursor():
-            while True:
-                print(term.move_yx(0, 0) + term.clear())
+        with term.fullscreen(), term.cbreak(), term.hidden_cursor(), _cancel_on_interrupt(worker):
+            while selected_option is None or worker.busy:
+                if size != (term.height, term.width):
+                    size = (term.height, term.width)
+                    frame = []
+                    print(term.home + term.clear, end='')
 
+                header = []
                 if self.description:
-                    print(term.bold_green(self.description + '\n'))
+                    header = [term.bold_green(self.description), '']
+                status = []
+                if query:
+                    status.append(f'Search: {query}')
+                if marked:
+                    status.append(f'{len(marked)} selected')
+                if confirming:
+                    status.append(f'Delete {len(marked)} selected? Press "y" to confirm, any other key to cancel')
+                if not status and self.__batch_deleting_handler:
+                    status.append(_MARKING_HELP)
+                if status:
+                    header[-1:] = [', '.join(status)[:term.width]]
 
-                for i, option in enumerate(options):
-                    name = option.name.ljust(padded_name_len)
+                pane = self.__render_tasks(worker, min(max(term.height // 3, 4), _TASK_PANE_ROWS))
+                count = provider.count()
+                height = max(term.height - len(header) - len(pane), 1)
+                current_option = min(current_option, count)
+                if current_option < offset:
+                    offset = current_option
+                elif current_option >= offset + height:
+                    offset = current_option - height + 1
 
-                    if use_description:
-                        description = option.description.ljust(padded_description_len)
-                        option_text = f'{name} | {description}'
-                    else:
-                        option_text = name
+                visible = provider.page(offset, height)
+                layout = self.__update_layout(layout, visible)
+                if len(visible) < height:
+                    visible.append(exit_option)
 
-                    if i == current_option:
-                        print(term.green_reverse(f"> {option_text}"))
-                    else:
-                        print(f"  {option_text}")
+                lines = header + [
+                    self.__render_option(
+                        option,
+                        offset + i == current_option,
+                        layout,
+                        option.key is not None and option.key in marked
+                    )
+                    for i, option in enumerate(visible)
+                ]
+                if pane:
+                    lines += [''] * (len(header) + height - len(lines)) + pane
+                frame = self.__redraw(frame, lines)
 
-                key = term.inkey()
+                keys = self.__read_keys(_TASK_REFRESH_INTERVAL if worker.busy else None)
 
-                last_option_idx = len(options) - 1
-                if key.name == 'KEY_UP':
-                    if current_option > 0:
-                        current_option -= 1
-                    else:
-                        current_option = last_option_idx
-                elif key.name == 'KEY_DOWN':
-                    if current_option < last_option_idx:
-                        current_option += 1
-                    else:
-                        current_option = 0
-                elif (key.name in ('KEY_BACKSPACE', 'KEY_DELETE') and
-                      (deleting_handler := options[current_option].get('deleting_handler'))):
-                    deleting_handler()
-                    options.pop(current_option)
+                if selected_option is not None:
+                    # The selected option waits for background tasks to be finished
+                    keys = []
+
+                for key in keys:
+                    last_option_idx = count
+                    if confirming:
+                        confirming = False
+                        if key not in ('y', 'Y'):
+                            continue
+
+                        self.__batch_deleting_handler(list(marked))
+                        provider.discard(marked)
+                        marked = set()
 
-                    if len(options) > 1:
+                        if not query and provider.count() == 0:
+                            return
+                        current_option = min(current_option, provider.count())
+                    elif key.name == 'KEY_UP':
                         if current_option > 0:
                             current_option -= 1
                         else:
+                            current_option = last_option_idx
+                    elif key.name == 'KEY_DOWN':
+                        if current_option < last_option_idx:
                             current_option += 1
-                    else:
-                        return
-                elif key == '\n' or key.name == 'KEY_ENTER':
-                    selected_option = options[current_option]
-                    break
+                        else:
+                            current_option = 0
+                    elif key.name == 'KEY_PGUP':
+                        current_option = max(current_option - height, 0)
+                    elif key.name == 'KEY_PGDOWN':
+                        current_option = min(current_option + height, last_option_idx)
+                    elif key.name == 'KEY_HOME':
+                        current_option = 0
+                    elif key.name == 'KEY_END':
+                        current_option = last_option_idx
+                    elif key.name == 'KEY_ESCAPE' and query:
+                        query = ''
+                        provider.search(query)
+                        current_option = 0
+                    elif key.name == 'KEY_ESCAPE':
+                        marked.clear()
+                    elif ((key.name == 'KEY_TAB' or key == ' ' and not query) and
+                          self.__batch_deleting_handler and current_option < count):
+                        option = provider.page(current_option, 1)[0]
+                        if option.key is not None:
+                            marked.symmetric_difference_update({option.key})
+                            anchor = current_option
+                            current_option = min(current_option + 1, last_option_idx)
+                    elif key.name == 'KEY_BTAB' and self.__batch_deleting_handler and current_option < count:
+                        start = min(anchor, current_option)
+                        options = provider.page(start, abs(anchor - current_option) + 1)
+                        marked.update(option.key for option in options if option.key is not None)
+                        anchor = current_option
+                    elif key.name == 'KEY_BACKSPACE' and query:
+                        query = query[:-1]
+                        provider.search(query)
+                        current_option = 0
+                    elif (key.name in ('KEY_BACKSPACE', 'KEY_DELETE') and marked and
+                          self.__batch_deleting_handler):
+                        confirming = True
+                    elif key.name in ('KEY_BACKSPACE', 'KEY_DELETE') and current_option < count:
+                        option = provider.page(current_option, 1)[0]
+                        if deleting_handler := option.get('deleting_handler'):
+                            deleting_handler()
+                            provider.remove(current_option)
+
+                            if not query and provider.count() == 0:
+                                return
+                            if current_option > 0:
+                                current_option -= 1
+                    elif key == '\n' or key.name == 'KEY_ENTER':
+                        option = provider.page(current_option, 1)[0] if current_option < count else exit_option
+                        if option.background:
+                            worker.submit(option.name, option.handler)
+                            continue
+
+                        selected_option = option
+                        break
+                    elif not key.is_sequence and key.isprintable():
+                        query += str(key)
+                        provider.search(query)
+                        current_option = 0
+
+                    count = provider.count()
+
+        for task in worker.tasks:
+            message = f'{task.name}: {task.status} in {task.elapsed:.1f} s'
+            print(term.red(f'{message}: {task.error}') if task.error else message)
 
         return selected_option.handler()
 
@@ -121,21 +353,23 @@ class KeyMode:
     def screen_option(
             label: str,
             description: Optional[str],
-            options: list[Option],
-            deleting_handler: Optional[AnyCallable] = None
+            options: list[Option] | OptionProvider,
+            deleting_handler: Optional[AnyCallable] = None,
+            batch_deleting_handler: Optional[Callable[[list[Any]], Any]] = None
     ) -> Option:
         """
         Returns an option navigating to a new screen.
 
         :param label: The label for the option.
         :param description: The description for the option.
-        :param options: List of options for the new screen.
+        :param options: Options for the new screen, or a provider loading them page by page.
         :param deleting_handler: Optional handler for deleting the option.
+        :param batch_deleting_handler: Optional handler for deleting several options of the new screen at once.
         :return: The created Option instance.
         """
 
         def _handler():
-            keymode = KeyMode(options, description)
+            keymode = KeyMode(options, description, batch_deleting_handler=batch_deleting_handler)
             keymode()
 
         option = Option(
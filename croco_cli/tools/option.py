@@ -15,12 +15,16 @@ class Option:
     :param description: Description of the option
     :param handler: Action to be performed on this option
     :param deleting_handler: Action to be performed on the deleting of this option
+    :param key: Identifier of the option, required to select several options at once
+    :param background: Whether the handler runs in background, streaming its output, while the screen stays open
     """
 
     name: str
     handler: AnyCallable
     description: str | None = None
     deleting_handler: AnyCallable = lambda: None
+    key: Any = None
+    background: bool = False
 
     def get(self, attr: str, default: Any = None) -> Any:
         """
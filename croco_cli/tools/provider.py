@@ -0,0 +1,174 @@
+"""
+Classes providing options to be shown on screen during KeyMode
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+from .option import Option
+
+
+class OptionProvider(ABC):
+    """
+    Source of options to be shown on screen during KeyMode. Options are requested page by page,
+    so only the visible ones have to be loaded
+    """
+
+    @abstractmethod
+    def count(self) -> int:
+        """
+        Returns number of options matching the search query
+        :return: Number of options
+        """
+
+    @abstractmethod
+    def page(self, offset: int, limit: int) -> list[Option]:
+        """
+        Returns options matching the search query
+        :param offset: Number of options to skip
+        :param limit: Maximum number of options to return
+        :return: List of options
+        """
+
+    @abstractmethod
+    def search(self, query: str) -> None:
+        """
+        Sets the search query. Each word of the query must be found in names or descriptions of options
+        :param query: The search query
+        :return: None
+        """
+
+    def remove(self, offset: int) -> None:
+        """
+        Called after the deleting handler of an option was performed
+        :param offset: Position of the deleted option among options matching the search query
+        :return: None
+        """
+
+    def discard(self, keys: set) -> None:
+        """
+        Called after the batch deleting handler was performed for several options
+        :param keys: Keys of the deleted options
+        :return: None
+        """
+
+
+class SearchIndex:
+    def __init__(self, haystacks: list[str]):
+        """
+        Incremental search over lowercase texts. Each word of the query must be found in the text.
+        Every typed character narrows the matches of the previous query instead of scanning all texts again,
+        and removed characters restore matches of shorter queries.
+
+        :param haystacks: Texts to be searched, made by the haystack method
+        """
+        self.__haystacks = haystacks
+        self.__matches = [list(range(len(haystacks)))]
+        self.__query = ''
+
+    @staticmethod
+    def haystack(*texts: Optional[str]) -> str:
+        """Returns the lowercase text to be searched in, made of the given texts"""
+        return '\n'.join(text for text in texts if text).lower()
+
+    @property
+    def query(self) -> str:
+        """The search query"""
+        return self.__query
+
+    @property
+    def matches(self) -> list[int]:
+        """Indexes of texts matching the query"""
+        return self.__matches[-1]
+
+    def push(self, char: str) -> None:
+        """
+        Appends a character to the query
+        :param char: The character
+        :return: None
+        """
+        query = self.__query + char
+        matches = self.matches
+        words = query.lower().split()
+
+        if words and not char.isspace():
+            word = words[-1]
+            haystacks = self.__haystacks
+            matches = [i for i in matches if word in haystacks[i]]
+
+        self.__matches.append(matches)
+        self.__query = query
+
+    def pop(self) -> None:
+        """
+        Removes the last character of the query, restoring matches of the shorter query
+        :return: None
+        """
+        if self.__query:
+            self.__matches.pop()
+            self.__query = self.__query[:-1]
+
+    def set(self, query: str) -> None:
+        """
+        Sets the query, reusing matches of the common prefix with the current query
+        :param query: The query
+        :return: None
+        """
+        while not query.startswith(self.__query):
+            self.pop()
+
+        for char in query[len(self.__query):]:
+            self.push(char)
+
+    def remove(self, index: int) -> None:
+        """
+        Removes a text from the search
+        :param index: Index of the text
+        :return: None
+        """
+        del self.__haystacks[index]
+        self.reset(self.__haystacks)
+
+    def reset(self, haystacks: list[str]) -> None:
+        """
+        Replaces searched texts, keeping the query
+        :param haystacks: Texts made by the haystack method
+        :return: None
+        """
+        query = self.__query
+        self.__haystacks = haystacks
+        self.__matches = [list(range(len(self.__haystacks)))]
+        self.__query = ''
+        self.set(query)
+
+
+class ListProvider(OptionProvider):
+    def __init__(self, options: list[Option]):
+        """
+        Provides options from a list.
+
+        :param options: Options to be provided
+        """
+        self.__options = list(options)
+        self.__search = SearchIndex([self.__haystack(option) for option in self.__options])
+
+    @staticmethod
+    def __haystack(option: Option) -> str:
+        return SearchIndex.haystack(option.name, option.description)
+
+    def count(self) -> int:
+        return len(self.__search.matches)
+
+    def page(self, offset: int, limit: int) -> list[Option]:
+        options = self.__options
+        return [options[index] for index in self.__search.matches[offset:offset + limit]]
+
+    def search(self, query: str) -> None:
+        self.__search.set(query)
+
+    def remove(self, offset: int) -> None:
+        index = self.__search.matches[offset]
+        del self.__options[index]
+        self.__search.remove(index)
+
+    def discard(self, keys: set) -> None:
+        self.__options = [option for option in self.__options if option.key not in keys]
+        self.__search.reset([self.__haystack(option) for option in self.__options])
@@ -0,0 +1,192 @@
+"""
+Class for running handlers of options in background during KeyMode
+"""
+import copy
+import time
+import queue
+import threading
+from collections import deque
+from typing import Optional, Iterable
+from .types import AnyCallable
+
+
+class Task:
+    def __init__(self, name: str, handler: AnyCallable, max_lines: int):
+        """
+        Handler of an option queued to be run in background.
+
+        :param name: Name of the task
+        :param handler: Action to be performed. If it returns an iterable, its items are collected as output lines
+        :param max_lines: Number of the last output lines to be kept
+        """
+        self.name = name
+        self.handler = handler
+        self.lines: deque[str] = deque(maxlen=max_lines)
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.cancelled = False
+
+    @property
+    def elapsed(self) -> float:
+        """Wall time of the task in seconds"""
+        if self.started is None:
+            return 0.0
+
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def status(self) -> str:
+        """Status of the task"""
+        if self.started is None:
+            return 'queued'
+        if self.finished is None:
+            return 'cancelling' if self.cancelled else 'running'
+        if self.cancelled:
+            return 'cancelled'
+
+        return 'failed' if self.error else 'done'
+
+
+class TaskWorker:
+    def __init__(self, max_lines: int = 200):
+        """
+        Runs tasks one by one in a background thread.
+
+        :param max_lines: Number of the last output lines to be kept for each task
+        """
+        self.__max_lines = max_lines
+        self.__queue = queue.SimpleQueue()
+        # Guards output lines and states of tasks. Reentrant, since cancel is called by the handler of Ctrl-C
+        self.__lock = threading.RLock()
+        self.__tasks: list[Task] = []
+        self.__thread: Optional[threading.Thread] = None
+
+    @property
+    def tasks(self) -> list[Task]:
+        """Snapshots of submitted tasks, so states of tasks do not change while they are shown"""
+        with self.__lock:
+            return [copy.copy(task) for task in self.__tasks]
+
+    @property
+    def busy(self) -> bool:
+        """Whether there are running or queued tasks"""
+        with self.__lock:
+            return any(task.finished is None for task in self.__tasks)
+
+    def __current(self) -> Optional[Task]:
+        """The running task. Must be called under the lock"""
+        return next((task for task in self.__tasks if task.started is not None and task.finished is None), None)
+
+    def submit(self, name: str, handler: AnyCallable) -> Task:
+        """
+        Queues a handler to be run after the previously submitted ones
+        :param name: Name of the task
+        :param handler: Action to be performed
+        :return: The queued task
+        """
+        task = Task(name, handler, self.__max_lines)
+        with self.__lock:
+            self.__tasks.append(task)
+
+        self.__queue.put(task)
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, args=(self.__queue,), daemon=True)
+            self.__thread.start()
+
+        return task
+
+    def cancel(self) -> bool:
+        """
+        Cancels the running task. Output of the task is checked for cancellation between lines,
+        so handlers reporting progress regularly are stopped promptly
+        :return: True if there was a task to cancel, False otherwise
+        """
+        with self.__lock:
+            task = self.__current()
+            if task is None:
+                return False
+
+            task.cancelled = True
+            return True
+
+    def lines(self, task: Task) -> list[str]:
+        """
+        Returns output lines of the task
+        :param task: The task
+        :return: Output lines
+        """
+        with self.__lock:
+            return list(task.lines)
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Cancels the running task and drops queued ones, waiting for the running one to be stopped.
+        Only handlers returning an iterable are stopped by cancellation, other ones block shutdown until
+        they return, so the timeout limits the wait for them
+        :param timeout: Seconds to wait for the running task. Waits until it is stopped if not provided
+        :return: True if the running task is stopped, False if it is left running after the timeout
+        """
+        with self.__lock:
+            for task in self.__tasks:
+                if task.finished is None:
+                    task.cancelled = True
+
+        return self.join(timeout)
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for all submitted tasks to be finished. If the timeout is over, the running task is left
+        to be finished in background and later submitted tasks are run by a new thread
+        :param timeout: Seconds to wait. Waits until tasks are finished if not provided
+        :return: True if tasks are finished, False if the timeout is over
+        """
+        thread = self.__thread
+        if thread is None:
+            return True
+
+        self.__queue.put(None)
+        thread.join(timeout)
+
+        self.__thread = None
+        if thread.is_alive():
+            self.__queue = queue.SimpleQueue()
+            return False
+
+        return True
+
+    def __run(self, tasks: queue.SimpleQueue) -> None:
+        while (task := tasks.get()) is not None:
+            with self.__lock:
+                task.started = time.monotonic()
+                if task.cancelled:
+                    task.finished = task.started
+                    continue
+
+            error = None
+            try:
+                output = task.handler()
+                if isinstance(output, Iterable) and not isinstance(output, str):
+                    self.__collect(task, output)
+            except Exception as err:
+                error = err
+
+            with self.__lock:
+                task.error = error
+                task.finished = time.monotonic()
+
+    def __collect(self, task: Task, output: Iterable) -> None:
+        """Collects output lines of the task until it is exhausted or cancelled"""
+        output = iter(output)
+
+        try:
+            for line in output:
+                with self.__lock:
+                    if task.cancelled:
+                        break
+
+                    if line is not None:
+                        task.lines.extend(str(line).splitlines() or [''])
+        finally:
+            if hasattr(output, 'close'):
+                output.close()
@@ -2,7 +2,7 @@
 This module defines the types used by the croco-cli
 """
 
-from typing import Union, Callable, Any, Literal
+from typing import Union, Callable, Any, Literal, Iterator
 from click import Group, Command
 from click.decorators import GrpType
 from typing import TypedDict, NotRequired
@@ -56,3 +56,14 @@ class CustomAccount(TypedDict):
 class EnvVar(TypedDict):
     key: str
     value: str
+    scope: NotRequired[str]
+
+
+class EnvScope(TypedDict):
+    name: str
+    parent: str | None
+
+
+EnvSections = dict[str, list[dict[str, str]]]
+Emitter = Callable[[EnvSections], Iterator[str]]
+Formatter = Callable[[Iterator[dict[str, Any]]], Iterator[str]]
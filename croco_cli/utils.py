@@ -3,13 +3,28 @@ Utility functions for croco-cli
 """
 import os
 import re
+import stat
+import hashlib
+import queue
+import signal
+import threading
 import subprocess
 import blessed
 import click
 from requests.adapters import ConnectionError
-from typing import Callable
+from typing import Callable, Iterator, Optional
 from croco_cli._database import Database
-from croco_cli.exceptions import PoetryNotFoundException, InvalidToken, InvalidMnemonic
+from croco_cli.exceptions import (
+    PoetryNotFoundException,
+    InvalidToken,
+    InvalidMnemonic,
+    InvalidPassword,
+    CorruptedContainer,
+    InvalidCursor,
+    InvalidFieldName,
+    InvalidScope,
+    UnknownScope
+)
 from croco_cli.types import Wallet, Package, GithubPackage
 from functools import wraps
 from .tools import Echo
@@ -137,6 +152,96 @@ def hide_value(value: str, begin_part: int, end_part: int = 8) -> str:
     return value
 
 
+def get_export_password(confirm: bool = False) -> str:
+    """
+    Get the password of an encrypted export from the CROCO_EXPORT_PASSWORD variable or prompt it.
+
+    :param confirm: Whether the prompted password should be repeated for confirmation.
+    :return: The password.
+    """
+    if password := os.environ.get('CROCO_EXPORT_PASSWORD'):
+        return password
+
+    return click.prompt('Enter the export password', hide_input=True, confirmation_prompt=confirm)
+
+
+def format_throughput(size: int, elapsed: float) -> str:
+    """
+    Format the amount of processed data with its throughput.
+
+    :param size: The number of processed bytes.
+    :param elapsed: The elapsed time in seconds.
+    :return: The formatted string, like "12.50 MB in 0.40 s (31.25 MB/s)".
+    """
+    megabytes = size / 1024 ** 2
+    throughput = megabytes / elapsed if elapsed > 0 else 0
+    return f'{megabytes:.2f} MB in {elapsed:.2f} s ({throughput:.2f} MB/s)'
+
+
+def is_file_stale(path: str, content: str) -> bool:
+    """
+    Check if a file is missing or its content differs, comparing SHA-256 hashes.
+
+    :param path: Path to the file.
+    :param content: The expected content.
+    :return: True if the file has to be rewritten, false otherwise.
+    """
+    try:
+        with open(path, 'rb') as file:
+            digest = hashlib.file_digest(file, 'sha256').digest()
+    except FileNotFoundError:
+        return True
+
+    return digest != hashlib.sha256(content.encode()).digest()
+
+
+def _create_temp_file(path: str) -> tuple[int, str]:
+    """
+    Creates a temporary file next to the path. Like any new file, it gets the default mode restricted by the umask
+
+    :param path: Path to the file to be replaced by the temporary one.
+    :return: Descriptor of the opened temporary file and its path.
+    """
+    folder, name = os.path.split(os.path.abspath(path))
+    while True:
+        temp_path = os.path.join(folder, f'.{name}.{os.urandom(6).hex()}.tmp')
+        try:
+            return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+def write_if_changed(path: str, content: str) -> bool:
+    """
+    Write content to a file only if it differs from the existing content.
+    The file is replaced atomically, so readers never see a partially written file.
+
+    :param path: Path to the file.
+    :param content: The content to write.
+    :return: True if the file was written, false if it was up-to-date.
+    """
+    if not is_file_stale(path, content):
+        return False
+
+    fd, temp_path = _create_temp_file(path)
+    try:
+        # Written as UTF-8 without newline translation, exactly as is_file_stale compares it
+        with os.fdopen(fd, 'wb') as file:
+            file.write(content.encode())
+
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    return True
+
+
 def get_poetry_version() -> str:
     result = subprocess.run('poetry --version', shell=True, capture_output=True, text=True)
     if result.returncode != 0 or 'is not recognized' in result.stderr or 'is not recognized' in result.stdout:
@@ -176,20 +281,100 @@ def catch_github_errors(func: Callable) -> Callable:
     return wrapper
 
 
-def catch_wallet_errors(func: Callable) -> Callable:
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        try:
-            result = func(*args, **kwargs)
-        except InvalidMnemonic as err:
-            Echo.error(str(err))
-            return
-        else:
-            return result
+def catch_errors(*exceptions: type[Exception]) -> Callable[[Callable], Callable]:
+    """
+    Decorator factory echoing errors of the types on the screen instead of raising them.
 
-    return wrapper
+    :param exceptions: Types of errors to be caught
+    :return: The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except exceptions as err:
+                Echo.error(str(err))
+
+        return wrapper
+
+    return decorator
+
+
+catch_wallet_errors = catch_errors(InvalidMnemonic)
+catch_container_errors = catch_errors(InvalidPassword, CorruptedContainer)
+catch_cursor_errors = catch_errors(InvalidCursor)
+catch_field_errors = catch_errors(InvalidFieldName)
+catch_scope_errors = catch_errors(InvalidScope)
+
+
+def validate_scope(ctx: click.Context, param: click.Parameter, value: Optional[str]) -> Optional[str]:
+    """
+    Callback of --scope options, rejecting scopes of environment variables which do not exist
+
+    :param ctx: The click context
+    :param param: The option
+    :param value: Name of the scope
+    :return: Name of the scope
+    """
+    if value and not Database(read_only=True).env_scope_exists(value):
+        raise click.BadParameter(str(UnknownScope(value)), ctx, param)
+
+    return value
 
 
 @check_poetry
 def run_poetry_command(command: str) -> None:
     os.system(command)
+
+
+def stream_command(command: str, poll_interval: float = 0.1) -> Iterator[Optional[str]]:
+    """
+    Run a shell command, yielding lines of its output. None is yielded every poll interval without output,
+    so the caller may stop iterating at any time. The command is killed if the iterator is closed early.
+
+    :param command: The shell command
+    :param poll_interval: Seconds to wait for an output line
+    :return: Iterator over output lines of the command
+    """
+    process = subprocess.Popen(
+        command,
+        shell=True,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors='replace',
+        # The command gets its own process group, so its children are killed with it
+        start_new_session=os.name == 'posix'
+    )
+    lines = queue.SimpleQueue()
+
+    def _read():
+        for output_line in process.stdout:
+            lines.put(output_line.rstrip('\n'))
+        lines.put(None)
+
+    threading.Thread(target=_read, daemon=True).start()
+
+    try:
+        while True:
+            try:
+                line = lines.get(timeout=poll_interval)
+            except queue.Empty:
+                yield None
+                continue
+
+            if line is None:
+                break
+            yield line
+
+        if return_code := process.wait():
+            raise ChildProcessError(f'The command exited with code {return_code}')
+    finally:
+        if process.poll() is None:
+            if os.name == 'posix':
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+            process.wait()
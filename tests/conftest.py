@@ -1 +1,26 @@
+import threading
 import pytest
+from peewee import SqliteDatabase
+from croco_cli import api
+from croco_cli._database import Database, _DatabaseMeta
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch) -> Database:
+    """Database of a fresh temporary file, used instead of the database of the user"""
+    path = str(tmp_path / 'user.db')
+    interface = SqliteDatabase(path, timeout=Database.busy_timeout, pragmas={'journal_mode': 'wal'})
+
+    monkeypatch.setattr(Database, '_path', path)
+    monkeypatch.setattr(Database, 'interface', interface)
+    monkeypatch.setattr(_DatabaseMeta, '_instances', {})
+    monkeypatch.setattr(Database, 'completion_stale', False)
+    monkeypatch.setattr(api, '_values', {})
+    monkeypatch.setattr(api, '_state', {**api._state, 'write_count': None})
+    monkeypatch.setattr(api, '_local', threading.local())
+
+    database = Database()
+    yield database
+
+    for instance in _DatabaseMeta._instances.values():
+        instance.interface.close()
@@ -0,0 +1,63 @@
+import sqlite3
+import threading
+import pytest
+from croco_cli import api
+from croco_cli._database import Database
+
+
+@pytest.fixture
+def other_process(database: Database) -> sqlite3.Connection:
+    """Connection writing to the database like another process does"""
+    database.set_envar('RPC_URL', 'first')
+    api.set_refresh_interval(0)
+
+    connection = sqlite3.connect(Database._path, isolation_level=None)
+    yield connection
+    connection.close()
+
+
+def _in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_changes_of_other_process(other_process):
+    assert api.get_env_variables() == {'RPC_URL': 'first'}
+
+    other_process.execute("UPDATE env_variables SET value = 'second'")
+    assert api.get_env_variables() == {'RPC_URL': 'second'}
+
+
+def test_changes_seen_by_every_thread(other_process):
+    assert api.get_env_variables() == {'RPC_URL': 'first'}
+
+    other_process.execute("UPDATE env_variables SET value = 'second'")
+    assert _in_thread(api.get_env_variables) == {'RPC_URL': 'second'}
+
+    other_process.execute("UPDATE env_variables SET value = 'third'")
+    assert api.get_env_variables() == {'RPC_URL': 'third'}
+    assert _in_thread(api.get_env_variables) == {'RPC_URL': 'third'}
+
+
+def test_writes_of_this_process(database: Database):
+    database.set_envar('RPC_URL', 'first')
+    assert api.get_env_variables() == {'RPC_URL': 'first'}
+
+    database.set_envar('RPC_URL', 'second')
+    assert api.get_env_variables() == {'RPC_URL': 'second'}
+
+
+def test_new_tables_of_other_process(other_process):
+    assert api.get_custom_accounts() == ()
+
+    other_process.execute(
+        'CREATE TABLE custom_accounts (id INTEGER NOT NULL PRIMARY KEY, account VARCHAR(255) NOT NULL, '
+        'password VARCHAR(255) NOT NULL, email VARCHAR(255) NOT NULL, email_password VARCHAR(255) NOT NULL, '
+        'current INTEGER NOT NULL, data VARCHAR(255))'
+    )
+    other_process.execute("INSERT INTO custom_accounts VALUES (1, 'okx', 'p', 'a@mail.com', 'p', 1, 'null')")
+
+    assert [account['account'] for account in api.get_custom_accounts()] == ['okx']
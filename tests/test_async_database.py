@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import pytest
+from croco_cli._async_database import AsyncDatabase
+from croco_cli._database import Database
+
+_TIMEOUT = 10
+
+
+class _Batches:
+    """Records sizes of executed batches. The first batch waits for release, so later writes are queued meanwhile"""
+
+    def __init__(self):
+        self.sizes = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def wrap(self, execute_batch):
+        def wrapper(database, calls):
+            calls = list(calls)
+            self.sizes.append(len(calls))
+            if len(self.sizes) == 1:
+                self.entered.set()
+                self.release.wait(_TIMEOUT)
+            return execute_batch(database, calls)
+
+        return wrapper
+
+    async def wait_entered(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.entered.wait, _TIMEOUT)
+
+
+@pytest.fixture
+def batches(database, monkeypatch) -> _Batches:
+    batches = _Batches()
+    monkeypatch.setattr(Database, 'execute_batch', batches.wrap(Database.execute_batch))
+    return batches
+
+
+async def _queue_behind_first(async_database: AsyncDatabase, batches: _Batches, *writes) -> list:
+    first = asyncio.create_task(async_database.set_envar('FIRST', '0'))
+    await batches.wait_entered()
+
+    tasks = [asyncio.create_task(write) for write in writes]
+    await asyncio.sleep(0.1)
+    batches.release.set()
+
+    await first
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_concurrent_writes_batched(database, batches):
+    async def main():
+        async with AsyncDatabase() as async_database:
+            return await _queue_behind_first(
+                async_database,
+                batches,
+                *(async_database.set_envar(f'KEY_{i}', str(i)) for i in range(10))
+            )
+
+    results = asyncio.run(main())
+
+    assert results == [None] * 10
+    assert batches.sizes == [1, 10]
+    assert {envar['key'] for envar in database.get_env_variables()} == {'FIRST', *(f'KEY_{i}' for i in range(10))}
+
+
+def test_failed_write_rejects_own_future(database, batches):
+    async def main():
+        async with AsyncDatabase() as async_database:
+            return await _queue_behind_first(
+                async_database,
+                batches,
+                async_database.set_envar('BEFORE', '1'),
+                async_database.set_wallet('not a private key'),
+                async_database.set_envar('AFTER', '2')
+            )
+
+    before, failed, after = asyncio.run(main())
+
+    assert before is None and after is None
+    assert isinstance(failed, Exception)
+    assert batches.sizes == [1, 3]
+    assert {envar['key'] for envar in database.get_env_variables()} == {'FIRST', 'BEFORE', 'AFTER'}
+    assert database.get_wallets() is None
+
+
+def test_writer_survives_closed_loop(database, batches):
+    async_database = AsyncDatabase()
+
+    async def abandon():
+        asyncio.create_task(async_database.set_envar('ABANDONED', '1'))
+        await batches.wait_entered()
+
+    async def main():
+        await asyncio.wait_for(async_database.set_envar('KEY', 'value'), _TIMEOUT)
+        await async_database.close()
+
+    asyncio.run(abandon())
+    batches.release.set()
+    asyncio.run(main())
+
+    assert {envar['key'] for envar in database.get_env_variables()} == {'ABANDONED', 'KEY'}
+
+
+def test_readers_run_concurrently(database, monkeypatch):
+    barrier = threading.Barrier(3, timeout=_TIMEOUT)
+
+    def get_wallets(self, current=False):
+        barrier.wait()
+        return current
+
+    monkeypatch.setattr(Database, 'get_wallets', get_wallets)
+
+    async def main():
+        async with AsyncDatabase(readers=3) as async_database:
+            return await asyncio.gather(*(async_database.get_wallets(bool(i)) for i in range(3)))
+
+    assert asyncio.run(main()) == [False, True, True]
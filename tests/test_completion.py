@@ -0,0 +1,61 @@
+import pytest
+from croco_cli import _completion
+from croco_cli._completion import refresh_stale_completion_cache
+from croco_cli._database import Database
+
+
+@pytest.fixture
+def cache_path(tmp_path, monkeypatch) -> str:
+    path = tmp_path / 'completion'
+    monkeypatch.setattr(_completion, 'get_completion_path', lambda: str(path))
+    return path
+
+
+def test_writers_not_changing_candidates(database: Database, cache_path):
+    database.set_wallet(f'0x{1:064x}', 'deployer')
+    Database.completion_stale = False
+
+    database.lease_wallets('gw0')
+    database.declare_custom_field('region')
+    refresh_stale_completion_cache()
+
+    assert not cache_path.exists()
+
+
+def test_refresh_after_changed_candidates(database: Database, cache_path):
+    database.set_wallet(f'0x{1:064x}', 'deployer')
+    database.set_envar('RPC_URL', 'global')
+    database.set_envar('RPC_URL', 'sepolia', scope='sepolia')
+
+    assert Database.completion_stale
+    refresh_stale_completion_cache()
+
+    assert not Database.completion_stale
+    lines = cache_path.read_text().splitlines()
+    assert 'label\tdeployer' in lines
+    assert lines.count('env\tRPC_URL') == 1
+    assert 'scope\tsepolia' in lines
+
+
+def test_candidates_breaking_lines_skipped(database: Database, cache_path):
+    database.set_wallet(f'0x{1:064x}', 'first\tsecond')
+    database.set_wallet(f'0x{2:064x}', 'first\nsecond')
+    database.set_wallet(f'0x{3:064x}', 'deployer')
+    database.set_custom_account('bin\rance', 'password', 'eu@mail.com', 'password')
+
+    _completion.refresh_completion_cache(Database(read_only=True))
+
+    lines = cache_path.read_text().splitlines()
+    assert [line for line in lines if not line.startswith('public_key\t')] == ['label\tdeployer']
+    assert all(line.count('\t') == 1 for line in lines)
+
+
+def test_tables_created_after_refresh(database: Database, cache_path):
+    reader = Database(read_only=True)
+    _completion.refresh_completion_cache(reader)
+    assert cache_path.read_text() == ''
+
+    database.set_env_scope('sepolia')
+    _completion.refresh_completion_cache(reader)
+
+    assert cache_path.read_text() == 'scope\tsepolia\n'
@@ -0,0 +1,66 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from peewee import SqliteDatabase
+from croco_cli._database import Database, _DatabaseMeta
+
+_WRITERS = 6
+_READERS = 2
+_ITERATIONS = 40
+_PRIVATE_KEYS = [f'0x{i:064x}' for i in range(1, 9)]
+
+
+def _use_database(path: str) -> None:
+    """Points the database of a spawned process to the file of the test"""
+    Database._path = path
+    Database.interface = SqliteDatabase(path, timeout=Database.busy_timeout, pragmas={'journal_mode': 'wal'})
+    _DatabaseMeta._instances = {}
+
+
+def _write(path: str, worker: int) -> None:
+    _use_database(path)
+    database = Database()
+
+    for i in range(_ITERATIONS):
+        database.set_wallet(_PRIVATE_KEYS[(worker + i) % len(_PRIVATE_KEYS)])
+        database.set_custom_account('binance', 'password', f'{worker}-{i % 3}@mail.com', 'password')
+        database.set_envar(f'KEY_{i % 5}', f'{worker}-{i}')
+
+
+def _read(path: str, stop: multiprocessing.Event) -> int:
+    """Returns the maximal number of current wallets and accounts seen at once"""
+    _use_database(path)
+    database = Database(read_only=True)
+    wallets, custom_accounts = database.wallets, database.custom_accounts
+
+    seen = 0
+    while not stop.is_set():
+        database.clear_cache()
+        if database._table_exists(wallets):
+            seen = max(seen, wallets.select().where(wallets.current).count())
+        if database._table_exists(custom_accounts):
+            seen = max(seen, custom_accounts.select().where(custom_accounts.current).count())
+
+    return seen
+
+
+def test_single_current_under_concurrent_writers(database):
+    path = Database._path
+    context = multiprocessing.get_context('spawn')
+
+    with context.Manager() as manager, ProcessPoolExecutor(_WRITERS + _READERS, mp_context=context) as executor:
+        stop = manager.Event()
+        readers = [executor.submit(_read, path, stop) for _ in range(_READERS)]
+        writers = [executor.submit(_write, path, worker) for worker in range(_WRITERS)]
+
+        try:
+            for writer in writers:
+                writer.result()
+        finally:
+            stop.set()
+
+        assert all(reader.result() <= 1 for reader in readers)
+
+    database.clear_cache()
+    assert len(database.get_wallets(current=True)) == 1
+    assert len(database.get_custom_accounts(current=True)) == 1
+    assert len(database.get_env_variables()) == 5
@@ -0,0 +1,76 @@
+import io
+import pytest
+from croco_cli import _container
+from croco_cli._container import ContainerReader, ContainerWriter
+from croco_cli.exceptions import CorruptedContainer, InvalidPassword
+
+
+@pytest.fixture(autouse=True)
+def fast_scrypt(monkeypatch):
+    monkeypatch.setattr(_container, '_SCRYPT_LOG_N', 4)
+
+
+def _seal(data: bytes, chunk_size: int = 16) -> bytes:
+    file = io.BytesIO()
+    with ContainerWriter(file, 'secret', chunk_size) as writer:
+        writer.write(data)
+
+    return file.getvalue()
+
+
+def _open(sealed: bytes, password: str = 'secret') -> bytes:
+    return b''.join(ContainerReader(io.BytesIO(sealed), password))
+
+
+@pytest.mark.parametrize('data', [b'', b'short', b'{"key": "value"}\n' * 100])
+def test_round_trip(data):
+    assert _open(_seal(data)) == data
+
+
+def test_lines():
+    sealed = _seal(b'first\nsecond\nthird')
+
+    assert list(ContainerReader(io.BytesIO(sealed), 'secret').lines()) == [b'first', b'second', b'third']
+
+
+def test_wrong_password():
+    with pytest.raises(InvalidPassword):
+        _open(_seal(b'data'), 'wrong')
+
+
+def test_truncated_container():
+    sealed = _seal(b'x' * 100)
+
+    for size in (3, len(_container.MAGIC) + 5, len(sealed) // 2, len(sealed) - 1):
+        with pytest.raises(CorruptedContainer):
+            _open(sealed[:size])
+
+
+def test_dropped_final_chunk():
+    sealed = _seal(b'x' * 32)
+    final_chunk = len(_seal(b'')) - len(_container.MAGIC) - _container._HEADER.size
+
+    with pytest.raises(CorruptedContainer):
+        _open(sealed[:-final_chunk])
+
+
+def test_trailing_data():
+    with pytest.raises(CorruptedContainer):
+        _open(_seal(b'data') + b'tail')
+
+
+def test_tampered_chunk():
+    sealed = bytearray(_seal(b'x' * 64))
+    sealed[-20] ^= 1
+
+    with pytest.raises(CorruptedContainer):
+        _open(bytes(sealed))
+
+
+@pytest.mark.parametrize('offset, value', [(0, 40), (1, 255), (2, 255), (1, 0), (2, 0)])
+def test_tampered_header(offset, value):
+    sealed = bytearray(_seal(b'data'))
+    sealed[len(_container.MAGIC) + _container._SALT_SIZE + offset] = value
+
+    with pytest.raises(CorruptedContainer):
+        _open(bytes(sealed))
@@ -0,0 +1,62 @@
+import os
+import stat
+import threading
+import click
+import pytest
+import croco_cli
+from croco_cli import _daemon
+
+
+@pytest.fixture
+def client_cli(monkeypatch) -> click.Group:
+    @click.group()
+    def cli():
+        pass
+
+    @cli.command()
+    def where():
+        click.echo(f'{os.getcwd()} {os.environ.get("CROCO_TEST")}')
+
+    @cli.command()
+    def fail():
+        raise SystemExit('Something went wrong')
+
+    monkeypatch.setattr(croco_cli, 'cli', cli, raising=False)
+    return cli
+
+
+def test_command_runs_like_in_client(client_cli, tmp_path):
+    daemon_cwd = os.getcwd()
+    result = _daemon._run_command(['where'], str(tmp_path), False, {'CROCO_TEST': 'client'})
+
+    assert result == {'stdout': f'{tmp_path} client\n', 'stderr': '', 'exit_code': 0}
+    assert os.getcwd() == daemon_cwd
+    assert 'CROCO_TEST' not in os.environ
+
+
+def test_exit_message(client_cli, tmp_path):
+    result = _daemon._run_command(['fail'], str(tmp_path), False)
+
+    assert result['stderr'] == 'Something went wrong\n'
+    assert result['exit_code'] == 1
+
+
+def test_private_socket(tmp_path, monkeypatch):
+    path = str(tmp_path / 'daemon.sock')
+    monkeypatch.setattr(_daemon, 'get_socket_path', lambda: path)
+    umask = os.umask(0o022)
+
+    try:
+        server = threading.Thread(target=_daemon.serve, args=(10,))
+        server.start()
+        assert _daemon.wait_until_ready()
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert os.umask(0o022) == 0o022
+
+        _daemon.call('shutdown', timeout=5)
+        server.join(5)
+    finally:
+        os.umask(umask)
+
+    assert not os.path.exists(path)
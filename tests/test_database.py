@@ -0,0 +1,13 @@
+from croco_cli._database import Database
+
+
+def test_read_only_uri(database: Database, monkeypatch):
+    database.set_envar('RPC_URL', 'global')
+
+    assert Database._read_only_uri().endswith('?mode=ro')
+
+    monkeypatch.setattr(Database, 'immutable', True)
+    assert Database._read_only_uri().endswith('?mode=ro')
+
+    database.interface.execute_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+    assert Database._read_only_uri().endswith('?immutable=1')
@@ -0,0 +1,103 @@
+import pytest
+from click.testing import CliRunner
+from croco_cli import api
+from croco_cli.cli._set import _set
+from croco_cli._database import Database, GLOBAL_SCOPE
+from croco_cli.exceptions import InvalidScope, UnknownScope
+
+
+@pytest.fixture
+def scoped(database: Database) -> Database:
+    database.set_envar('RPC_URL', 'global')
+    database.set_envar('CHAIN_ID', '1')
+    database.set_env_scope('sepolia', 'testnets')
+    database.set_envar('RPC_URL', 'testnets', scope='testnets')
+    database.set_envar('CHAIN_ID', '11155111', scope='sepolia')
+    database.set_envar('RPC_URL', 'mainnet', scope='mainnet')
+    return database
+
+
+def _resolve(database: Database, scope: str | None = None) -> dict[str, str]:
+    return {env_var['key']: env_var['value'] for env_var in database.resolve_env_variables(scope)}
+
+
+def test_scope_overrides_ancestors(scoped):
+    assert _resolve(scoped, 'sepolia') == {'RPC_URL': 'testnets', 'CHAIN_ID': '11155111'}
+    assert _resolve(scoped, 'testnets') == {'RPC_URL': 'testnets', 'CHAIN_ID': '1'}
+    assert _resolve(scoped, 'mainnet') == {'RPC_URL': 'mainnet', 'CHAIN_ID': '1'}
+
+
+def test_global_variables_only_by_default(scoped):
+    assert _resolve(scoped) == {'RPC_URL': 'global', 'CHAIN_ID': '1'}
+    assert [env_var['value'] for env_var in scoped.get_env_variables()] == ['global', '1']
+
+
+def test_overridden_variables_keep_position(scoped):
+    assert [env_var['key'] for env_var in scoped.resolve_env_variables('sepolia')] == ['RPC_URL', 'CHAIN_ID']
+
+
+def test_scope_chain(scoped):
+    assert scoped.get_env_scope_chain('sepolia') == ['sepolia', 'testnets', '']
+
+
+def test_cycles_are_rejected(scoped):
+    with pytest.raises(InvalidScope):
+        scoped.set_env_scope('testnets', 'sepolia')
+
+    with pytest.raises(InvalidScope):
+        scoped.set_env_scope('sepolia', 'sepolia')
+
+
+def test_parent_kept_unless_detached(scoped):
+    runner = CliRunner()
+
+    assert runner.invoke(_set, ['scope', 'sepolia']).exit_code == 0
+    assert scoped.get_env_scope_chain('sepolia') == ['sepolia', 'testnets', '']
+
+    assert runner.invoke(_set, ['scope', 'sepolia', 'testnets', '--no-parent']).exit_code == 2
+    assert runner.invoke(_set, ['scope', 'sepolia', '--no-parent']).exit_code == 0
+    assert scoped.get_env_scope_chain('sepolia') == ['sepolia', '']
+
+    scoped.set_env_scope('sepolia', 'testnets')
+    scoped.set_env_scope('sepolia', GLOBAL_SCOPE)
+    assert scoped.get_env_scope_chain('sepolia') == ['sepolia', '']
+
+
+def test_envar_of_unknown_scope_rejected(scoped):
+    runner = CliRunner()
+
+    assert runner.invoke(_set, ['envar', 'RPC_URL', 'goerli', '--scope', 'goerli']).exit_code == 2
+    assert not scoped.env_scope_exists('goerli')
+
+    assert runner.invoke(_set, ['envar', 'RPC_URL', 'sepolia', '--scope', 'sepolia']).exit_code == 0
+    assert _resolve(scoped, 'sepolia')['RPC_URL'] == 'sepolia'
+
+
+def test_unknown_scope(scoped):
+    with pytest.raises(UnknownScope):
+        scoped.resolve_env_variables('goerli')
+
+
+def test_reader_notices_upgraded_table(database):
+    database.interface.execute_sql(
+        'CREATE TABLE env_variables (id INTEGER NOT NULL PRIMARY KEY, key VARCHAR(255) NOT NULL, '
+        'value VARCHAR(255) NOT NULL)'
+    )
+    database.interface.execute_sql("INSERT INTO env_variables (key, value) VALUES ('RPC_URL', 'global')")
+
+    reader = Database(read_only=True)
+    assert _resolve(reader) == {'RPC_URL': 'global'}
+
+    database.set_envar('RPC_URL', 'sepolia', scope='sepolia')
+    database.set_envar('RPC_URL', 'mainnet', scope='mainnet')
+
+    assert _resolve(reader) == {'RPC_URL': 'global'}
+    assert api.get_env_variables() == {'RPC_URL': 'global'}
+    assert api.get_env_variables('sepolia') == {'RPC_URL': 'sepolia'}
+
+
+def test_reset_clears_scopes(scoped):
+    scoped.drop_tables(scoped.env_variables, scoped.env_scopes)
+
+    assert not scoped.env_scope_exists('sepolia')
+    assert scoped.env_scope_exists('')
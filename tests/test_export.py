@@ -0,0 +1,59 @@
+import json
+import pytest
+from click.testing import CliRunner
+from croco_cli._database import Database
+from croco_cli.cli._export import export
+from croco_cli.cli._import import _import
+
+
+@pytest.fixture
+def accounts(database: Database) -> Database:
+    database.set_wallet(f'0x{1:064x}', 'deployer-1')
+    database.set_wallet(f'0x{2:064x}', 'tester')
+    database.set_custom_account('binance', 'password', 'eu@mail.com', 'password', {'region': 'eu'})
+    database.set_custom_account('okx', 'password', 'us@mail.com', 'password')
+    database.set_envar('RPC_URL', 'global')
+    database.set_envar('API_KEY', 'key')
+    database.set_env_scope('sepolia', 'testnets')
+    database.set_envar('RPC_URL', 'sepolia', scope='sepolia')
+    database.set_envar('API_KEY', 'key', scope='mainnet')
+    return database
+
+
+def _export(tmp_path, *args: str) -> dict:
+    path = tmp_path / 'config.json'
+    result = CliRunner().invoke(export, [*args, str(path)])
+    assert result.exit_code == 0, result.output
+
+    return json.loads(path.read_text())['user']
+
+
+def test_selective_export(accounts, tmp_path):
+    user = _export(tmp_path, '--only', 'wallets,custom', '--label', 'deployer*', '--account', 'binance')
+
+    assert [wallet['label'] for wallet in user['wallets']] == ['deployer-1']
+    assert [account['account'] for account in user['custom']] == ['binance']
+    assert user['github'] is None and user['env'] is None and user['scopes'] is None
+
+
+def test_env_prefix_filters_scopes(accounts, tmp_path):
+    user = _export(tmp_path, '--only', 'env', '--env-prefix', 'RPC_')
+
+    assert user['env'] == {'RPC_URL': 'global'}
+    assert user['scopes'] == {
+        'testnets': {'parent': None, 'env': {}},
+        'sepolia': {'parent': 'testnets', 'env': {'RPC_URL': 'sepolia'}}
+    }
+
+
+def test_round_trip(accounts, tmp_path):
+    user = _export(tmp_path)
+    accounts.drop_database()
+
+    result = CliRunner().invoke(_import, [str(tmp_path / 'config.json')])
+    assert result.exit_code == 0, result.output
+    accounts.clear_cache()
+
+    assert _export(tmp_path) == user
+    assert accounts.get_wallets(current=True)[0]['label'] == 'tester'
+    assert {env_var['value'] for env_var in accounts.resolve_env_variables('sepolia')} == {'sepolia', 'key'}
@@ -0,0 +1,89 @@
+import io
+import blessed
+import pytest
+from blessed.keyboard import Keystroke, resolve_sequence
+from croco_cli.cli._change import _wallet_provider
+from croco_cli.tools import KeyMode, Option
+
+_DOWN = '\x1b[B'
+_BTAB = '\x1b[Z'
+_HOME = '\x1b[H'
+_DELETE = '\x1b[3~'
+_ESCAPE = '\x1b'
+
+
+class _Terminal(blessed.Terminal):
+    """Terminal pressing the given keys, which fails the test if it waits for more keys"""
+
+    def __init__(self, keys: list[str]):
+        super().__init__(stream=io.StringIO(), force_styling=True)
+        self.__keys = [resolve_sequence(key, self._keymap, self._keycodes) for key in keys]
+
+    def inkey(self, timeout=None, esc_delay=0.35):
+        if self.__keys:
+            return self.__keys.pop(0)
+        if timeout is None:
+            raise AssertionError('All keys are pressed, but the screen waits for more')
+        return Keystroke()
+
+
+@pytest.fixture
+def deleted() -> list:
+    return []
+
+
+def _run(keys: list[str], deleted: list = None, options=None):
+    if options is None:
+        options = [Option(name=f'option {i}', handler=lambda i=i: i, key=i) for i in range(5)]
+
+    handler = None if deleted is None else deleted.extend
+    return KeyMode(options, 'Options', _Terminal(keys), batch_deleting_handler=handler)()
+
+
+def test_mark_and_delete(deleted):
+    # Marks the first option, a range from it to the third one and the last one
+    keys = [' ', _DOWN, _BTAB, _DOWN, _DOWN, '\t', _DELETE, 'y', _HOME, '\n']
+
+    assert _run(keys, deleted) == 3
+    assert sorted(deleted) == [0, 1, 2, 4]
+
+
+def test_unmarked_twice(deleted):
+    assert _run([' ', _HOME, ' ', ' ', _DELETE, 'y', _HOME, '\n'], deleted) == 0
+    assert deleted == [1]
+
+
+def test_deleting_cancelled(deleted):
+    assert _run([' ', ' ', _DELETE, 'n', _HOME, '\n'], deleted) == 0
+    assert deleted == []
+
+
+def test_marks_cleared_by_escape(deleted):
+    # Without marks, only the option under the cursor is deleted by its own handler
+    assert _run([' ', _ESCAPE, _DELETE, _DOWN, '\n'], deleted) == 2
+    assert deleted == []
+
+
+def test_space_searches_after_query(deleted):
+    assert _run(['o', 'p', 't', ' ', '3', '\n'], deleted) == 3
+    assert deleted == []
+
+
+def test_no_marks_without_batch_deleting():
+    assert _run(['\t', ' ', '4', '\n']) == 4
+
+
+def test_wallets_deleted_at_once(database, monkeypatch):
+    for i in range(1, 4):
+        database.set_wallet(f'0x{i:064x}')
+
+    calls = []
+    delete_wallets = database.delete_wallets
+    monkeypatch.setattr(database, 'delete_wallets', lambda keys: calls.append(keys) or delete_wallets(keys))
+
+    provider = _wallet_provider(database)
+    keys = [option.key for option in provider.page(0, 3)]
+    KeyMode(provider, 'Wallets', _Terminal([' ', ' ', _DELETE, 'y', '\n']), database.delete_wallets)()
+
+    assert len(calls) == 1 and sorted(calls[0]) == sorted(keys[:2])
+    assert [wallet['private_key'] for wallet in database.get_wallets()] == keys[2:]
@@ -0,0 +1,64 @@
+import pytest
+from click.testing import CliRunner
+from croco_cli._database import Database
+from croco_cli.cli._run import run
+
+
+@pytest.fixture
+def wallets(database: Database) -> list[str]:
+    private_keys = [f'0x{i:064x}' for i in range(1, 6)]
+    for private_key in private_keys:
+        database.set_wallet(private_key)
+
+    return private_keys
+
+
+def _keys(wallets: list) -> list[str]:
+    return [wallet['private_key'] for wallet in wallets]
+
+
+def test_holders_get_disjoint_wallets(database, wallets):
+    first = _keys(database.lease_wallets('gw0', 2))
+    second = _keys(database.lease_wallets('gw1', 2))
+    third = _keys(database.lease_wallets('gw2', 2))
+
+    assert len(first) == len(second) == 2
+    assert len(third) == 1
+    assert not set(first) & set(second) and not set(third) & set(first + second)
+
+
+def test_holder_keeps_its_wallets(database, wallets):
+    first = _keys(database.lease_wallets('gw0', 2))
+
+    assert _keys(database.lease_wallets('gw0', 2)) == first
+
+
+def test_shrinking_request_releases_surplus(database, wallets):
+    first = _keys(database.lease_wallets('gw0', 4))
+
+    assert _keys(database.lease_wallets('gw0', 1)) == first[:1]
+    assert _keys(database.lease_wallets('gw1', 4)) == first[1:] + wallets[-1:]
+    assert _keys(database.lease_wallets('gw0', 2)) == first[:1]
+
+
+def test_released_and_expired_wallets_are_freed(database, wallets):
+    database.lease_wallets('gw0', 5)
+    assert database.lease_wallets('gw1', 1) == []
+
+    database.release_wallets('gw0')
+    assert len(database.lease_wallets('gw1', 5, ttl=-1)) == 5
+
+    assert len(database.lease_wallets('gw2', 5)) == 5
+
+
+def test_run_exposes_leased_wallet_over_shell(database, wallets, tmp_path):
+    output = tmp_path / 'key'
+    result = CliRunner().invoke(
+        run,
+        ['--lease', '1', '--', 'sh', '-c', f'echo "$TEST_PRIVATE_KEY" > {output}'],
+        env={'TEST_PRIVATE_KEY': 'shell'}
+    )
+
+    assert result.exit_code == 0
+    assert output.read_text().strip() == wallets[0]
+    assert len(database.lease_wallets('gw0', 5)) == 5
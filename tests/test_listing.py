@@ -0,0 +1,133 @@
+import pytest
+from peewee import Tuple
+from croco_cli._database import Database
+from croco_cli._listing import (
+    SORTS, Page, list_wallets, list_custom_accounts, list_env_variables, select_wallets, order_wallets
+)
+from croco_cli.exceptions import InvalidCursor
+
+
+@pytest.fixture
+def accounts(database: Database) -> Database:
+    for i, label in enumerate([None, 'deployer-1', None, 'tester', 'deployer-2', None, None], start=1):
+        database.set_wallet(f'0x{i:064x}', label)
+
+    for i in range(7):
+        database.set_custom_account(('binance', 'okx')[i % 2], 'password', f'user{i}@mail.com', 'password')
+
+    for i in range(7):
+        database.set_envar(f'KEY_{i}', str(i), scope=('', 'sepolia')[i % 2])
+
+    return database
+
+
+def _paginate(listing, limit: int) -> list[list]:
+    """Returns rows of all pages of the listing, read by following the cursors"""
+    pages, cursor = [], None
+    while True:
+        page = listing(limit=limit, cursor=cursor)
+        pages.append(list(page))
+        if not (cursor := page.next_cursor):
+            return pages
+
+
+def _labels(rows) -> list[str]:
+    return [row.display_label for row in rows]
+
+
+@pytest.mark.parametrize('sort', ['name', 'created'])
+@pytest.mark.parametrize('limit', [1, 3, 7])
+def test_pages_make_up_listing(accounts, sort, limit):
+    listings = [
+        lambda **options: list_wallets(accounts, sort=sort, **options),
+        lambda **options: list_custom_accounts(accounts, sort=sort, **options),
+        lambda **options: list_env_variables(accounts, sort=sort, **options)
+    ]
+
+    for listing in listings:
+        pages = _paginate(listing, limit)
+
+        assert [row.id for page in pages for row in page] == [row.id for row in listing()]
+        assert all(len(page) <= limit for page in pages)
+        assert len(pages) == -(-7 // limit)
+
+
+def test_wallets_sorted_by_name(accounts):
+    assert _labels(list_wallets(accounts)) == [
+        'Wallet 4',
+        'Wallet 1',
+        'Wallet 2',
+        'Wallet 3',
+        'deployer-1',
+        'deployer-2',
+        'tester'
+    ]
+    assert _labels(list_wallets(accounts, sort='created')) == [
+        'Wallet 1', 'deployer-1', 'Wallet 2', 'tester', 'deployer-2', 'Wallet 3', 'Wallet 4'
+    ]
+
+
+def test_unlabelled_wallets_in_order_of_creation(database):
+    for i in range(1, 14):
+        database.set_wallet(f'0x{i:064x}', 'Alice' if i == 5 else None)
+
+    assert _labels(list_wallets(database, limit=4)) == ['Wallet 12', 'Wallet 1', 'Wallet 2', 'Wallet 3']
+    assert _labels(list_wallets(database))[-3:] == ['Wallet 10', 'Wallet 11', 'Alice']
+
+
+@pytest.mark.parametrize('sort', SORTS)
+def test_pages_backed_by_indexes(accounts, sort):
+    query, columns = select_wallets(accounts)
+    order_by = order_wallets(columns, sort)
+    sql, params = query.where(Tuple(*order_by) > Tuple(*[0] * len(order_by))).order_by(*order_by).limit(2).sql()
+
+    plan = ' '.join(row[-1] for row in accounts.interface.execute_sql(f'EXPLAIN QUERY PLAN {sql}', params))
+    assert 'TEMP B-TREE' not in plan
+
+
+def test_filters(accounts):
+    assert _labels(list_wallets(accounts, label='deployer*')) == ['deployer-1', 'deployer-2']
+    assert _labels(list_wallets(accounts, search='wallet')) == ['Wallet 4', 'Wallet 1', 'Wallet 2', 'Wallet 3']
+    assert [row.email for row in list_custom_accounts(accounts, 'okx')] == [
+        'user1@mail.com', 'user3@mail.com', 'user5@mail.com'
+    ]
+    assert [row.key for row in list_env_variables(accounts, 'sepolia')] == ['KEY_1', 'KEY_3', 'KEY_5']
+    assert [row.key for row in list_env_variables(accounts, '')] == ['KEY_0', 'KEY_2', 'KEY_4', 'KEY_6']
+
+
+def test_filtered_pages(accounts):
+    pages = _paginate(lambda **options: list_wallets(accounts, search='wallet', **options), 3)
+
+    assert [_labels(page) for page in pages] == [['Wallet 4', 'Wallet 1', 'Wallet 2'], ['Wallet 3']]
+
+
+def test_offset(accounts):
+    page = list_env_variables(accounts, limit=2, offset=3)
+
+    assert [row.key for row in page] == ['KEY_3', 'KEY_4']
+    assert page.partial
+    assert [row.key for row in list_env_variables(accounts, cursor=page.next_cursor)] == ['KEY_5', 'KEY_6']
+
+
+@pytest.mark.parametrize('cursor', ['not a cursor', '!!!', 'e30', 'WzFd'])
+def test_invalid_cursor(accounts, cursor):
+    with pytest.raises(InvalidCursor):
+        list_wallets(accounts, cursor=cursor)
+
+
+def test_cursor_bound_to_listing(accounts):
+    page = list_wallets(accounts, sort='created', limit=2)
+    list(page)
+
+    with pytest.raises(InvalidCursor):
+        list_wallets(accounts, sort='name', cursor=page.next_cursor)
+
+    with pytest.raises(InvalidCursor):
+        list_custom_accounts(accounts, cursor=page.next_cursor)
+
+
+def test_missing_table(database):
+    page = list_wallets(database, limit=1)
+
+    assert isinstance(page, Page)
+    assert list(page) == [] and page.next_cursor is None
@@ -0,0 +1,60 @@
+import json
+import tomllib
+from click.testing import CliRunner
+from croco_cli._database import Database
+from croco_cli.cli._make import _wait_for_changes, make
+
+
+def test_dotenv(database: Database, tmp_path):
+    database.set_envar('RPC_URL', 'global')
+    database.set_envar('RPC_URL', 'sepolia', scope='sepolia')
+    path = str(tmp_path / '.env')
+
+    runner = CliRunner()
+    assert runner.invoke(make, ['dotenv', '--scope', 'sepolia', path]).exit_code == 0
+    assert "RPC_URL='sepolia'" in open(path).read()
+
+    assert runner.invoke(make, ['dotenv', '--check', '--scope', 'sepolia', path]).exit_code == 0
+    assert runner.invoke(make, ['dotenv', '--check', path]).exit_code == 1
+    assert runner.invoke(make, ['dotenv', '--scope', 'goerli', path]).exit_code == 2
+
+
+def test_watched_database_notices_declared_fields(database: Database):
+    database.set_custom_account('binance', 'password', 'eu@mail.com', 'password', {'region': 'eu'})
+    reader = Database(read_only=True)
+    version = reader.data_version()
+    assert reader.custom_fields() == set()
+
+    database.declare_custom_field('region')
+    _wait_for_changes(reader, version, 0.01, 0.01)
+
+    assert reader.custom_fields() == {'region'}
+
+
+def test_toml_without_duplicate_keys(database: Database):
+    database.set_wallet(f'0x{1:064x}')
+    database.set_envar('RPC_URL', 'global')
+    database.set_envar('RPC_URL', 'sepolia', scope='sepolia')
+    database.set_envar('TEST_PRIVATE_KEY', 'overridden', scope='sepolia')
+    database.set_custom_account('binance', 'password', 'eu@mail.com', 'password')
+    database.set_envar('BINANCE_EMAIL', 'overridden')
+
+    result = CliRunner().invoke(make, ['env', '--format', 'toml', '--scope', 'sepolia'])
+    parsed = tomllib.loads(result.output)
+
+    assert result.exit_code == 0
+    assert parsed['RPC_URL'] == 'sepolia'
+    assert parsed['TEST_PRIVATE_KEY'] == 'overridden'
+    assert parsed['BINANCE_EMAIL'] == 'eu@mail.com'
+    assert parsed == json.loads(CliRunner().invoke(make, ['env', '--format', 'json', '--scope', 'sepolia']).output)
+
+
+def test_docker_rejects_multiline_values(database: Database, tmp_path):
+    database.set_envar('CERTIFICATE', 'first\nsecond')
+    path = tmp_path / 'env.list'
+
+    result = CliRunner().invoke(make, ['env', '--format', 'docker', '--out', str(path)])
+
+    assert result.exit_code == 1
+    assert 'CERTIFICATE' in result.output and 'line break' in result.output
+    assert not path.exists()
@@ -0,0 +1,120 @@
+import time
+import pytest
+from croco_cli import _providers
+from croco_cli._database import Database
+from croco_cli._listing import list_wallets
+from croco_cli._providers import QueryProvider
+from croco_cli.cli._change import _wallet_provider
+
+
+@pytest.fixture
+def wallets(database: Database) -> Database:
+    for i, label in enumerate([None, 'deployer', None, 'alice', None], 1):
+        database.set_wallet(f'0x{i:064x}', label)
+
+    return database
+
+
+def _names(provider, count: int = 100) -> list[str]:
+    return [option.name for option in provider.page(0, count)]
+
+
+def test_wallets_named_like_listings(wallets):
+    listed = [row.display_label for row in list_wallets(wallets)]
+
+    assert listed == ['Wallet 3', 'Wallet 1', 'Wallet 2', 'alice', 'deployer']
+    assert _names(_wallet_provider(wallets)) == ['Wallet 3 (Current)', *listed[1:]]
+
+
+def test_search_synthesized_labels(wallets):
+    provider = _wallet_provider(wallets)
+    provider.search('wallet')
+
+    assert _names(provider) == ['Wallet 3 (Current)', 'Wallet 1', 'Wallet 2']
+    assert provider.count() == 3
+
+
+def test_pages_across_chunks(wallets, monkeypatch):
+    monkeypatch.setattr(_providers, 'CHUNK_SIZE', 2)
+    custom_accounts = wallets.custom_accounts
+    for i in range(7):
+        wallets.set_custom_account('binance', 'password', f'{i}@mail.com', 'password')
+
+    provider = QueryProvider(
+        query=custom_accounts.select,
+        order_by=(custom_accounts.id,),
+        search_fields=(custom_accounts.email,),
+        make_option=lambda row: wallets.to_custom_account(row)['email']
+    )
+
+    assert provider.count() == 7
+    assert provider.page(0, 3) + provider.page(3, 4) == [f'{i}@mail.com' for i in range(7)]
+    assert provider.page(4, 2) == ['4@mail.com', '5@mail.com']
+
+
+def test_far_page_numbered(wallets, monkeypatch):
+    monkeypatch.setattr(_providers, 'CHUNK_SIZE', 2)
+    provider = _wallet_provider(wallets)
+
+    assert [option.name for option in provider.page(2, 2)] == ['Wallet 2', 'alice']
+    assert [option.name for option in provider.page(1, 3)] == ['Wallet 1', 'Wallet 2', 'alice']
+    assert provider.count() == 5
+
+
+def test_search_like_listings(wallets):
+    provider = _wallet_provider(wallets)
+
+    for query in ('wallet', 'wallet 2', 'd', 'de', 'a', 'al', 'alice', 'a 4', '', 'a', 'x'):
+        provider.search(query)
+        listed = [row.display_label for row in list_wallets(wallets, search=query)]
+
+        assert [name.removesuffix(' (Current)') for name in _names(provider)] == listed, query
+        assert provider.count() == len(listed)
+
+
+def test_large_menu_is_fast(database: Database):
+    wallets = database.wallets
+    database.interface.create_tables([wallets])
+    rows = [
+        {
+            'public_key': f'0x{i:040x}',
+            'private_key': f'0x{i:064x}',
+            'current': i == 1,
+            'label': f'label-{i}' if i % 3 == 0 else None
+        }
+        for i in range(1, 50001)
+    ]
+    with database.interface.atomic():
+        for i in range(0, len(rows), 500):
+            wallets.insert_many(rows[i:i + 500]).execute()
+
+    provider = _wallet_provider(database)
+
+    def elapsed(*calls) -> float:
+        start = time.perf_counter()
+        for call in calls:
+            call()
+        return time.perf_counter() - start
+
+    assert elapsed(provider.count, lambda: provider.page(0, 40)) < 0.1
+    assert elapsed(lambda: provider.page(1, 40), lambda: provider.page(33000, 40)) < 0.5
+
+    provider.search('w')
+    provider.count()
+    for query in ('wa', 'wal', 'wallet', 'wallet ', 'wallet 1', 'wallet 12', 'wallet 1', 'label'):
+        assert elapsed(lambda: provider.search(query), provider.count, lambda: provider.page(0, 40)) < 0.1, query
+
+    assert provider.count() == 16666
+    assert _names(provider, 2) == ['label-10002', 'label-10005']
+
+
+def test_removed_while_searching(wallets):
+    provider = _wallet_provider(wallets)
+    provider.search('wallet')
+    option = provider.page(1, 1)[0]
+
+    assert option.name == 'Wallet 1'
+    option.deleting_handler()
+    provider.remove(1)
+
+    assert _names(provider) == ['Wallet 2 (Current)', 'Wallet 1']
@@ -0,0 +1,87 @@
+import os
+import pytest
+import croco_cli
+from croco_cli._database import Database
+
+pytest_plugins = ['pytester']
+
+_PLUGIN = ['-p', 'croco_cli.pytest_plugin', '-p', 'no:cacheprovider']
+
+
+@pytest.fixture
+def wallets(database: Database) -> list[str]:
+    private_keys = [f'0x{i:064x}' for i in range(1, 4)]
+    for private_key in private_keys:
+        database.set_wallet(private_key)
+
+    return private_keys
+
+
+def _leased(database: Database) -> int:
+    leases = database.wallet_leases
+    return leases.select().count() if leases.table_exists() else 0
+
+
+def test_database_is_read_only(database, wallets, pytester):
+    pytester.makepyfile("""
+        import peewee
+        import pytest
+
+        def test_read_only(croco_database, croco_wallet):
+            assert croco_wallet['private_key'] == '0x' + '3'.rjust(64, '0')
+            with pytest.raises(peewee.OperationalError):
+                croco_database.set_envar('KEY', 'value')
+    """)
+
+    pytester.runpytest(*_PLUGIN).assert_outcomes(passed=1)
+    assert database.get_env_variables() in (None, [])
+
+
+def test_leases_released_at_teardown(database, wallets, pytester):
+    pytester.makepyfile("""
+        from croco_cli._database import Database
+
+        def test_leased(croco_worker_wallets):
+            leases = Database().wallet_leases
+            assert len(croco_worker_wallets) == 2
+            assert leases.select().where(leases.private_key == croco_worker_wallets[0]['private_key']).exists()
+    """)
+
+    pytester.runpytest(*_PLUGIN, '--croco-wallets', '2').assert_outcomes(passed=1)
+    assert _leased(database) == 0
+
+
+def test_workers_get_different_wallets(database, wallets, pytester, monkeypatch):
+    # Workers are separate processes, which are pointed to the database of the test by a conftest
+    pytester.makeconftest(f"""
+        from peewee import SqliteDatabase
+        from croco_cli._database import Database, _DatabaseMeta
+
+        Database._path = {Database._path!r}
+        Database.interface = SqliteDatabase(Database._path, timeout=Database.busy_timeout)
+        _DatabaseMeta._instances = {{}}
+    """)
+    # Every worker waits for the other, so both hold their leases at once
+    pytester.makepyfile("""
+        import os
+        import time
+
+        def test_worker_wallet(croco_worker_wallet, worker_id):
+            folder = os.environ['CROCO_WALLETS_FOLDER']
+            with open(os.path.join(folder, worker_id), 'w') as file:
+                file.write(croco_worker_wallet['private_key'])
+
+            deadline = time.monotonic() + 30
+            while len([name for name in os.listdir(folder) if name.startswith('gw')]) < 2:
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+    """)
+    monkeypatch.setenv('CROCO_WALLETS_FOLDER', str(pytester.path))
+    monkeypatch.setenv('PYTHONPATH', os.path.dirname(os.path.dirname(croco_cli.__file__)), prepend=os.pathsep)
+
+    result = pytester.runpytest_subprocess(*_PLUGIN, '-n', '2', '--dist', 'each')
+
+    result.assert_outcomes(passed=2)
+    leased = {path.read_text() for path in pytester.path.glob('gw*')}
+    assert len(leased) == 2 and leased <= set(wallets)
+    assert _leased(database) == 0
@@ -0,0 +1,19 @@
+import json
+from click.testing import CliRunner
+from croco_cli._database import Database
+from croco_cli.cli._user import user
+
+
+def test_wallets_have_display_labels(database: Database):
+    database.set_wallet(f'0x{1:064x}')
+    database.set_wallet(f'0x{2:064x}', 'deployer')
+
+    result = CliRunner().invoke(user, ['--wallets', '--format', 'json'])
+    assert result.exit_code == 0, result.output
+
+    records = json.loads(result.output)
+    assert [(record['label'], record['display_label']) for record in records] == [
+        ('deployer', 'deployer'),
+        (None, 'Wallet 1')
+    ]
+    assert all('*' in record['private_key'] for record in records)
@@ -0,0 +1,39 @@
+import pytest
+from click.testing import CliRunner
+from croco_cli.cli import _run
+from croco_cli._database import Database
+
+
+@pytest.fixture
+def executed(monkeypatch) -> dict:
+    """Captures the command executed by croco run instead of replacing the test process"""
+    executed = {}
+
+    def execvpe(file, args, env):
+        executed.update(file=file, args=args, env=env)
+        raise SystemExit(0)
+
+    monkeypatch.setattr(_run.os, 'execvpe', execvpe)
+    return executed
+
+
+def test_run_with_environment(database: Database, executed):
+    database.set_wallet(f'0x{1:064x}')
+    database.set_envar('RPC_URL', 'global')
+    database.set_envar('CHAIN_ID', '1')
+    database.set_envar('RPC_URL', 'sepolia', scope='sepolia')
+
+    result = CliRunner().invoke(_run.run, ['--scope', 'sepolia', '--', 'pytest', '-q'], env={'CHAIN_ID': 'shell'})
+
+    assert result.exit_code == 0
+    assert executed['args'] == ('pytest', '-q')
+    assert executed['env']['TEST_PRIVATE_KEY'] == f'0x{1:064x}'
+    assert executed['env']['RPC_URL'] == 'sepolia'
+    assert executed['env']['CHAIN_ID'] == 'shell'
+
+
+def test_run_with_unknown_scope(database: Database, executed):
+    result = CliRunner().invoke(_run.run, ['--scope', 'goerli', '--', 'pytest'])
+
+    assert result.exit_code == 2
+    assert not executed
@@ -0,0 +1,88 @@
+import pytest
+from click.testing import CliRunner
+from croco_cli._database import Database
+from croco_cli.cli._search import search
+
+
+@pytest.fixture
+def accounts(database: Database) -> Database:
+    database.set_wallet(f'0x{1:064x}', 'deployer')
+    database.set_custom_account(
+        'binance',
+        'hunter2',
+        'trader@mail.com',
+        'hunter2',
+        {'region': 'europe', 'api_key': 'apikeyvalue', 'seed': 'abandon ability', 'pin': '4821', '2fa': 'otpsecret'}
+    )
+    database.set_envar('RPC_URL', 'https://rpc.example')
+    database.ensure_search_index()
+    return database
+
+
+def _found(database: Database, query: str) -> list[str]:
+    names = {'wallet': 'label', 'custom': 'email', 'env': 'key'}
+    return [account[names[kind]] for kind, account in database.search_accounts(query)]
+
+
+def test_prefix_search(accounts):
+    assert _found(accounts, 'deploy') == ['deployer']
+    assert _found(accounts, 'trad') == ['trader@mail.com']
+    assert _found(accounts, 'binance regi') == ['trader@mail.com']
+    assert _found(accounts, 'rpc') == ['RPC_URL']
+    assert _found(accounts, 'binance asia') == []
+
+
+def test_secrets_not_indexed(accounts):
+    assert _found(accounts, 'hunter2') == []
+
+    for value in ('europe', 'apikeyvalue', 'abandon', '4821', 'otpsecret'):
+        assert _found(accounts, value) == [], value
+    assert _found(accounts, 'example') == []
+    assert _found(accounts, f'{1:064x}') == []
+
+
+def test_index_follows_changes(accounts):
+    accounts.set_wallet(f'0x{2:064x}', 'tester')
+    accounts.set_custom_account_field('binance', 'network', 'mainnet')
+    accounts.delete_env_variables()
+
+    assert _found(accounts, 'tester') == ['tester']
+    assert _found(accounts, 'binance network') == ['trader@mail.com']
+    assert _found(accounts, 'mainnet') == []
+    assert _found(accounts, 'rpc') == []
+
+
+def test_index_of_earlier_version_rebuilt(accounts):
+    interface = accounts.interface
+    interface.execute_sql('DROP TRIGGER search_index_v2_custom_accounts_insert')
+    interface.execute_sql('CREATE TRIGGER search_index_custom_accounts_insert AFTER INSERT ON custom_accounts BEGIN '
+                          "INSERT INTO search_index (rowid, kind, name, detail, data) "
+                          "VALUES (new.id * 3 + 1, 'custom', new.account, new.email, new.data); END")
+    accounts.set_custom_account('okx', 'password', 'okx@mail.com', 'password', {'api_key': 'leakedvalue'})
+    assert _found(accounts, 'leakedvalue') == ['okx@mail.com']
+
+    accounts.ensure_search_index()
+    accounts.set_custom_account('okx', 'password', 'new@mail.com', 'password', {'api_key': 'newvalue'})
+
+    assert _found(accounts, 'leakedvalue') == [] and _found(accounts, 'newvalue') == []
+    assert sorted(_found(accounts, 'okx')) == ['new@mail.com', 'okx@mail.com']
+
+
+def test_dropped_tables_purged(accounts):
+    accounts.drop_tables(accounts.wallets)
+
+    assert _found(accounts, 'deployer') == []
+
+    accounts.set_wallet(f'0x{3:064x}', 'deployer-2')
+    accounts.ensure_search_index()
+
+    assert _found(accounts, 'deployer') == ['deployer-2']
+
+
+def test_index_built_from_existing_accounts(database):
+    database.set_wallet(f'0x{1:064x}', 'deployer')
+
+    result = CliRunner().invoke(search, ['deploy'])
+
+    assert result.exit_code == 0, result.output
+    assert 'deployer' in result.output
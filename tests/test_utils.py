@@ -0,0 +1,79 @@
+import os
+import stat
+import time
+import pytest
+from croco_cli.utils import write_if_changed, stream_command
+
+
+def _mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_write_if_changed(tmp_path):
+    path = tmp_path / '.env'
+
+    assert write_if_changed(str(path), 'A=1\n')
+    assert not write_if_changed(str(path), 'A=1\n')
+    assert write_if_changed(str(path), 'A=2\n')
+    assert path.read_text() == 'A=2\n'
+    assert [file.name for file in tmp_path.iterdir()] == ['.env']
+
+
+def test_new_file_mode_follows_umask(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        write_if_changed(str(tmp_path / '.env'), 'A=1\n')
+    finally:
+        os.umask(umask)
+
+    assert _mode(tmp_path / '.env') == 0o644
+
+
+def test_existing_file_mode_is_kept(tmp_path):
+    path = tmp_path / '.env'
+    path.write_text('A=1\n')
+    os.chmod(path, 0o640)
+
+    write_if_changed(str(path), 'A=2\n')
+
+    assert _mode(path) == 0o640
+
+
+def test_content_written_as_compared(tmp_path):
+    path = tmp_path / '.env'
+    content = 'NAME=Zoë\r\nPRICE=5€\n'
+
+    assert write_if_changed(str(path), content)
+    assert path.read_bytes() == content.encode()
+    assert not write_if_changed(str(path), content)
+
+
+def test_umask_not_changed(tmp_path, monkeypatch):
+    def umask(mask):
+        raise AssertionError('The umask of the process is changed')
+
+    monkeypatch.setattr(os, 'umask', umask)
+
+    assert write_if_changed(str(tmp_path / '.env'), 'A=1\n')
+
+
+def _alive(pid: int) -> bool:
+    try:
+        with open(f'/proc/{pid}/stat') as file:
+            return file.read().rsplit(')', 1)[1].split()[0] != 'Z'
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not os.path.isdir('/proc'), reason='Processes are inspected in /proc')
+def test_stream_command_killed_when_closed():
+    lines = stream_command('sleep 60 & echo $!; wait')
+    child = int(next(line for line in lines if line is not None))
+    assert _alive(child)
+
+    lines.close()
+
+    deadline = time.monotonic() + 5
+    while _alive(child):
+        assert time.monotonic() < deadline, 'The child of the command is not killed'
+        time.sleep(0.05)
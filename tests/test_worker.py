@@ -0,0 +1,56 @@
+import threading
+import time
+from croco_cli.tools.worker import TaskWorker
+
+
+def test_generator_cancelled_between_lines():
+    worker = TaskWorker()
+    started = threading.Event()
+
+    def handler():
+        started.set()
+        while True:
+            yield 'line'
+            time.sleep(0.01)
+
+    task = worker.submit('endless', handler)
+    queued = worker.submit('queued', lambda: None)
+    started.wait(5)
+
+    assert worker.shutdown(5)
+    assert [task.status for task in worker.tasks] == ['cancelled', 'cancelled']
+    assert worker.lines(task)[:1] == ['line'] and worker.lines(queued) == []
+
+
+def test_shutdown_not_blocked_by_foreground_handler():
+    worker = TaskWorker()
+    started, release = threading.Event(), threading.Event()
+
+    def handler():
+        started.set()
+        release.wait(5)
+
+    worker.submit('blocking', handler)
+    started.wait(5)
+
+    assert not worker.shutdown(0.1)
+    assert worker.tasks[0].status == 'cancelling'
+
+    # Later tasks are run by a new thread, while the old one finishes the running task
+    task = worker.submit('next', lambda: ['done'])
+    release.set()
+    assert worker.join(5)
+    assert worker.lines(task) == ['done']
+
+
+def test_tasks_are_snapshots():
+    worker = TaskWorker()
+    release = threading.Event()
+    worker.submit('blocking', lambda: release.wait(5))
+
+    snapshot = worker.tasks[0]
+    release.set()
+    worker.join(5)
+
+    assert snapshot.finished is None
+    assert worker.tasks[0].status == 'done'